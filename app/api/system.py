@@ -0,0 +1,120 @@
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.client.http_client import upstreams
+from app.client.result_outbox import result_outbox
+from app.core.backends import backend_report
+from app.core.embedding_cache import embedding_cache
+from app.core.executor import inference_executor
+from app.core.metrics import histograms, render_samples, process_rss_bytes
+from app.core.models import m2m_registry, model_status, model_load_seconds, is_ready, REQUIRED_MODELS
+from app.model.similarity.bertscore_engine import bertscore_engine
+from app.model.similarity.evaluate_similarity_agent import get_batch_stats
+from app.service.result_cache import result_cache
+from app.service.task_scheduler import task_scheduler
+from app.service.translation_cache import translation_cache
+from app.web_socket.notifier import manager
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health():
+    """
+    프로세스 생존 여부 (모델 로드 여부와 무관)
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(scope: Optional[str] = None):
+    """
+    scope(similarity | m2m) 요청을 처리할 모델이 준비되었는지 확인. 준비 전이면 503
+    """
+    if scope is not None and scope not in REQUIRED_MODELS:
+        return JSONResponse(status_code=400, content={"detail": f"unknown scope: {scope}"})
+    body = {
+        "ready": is_ready(scope),
+        "scope": scope or "all",
+        "models": model_status,
+        "load_seconds": model_load_seconds,
+    }
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
+
+@router.get("/stats")
+async def get_stats():
+    """
+    서비스 내부 처리 통계 (작업 스케줄러, scorer micro-batch, inference executor, 캐시 등) 조회
+    """
+    return {
+        "scheduler": task_scheduler.stats(),
+        "batching": get_batch_stats(),
+        "inference_executor": inference_executor.stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "bertscore_cache": bertscore_engine.stats(),
+        "result_cache": result_cache.stats(),
+        "translation_cache": translation_cache.stats(),
+        "m2m_models": m2m_registry.stats(),
+        "inference_backends": backend_report,
+        "upstreams": {name: upstream.stats() for name, upstream in upstreams.items()},
+        "websocket": manager.stats(),
+        "result_outbox": await result_outbox.stats(),
+    }
+
+
+@router.get("/metrics")
+async def metrics():
+    """
+    Prometheus text format 메트릭 (단계별 latency histogram + 대기열/연결/메모리 gauge)
+    """
+    scheduler = task_scheduler.stats()
+    executor = inference_executor.stats()
+    outbox = await result_outbox.stats()
+    lines = []
+    for histogram in histograms:
+        lines.extend(histogram.render())
+    lines.extend(render_samples(
+        "text_similarity_queue_depth", "Tasks waiting in the scheduler queue", "gauge",
+        [({"lane": lane}, count) for lane, count in scheduler["queued"].items()]
+    ))
+    lines.extend(render_samples(
+        "text_similarity_tasks_in_flight", "Tasks currently running", "gauge",
+        [({"lane": lane}, count) for lane, count in scheduler["running"].items()]
+    ))
+    lines.extend(render_samples(
+        "text_similarity_tasks_total", "Finished or rejected tasks", "counter",
+        [({"status": status}, scheduler[status]) for status in ("completed", "failed", "rejected")]
+    ))
+    lines.extend(render_samples(
+        "text_similarity_inference_in_flight", "Calls submitted to the inference executor", "gauge",
+        [({}, executor["in_flight"])]
+    ))
+    lines.extend(render_samples(
+        "text_similarity_inference_queue_depth", "Inference calls waiting for a worker", "gauge",
+        [({}, executor["queue_depth"])]
+    ))
+    lines.extend(render_samples(
+        "text_similarity_upstream_in_flight", "In-flight requests per upstream", "gauge",
+        [({"upstream": name}, upstream.in_flight) for name, upstream in upstreams.items()]
+    ))
+    lines.extend(render_samples(
+        "text_similarity_websocket_connections", "Open WebSocket connections", "gauge",
+        [({}, len(manager.active_connections))]
+    ))
+    lines.extend(render_samples(
+        "text_similarity_models_ready", "Whether the models for a scope are loaded", "gauge",
+        [({"scope": scope}, int(is_ready(scope))) for scope in REQUIRED_MODELS]
+    ))
+    lines.extend(render_samples(
+        "text_similarity_outbox_results", "Spring results stored in the outbox", "gauge",
+        [({"status": status}, outbox[status]) for status in ("pending", "dead")]
+    ))
+    lines.extend(render_samples(
+        "process_resident_memory_bytes", "Resident memory size in bytes", "gauge",
+        [({}, process_rss_bytes())]
+    ))
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8")
+
@@ -1,78 +1,206 @@
+import asyncio
+import json
 import logging
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from app.schema.text_similarity_dto import TextSimilarityRequest, TextSimilarityResponse, TranslateType, Language, \
-    RetranslateRequest
-from app.service.text_similarity_service import run_text_similarity
-from app.util.s3 import upload_s3
+    RetranslateRequest, TaskStatusResponse, TextSimilarityComparison
+from app.core.models import is_ready
+from app.model.similarity.evaluate_similarity_agent import resolve_metrics, resolve_scoring_mode
+from app.service.comparison_service import run_text_similarity_comparison
+from app.service.bulk_similarity_service import parse_bulk_rows, run_bulk_similarity, Row, BULK_MAX_ROWS
+from app.service.task_scheduler import task_scheduler, Lane
+from app.service.text_similarity_service import run_text_similarity, send_failure_result
+from app.util.exception import QueueFullError, S3UploadError
+from app.util.ingest import detach_upload, inspect_upload, UploadReader
+from app.util.s3 import upload_s3_background
 from app.util.task_utils import generate_task_name
 
 router = APIRouter()
 
+
+def _ensure_ready(scope: str):
+    if not is_ready(scope):
+        raise HTTPException(status_code=503, detail="Models are still loading", headers={"Retry-After": "30"})
+
+
+def _parse_scoring(metrics: Optional[List[str]], scoring_mode: Optional[str]):
+    """
+    지표 목록/채점 모드 검증. 잘못된 값이면 400
+    """
+    try:
+        metric_list = resolve_metrics(metrics) if metrics else None
+        mode = resolve_scoring_mode(scoring_mode) if scoring_mode else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return metric_list, mode
+
+
+def _parse_compare_types(translate_type: TranslateType, compare_types: Optional[str]) -> List[TranslateType]:
+    """
+    비교할 번역 엔진 목록 (translate_type 포함, 중복 제거). 모르는 엔진이면 400
+    """
+    types = [translate_type]
+    for name in (compare_types or "").split(","):
+        if not name.strip():
+            continue
+        try:
+            compare_type = TranslateType(name.strip().upper())
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"unknown translate_type: {name.strip()}")
+        if compare_type not in types:
+            types.append(compare_type)
+    return types
+
+
+def _queue_full(e: QueueFullError) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def _ensure_capacity():
+    """
+    대기열이 가득 찼으면 파일을 읽고 업로드하기 전에 바로 429
+    """
+    try:
+        task_scheduler.check_capacity()
+    except QueueFullError as e:
+        raise _queue_full(e)
+
+
+async def _close_uploads(*uploads: Optional[UploadFile]):
+    for upload in uploads:
+        if upload is not None:
+            await upload.close()
+
+
+async def _await_input_upload(task_name: str, request: TextSimilarityRequest, upload: asyncio.Task) -> bool:
+    """
+    요청에서 시작한 입력 파일 업로드가 끝날 때까지 기다립니다.
+    실패하면 결과에 저장되지 않은 파일의 URL 이 들어가지 않도록 key 를 비우고 False
+    """
+    try:
+        await upload
+    except S3UploadError as e:
+        logging.error(f"❌ input upload failed for {task_name}: {e}")
+        request.input_text_key = ""
+        return False
+    return True
+
+
+async def _run_upload_job(
+    task_name: str,
+    request: TextSimilarityRequest,
+    input_upload: UploadFile,
+    output_upload: Optional[UploadFile],
+    translate_types: Optional[List[TranslateType]]
+):
+    """
+    submit_translation 에서 넘겨받은 업로드 파일을 읽으면서 저장소로 올리고 채점합니다.
+    문서 모드 번역 작업은 읽은 문장부터 바로 번역/채점하고, 그 외에는 필요한 텍스트만 읽은 뒤 채점합니다.
+    저장소 업로드에 실패하면 작업 실패로 전송합니다.
+    """
+    try:
+        input_reader = UploadReader(input_upload, request.input_text_key)
+        if request.document_mode and output_upload is None and translate_types is None:
+            return await run_text_similarity(task_name, request, input_reader)
+
+        try:
+            request.input_text = await input_reader.read_text()
+            if output_upload is not None:
+                request.output_text = await UploadReader(output_upload, request.output_text_key).read_text()
+        except S3UploadError as e:
+            logging.error(f"❌ input upload failed for {task_name}: {e}")
+            # 끝까지 저장되지 않은 파일의 URL 은 결과에 넣지 않음
+            if not input_reader.stored:
+                request.input_text_key = ""
+            request.output_text_key = None
+            return await send_failure_result(task_name, request, "Input upload error")
+
+        if translate_types is not None:
+            return await run_text_similarity_comparison(task_name, request, translate_types)
+        return await run_text_similarity(task_name, request)
+    finally:
+        await _close_uploads(input_upload, output_upload)
+
+
 @router.post("/text-similarities", response_model=TextSimilarityResponse)
 async def submit_translation(
-    background_tasks: BackgroundTasks,
     input_file: UploadFile = File(..., description="입력 텍스트(.txt)"),
     output_file: Optional[UploadFile] = File(None, description="비교용 출력 텍스트(.txt)"),
     input_language: Language = Form(...),
     output_language: Language = Form(...),
     translate_type: TranslateType = Form(...),
-    total_project_id: int = Form(...)
+    total_project_id: int = Form(...),
+    document_mode: bool = Form(False, description="문장 단위 분할 채점 여부"),
+    metrics: Optional[str] = Form(None, description="계산할 지표, 쉼표로 구분 (e5,labse,bertscore,comet)"),
+    scoring_mode: Optional[str] = Form(None, description="full | tiered (E5/LaBSE 판정이 확실하면 BERTScore/COMET 생략)"),
+    compare_types: Optional[str] = Form(None, description="함께 비교할 번역 엔진, 쉼표로 구분 (GOOGLE,M2M,GPT)")
 ):
     """
     .txt 파일로부터 input_text/output_text를 읽어서 큐에 등록하고 task_name 반환
+    compare_types 를 지정하면 translate_type 과 함께 모든 엔진으로 번역해 점수 순으로 비교합니다.
     """
 
+    translate_types = _parse_compare_types(translate_type, compare_types) if compare_types else None
+    if translate_types is not None and output_file is not None:
+        raise HTTPException(status_code=400, detail="compare_types cannot be used with output_file")
+    needs_m2m = output_file is None and TranslateType.M2M in (translate_types or [translate_type])
+    _ensure_ready("m2m" if needs_m2m else "similarity")
+    _ensure_capacity()
+    metric_list, scoring_mode = _parse_scoring(metrics.split(",") if metrics else None, scoring_mode)
+
     task_name = generate_task_name()
     logging.info(f"task_name: {task_name}")
 
+    # 요청 안에서는 (이미 임시 파일에 받은) 업로드를 UTF-8 확인/해시만 하고, 저장소 업로드와 디코딩은 task 에서 진행
     try:
-        raw_input = await input_file.read()
-
-        input_txt_key = f"text_similarity/{task_name}/{input_file.filename}"
-        upload_s3(input_txt_key, raw_input, input_file.content_type)
-
-        input_text = raw_input.decode("utf-8")
+        input_sha256 = await inspect_upload(input_file)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"input_file 읽기 실패: {e}")
-
-    output_text: Optional[str] = None
-    output_txt_key: Optional[str] = None
     if output_file is not None:
         try:
-            raw_output = await output_file.read()
-
-            output_txt_key = f"text_similarity/{task_name}/{output_file.filename}"
-            upload_s3(output_txt_key, raw_output, output_file.content_type)
-
-            output_text = raw_output.decode("utf-8")
+            await inspect_upload(output_file)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"output_file 읽기 실패: {e}")
 
     request_dto = TextSimilarityRequest(
-        input_text=input_text,
-        output_text=output_text,
         input_language=input_language,
         output_language=output_language,
         translate_type=translate_type,
         total_project_id=total_project_id,
-        input_text_key=input_txt_key,
-        output_text_key=output_txt_key,
+        input_text_key=f"text_similarity/{task_name}/{input_file.filename}",
+        output_text_key=f"text_similarity/{task_name}/{output_file.filename}" if output_file is not None else None,
+        document_mode=document_mode,
+        metrics=metric_list,
+        scoring_mode=scoring_mode,
+        input_sha256=input_sha256,
     )
 
+    input_upload = detach_upload(input_file)
+    output_upload = detach_upload(output_file) if output_file is not None else None
     try:
-        background_tasks.add_task(run_text_similarity, task_name, request_dto)
+        await task_scheduler.submit(
+            task_name, Lane.BULK, _run_upload_job, task_name, request_dto, input_upload, output_upload, translate_types
+        )
+    except QueueFullError as e:
+        await _close_uploads(input_upload, output_upload)
+        raise _queue_full(e)
     except Exception as e:
+        await _close_uploads(input_upload, output_upload)
         raise HTTPException(status_code=500, detail=f"Failed to queue translation: {e}")
 
     return TextSimilarityResponse(task_name=task_name, status="processing")
 
 @router.post("/text-similarities/retranslate", response_model=TextSimilarityResponse)
 async def submit_retranslation(
-    background_tasks: BackgroundTasks,
     request: RetranslateRequest,
 ):
+    _ensure_ready("similarity")
+    _ensure_capacity()
+    metric_list, scoring_mode = _parse_scoring(request.metrics, request.scoring_mode)
+
     task_name = generate_task_name()
     logging.info(f"retranslate task_name: {task_name}")
 
@@ -80,7 +208,7 @@ async def submit_retranslation(
         raw_input = request.input_text
 
         input_txt_key = f"text_similarity_re/{task_name}/input_text.txt"
-        upload_s3(input_txt_key, raw_input.encode("utf-8"), 'text/plain')
+        input_upload = upload_s3_background(input_txt_key, raw_input.encode("utf-8"), 'text/plain')
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"input_text 파일 쓰기 실패: {e}")
@@ -92,16 +220,141 @@ async def submit_retranslation(
         translate_type=TranslateType.GPT,
         total_project_id=request.total_project_id,
         input_text_key=input_txt_key,
+        document_mode=request.document_mode,
+        metrics=metric_list,
+        scoring_mode=scoring_mode,
+        fresh=True,
     )
 
     try:
-        background_tasks.add_task(run_text_similarity, task_name, request_dto)
+        await task_scheduler.submit(
+            task_name, Lane.INTERACTIVE, _run_retranslate_job, task_name, request_dto, input_upload
+        )
+    except QueueFullError as e:
+        raise _queue_full(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to queue translation: {e}")
 
     return TextSimilarityResponse(task_name=task_name, status="processing")
 
 
+async def _run_retranslate_job(task_name: str, request: TextSimilarityRequest, input_upload: asyncio.Task):
+    """
+    입력 텍스트 업로드가 끝난 뒤 채점합니다. 업로드에 실패하면 작업 실패로 전송합니다.
+    """
+    if not await _await_input_upload(task_name, request, input_upload):
+        return await send_failure_result(task_name, request, "Input upload error")
+    return await run_text_similarity(task_name, request)
+
+
+async def _run_bulk_job(
+    task_name: str,
+    request: TextSimilarityRequest,
+    rows: List[Row],
+    queue: asyncio.Queue,
+    input_upload: asyncio.Task
+):
+    """
+    bulk 채점 결과를 queue 로 전달합니다. 클라이언트 연결이 끊겨도 끝까지 실행하고 결과를 전송합니다.
+    입력 파일 업로드에 실패하면 집계 결과에는 입력 파일 URL 없이 전송합니다.
+    """
+    try:
+        await _await_input_upload(task_name, request, input_upload)
+        async for item in run_bulk_similarity(task_name, request, rows):
+            queue.put_nowait(item)
+    except Exception as e:
+        queue.put_nowait({"error": str(e)})
+        raise
+    finally:
+        queue.put_nowait(None)
+
+
+async def _stream_ndjson(queue: asyncio.Queue):
+    while (item := await queue.get()) is not None:
+        yield json.dumps(item, ensure_ascii=False) + "\n"
+
+
+@router.post("/text-similarities/bulk")
+async def submit_bulk(
+    input_file: UploadFile = File(..., description="(원문, 번역문) 쌍 목록 (.jsonl 또는 .csv)"),
+    input_language: Language = Form(...),
+    output_language: Language = Form(...),
+    translate_type: TranslateType = Form(...),
+    total_project_id: int = Form(...)
+):
+    """
+    여러 (원문, 번역문|없음) 쌍을 한 번에 채점하고 행 결과를 NDJSON 으로 스트리밍합니다.
+    마지막 줄은 {"summary": {...}} 이며, 집계 결과는 Spring 으로 한 번만 전송됩니다.
+    """
+    _ensure_capacity()
 
+    task_name = generate_task_name()
+    logging.info(f"bulk task_name: {task_name}")
 
+    try:
+        raw_input = await input_file.read()
+        rows = parse_bulk_rows(raw_input, input_file.filename or "")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"input_file 읽기 실패: {e}")
+    if not rows:
+        raise HTTPException(status_code=400, detail="input_file 에 채점할 행이 없습니다")
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"행 수가 너무 많습니다 (최대 {BULK_MAX_ROWS})")
 
+    needs_translation = any(translation is None for _, translation in rows)
+    _ensure_ready("m2m" if translate_type == TranslateType.M2M and needs_translation else "similarity")
+
+    input_txt_key = f"text_similarity/{task_name}/{input_file.filename}"
+    input_upload = upload_s3_background(input_txt_key, raw_input, input_file.content_type)
+
+    request_dto = TextSimilarityRequest(
+        input_text="\n".join(source for source, _ in rows),
+        input_language=input_language,
+        output_language=output_language,
+        translate_type=translate_type,
+        total_project_id=total_project_id,
+        input_text_key=input_txt_key,
+    )
+
+    queue: asyncio.Queue = asyncio.Queue()
+    try:
+        await task_scheduler.submit(
+            task_name, Lane.BULK, _run_bulk_job, task_name, request_dto, rows, queue, input_upload
+        )
+    except QueueFullError as e:
+        raise _queue_full(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to queue translation: {e}")
+
+    return StreamingResponse(
+        _stream_ndjson(queue),
+        media_type="application/x-ndjson",
+        headers={"X-Task-Name": task_name}
+    )
+
+
+@router.get("/text-similarities/{task_name}", response_model=TaskStatusResponse)
+async def get_task_status(task_name: str):
+    """
+    작업 상태(queued | running | done | failed)와 대기 순번 조회
+    """
+    status = task_scheduler.status(task_name)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"unknown task: {task_name}")
+    return TaskStatusResponse(**status)
+
+
+@router.get("/text-similarities/{task_name}/comparison", response_model=TextSimilarityComparison)
+async def get_comparison(task_name: str):
+    """
+    compare_types 로 제출한 작업의 엔진별 결과 (점수 높은 순)
+    """
+    status = task_scheduler.status(task_name)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"unknown task: {task_name}")
+    result = task_scheduler.result(task_name)
+    if not isinstance(result, TextSimilarityComparison):
+        raise HTTPException(
+            status_code=409, detail=f"comparison result is not available (status: {status['status']})"
+        )
+    return result
@@ -0,0 +1,354 @@
+"""
+오프라인 벤치마크: 로컬 corpus 로 scorer / M2M100 / 전체 파이프라인의 처리량을 측정합니다.
+S3 는 local storage, Google/Spring 은 in-process mock transport 로 대체하고 WebSocket 구독자는 없습니다.
+
+    python -m app.bench.run --stub-models                                   # 실제 가중치 없이 실행
+    python -m app.bench.run --stages similarity,document --batch-sizes 1,8,16 --threads 1,4 --output bench.json
+    python -m app.bench.run --stub-models --baseline bench.json             # 이전 결과와 비교
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+CORPUS_PATH = Path(__file__).resolve().parent / "data" / "corpus.jsonl"
+STAGES = ("similarity", "document", "m2m", "pipeline")
+
+
+def _parse_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _prepare_env(args):
+    """
+    app 모듈을 import 하기 전에 외부 의존성을 로컬 대체물로 바꾸는 환경변수를 설정합니다.
+    """
+    os.environ.setdefault("STORAGE_BACKEND", "local")
+    os.environ.setdefault("LOCAL_STORAGE_DIR", str(Path(tempfile.gettempdir()) / "text_similarity_bench"))
+    os.environ.setdefault("TEXT_SIMILARITY_BE_URL", "http://spring.bench")
+    os.environ.setdefault("OUTBOX_PATH", str(Path(tempfile.gettempdir()) / "text_similarity_bench" / "outbox.sqlite3"))
+    os.environ.setdefault("GOOGLE_TRANSLATE_URL", "http://google.bench/language/translate/v2")
+    if not args.with_caches:
+        # 반복 측정이 캐시 적중으로 왜곡되지 않도록 결과/임베딩 캐시 비활성화
+        os.environ["RESULT_CACHE_MAX_ENTRIES"] = "0"
+        os.environ["EMBEDDING_CACHE_MAX_MB"] = "0"
+        os.environ["EMBEDDING_CACHE_DIR"] = ""
+        os.environ["TRANSLATION_CACHE_ENABLED"] = "false"
+    if args.stub_models:
+        from app.bench import stub_models
+        stub_models.install()
+
+
+def load_corpus(path: Path) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class PeakRss:
+    """
+    측정 구간 동안 RSS 를 주기적으로 샘플링해 최대값을 기록합니다.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        from app.core.metrics import process_rss_bytes
+
+        self._read = process_rss_bytes
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._read() or 0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.baseline = self.peak = self._read() or 0
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._read() or 0)
+
+
+def _install_upstream_standins(latency_ms: float):
+    """
+    Google 번역 / Spring 결과 전송을 네트워크 없이 응답하는 mock transport 로 대체
+    """
+    import httpx
+    from urllib.parse import parse_qs
+
+    from app.client.http_client import upstreams
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000)
+        if request.url.host == "google.bench":
+            form = parse_qs(request.content.decode("utf-8"))
+            target = form.get("target", [""])[0]
+            return httpx.Response(200, json={"data": {"translations": [
+                {"translatedText": f"[{target}] {text}"} for text in form.get("q", [])
+            ]}})
+        return httpx.Response(200, json={"status": "ok"})
+
+    for name in ("google", "spring"):
+        upstreams[name]._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _summarize(latencies: List[float], pairs: int, wall: float, rss: PeakRss) -> dict:
+    values = np.asarray(latencies, dtype=np.float64) * 1000
+    return {
+        "calls": len(latencies),
+        "pairs": pairs,
+        "wall_seconds": round(wall, 4),
+        "pairs_per_second": round(pairs / wall, 2) if wall > 0 else None,
+        "latency_ms": {
+            "p50": round(float(np.percentile(values, 50)), 3),
+            "p95": round(float(np.percentile(values, 95)), 3),
+            "mean": round(float(values.mean()), 3),
+            "max": round(float(values.max()), 3),
+        },
+        "peak_rss_mb": round(rss.peak / 2 ** 20, 1),
+        "rss_delta_mb": round((rss.peak - rss.baseline) / 2 ** 20, 1),
+    }
+
+
+async def _run_concurrent(calls: List[Callable], concurrency: int) -> List[float]:
+    """
+    코루틴 팩토리들을 최대 concurrency 개씩 동시에 실행하고 호출별 latency(초)를 반환
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def timed(call):
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*[timed(call) for call in calls])
+    return latencies
+
+
+async def bench_similarity(corpus: List[dict], args) -> Tuple[List[float], int]:
+    from app.model.similarity.evaluate_similarity_agent import evaluate_dual_similarity
+
+    rows = corpus * args.repeat
+    calls = [
+        (lambda row=row, i=i: evaluate_dual_similarity(
+            f"bench_{i}", row["source"], row["translation"], scoring_mode=args.scoring_mode
+        ))
+        for i, row in enumerate(rows)
+    ]
+    return await _run_concurrent(calls, args.concurrency), len(rows)
+
+
+async def bench_document(corpus: List[dict], args) -> Tuple[List[float], int]:
+    from app.model.similarity.evaluate_similarity_agent import score_pairs
+
+    pairs = [(row["source"], row["translation"]) for row in corpus]
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        await score_pairs(pairs)
+        latencies.append(time.perf_counter() - started)
+    return latencies, len(pairs) * args.repeat
+
+
+async def bench_m2m(corpus: List[dict], args, batch_size: int) -> Tuple[List[float], int]:
+    from app.core.executor import inference_executor
+    from app.model.translate.m2m100 import translate_m2m100_batch
+
+    texts = [row["source"] for row in corpus]
+    src, tgt = corpus[0]["src_lang"], corpus[0]["tgt_lang"]
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        await inference_executor.run(
+            translate_m2m100_batch, texts, src, tgt, num_beams=args.num_beams, batch_size=batch_size
+        )
+        latencies.append(time.perf_counter() - started)
+    return latencies, len(texts) * args.repeat
+
+
+async def bench_pipeline(corpus: List[dict], args) -> Tuple[List[float], int]:
+    from app.schema.text_similarity_dto import Language, TextSimilarityRequest, TranslateType
+    from app.service.text_similarity_service import run_text_similarity
+
+    rows = corpus * args.repeat
+    calls = []
+    for i, row in enumerate(rows):
+        task_name = f"bench_pipeline_{i}"
+        request = TextSimilarityRequest(
+            input_text=row["source"],
+            input_language=Language(row["src_lang"]),
+            output_language=Language(row["tgt_lang"]),
+            translate_type=TranslateType.GOOGLE,
+            total_project_id=0,
+            input_text_key=f"text_similarity/{task_name}/input.txt",
+            scoring_mode=args.scoring_mode,
+        )
+        calls.append(lambda task_name=task_name, request=request: run_text_similarity(task_name, request))
+    return await _run_concurrent(calls, args.concurrency), len(rows)
+
+
+def _set_batch_size(batch_size: int):
+    from app.model.similarity.evaluate_similarity_agent import scorer_batchers
+
+    for batcher in scorer_batchers.values():
+        batcher.max_batch_size = batch_size
+
+
+async def run_benchmarks(args) -> dict:
+    import torch
+
+    import app.core.models as models
+
+    _install_upstream_standins(args.upstream_latency_ms)
+    models.init_models()
+    corpus = load_corpus(Path(args.corpus))
+
+    results = []
+    for threads in args.threads:
+        torch.set_num_threads(threads)
+        for batch_size in args.batch_sizes:
+            _set_batch_size(batch_size)
+            for stage in args.stages:
+                if stage == "m2m":
+                    run = lambda: bench_m2m(corpus, args, batch_size)
+                else:
+                    run = {
+                        "similarity": lambda: bench_similarity(corpus, args),
+                        "document": lambda: bench_document(corpus, args),
+                        "pipeline": lambda: bench_pipeline(corpus, args),
+                    }[stage]
+                # 모델 lazy 초기화/할당자 warm-up 은 측정에서 제외
+                for _ in range(args.warmup):
+                    await run()
+                with PeakRss() as rss:
+                    started = time.perf_counter()
+                    latencies, pairs = await run()
+                    wall = time.perf_counter() - started
+                result = {
+                    "stage": stage,
+                    "threads": threads,
+                    "batch_size": batch_size,
+                    "concurrency": args.concurrency,
+                    **_summarize(latencies, pairs, wall, rss),
+                }
+                results.append(result)
+                print(
+                    f"{stage:<10} threads={threads:<2} batch={batch_size:<3} "
+                    f"pairs/s={result['pairs_per_second']:>9} p50={result['latency_ms']['p50']:>9}ms "
+                    f"p95={result['latency_ms']['p95']:>9}ms peak_rss={result['peak_rss_mb']}MB",
+                    flush=True
+                )
+
+    return {"meta": _meta(args), "results": results}
+
+
+def _meta(args) -> dict:
+    import torch
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "cpu_count": os.cpu_count(),
+        "stub_models": args.stub_models,
+        "with_caches": args.with_caches,
+        "corpus": str(args.corpus),
+        "repeat": args.repeat,
+        "num_beams": args.num_beams,
+        "scoring_mode": args.scoring_mode,
+        "argv": sys.argv[1:],
+    }
+
+
+def _result_key(result: dict) -> Tuple:
+    return result["stage"], result["threads"], result["batch_size"], result["concurrency"]
+
+
+def compare(baseline: dict, current: dict):
+    """
+    같은 (stage, threads, batch_size, concurrency) 조합끼리 처리량/p95 변화율 출력
+    """
+    previous: Dict[Tuple, dict] = {_result_key(r): r for r in baseline["results"]}
+    print(f"\ncompared with {baseline['meta'].get('git_commit')} ({baseline['meta'].get('timestamp')})")
+    for result in current["results"]:
+        old = previous.get(_result_key(result))
+        if old is None:
+            continue
+        throughput = (result["pairs_per_second"] / old["pairs_per_second"] - 1) * 100
+        p95 = (result["latency_ms"]["p95"] / old["latency_ms"]["p95"] - 1) * 100
+        print(
+            f"{result['stage']:<10} threads={result['threads']:<2} batch={result['batch_size']:<3} "
+            f"pairs/s {throughput:+6.1f}%  p95 {p95:+6.1f}%"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline text-similarity benchmark")
+    parser.add_argument("--stages", default="similarity,document,m2m,pipeline",
+                        help=f"쉼표로 구분 ({', '.join(STAGES)})")
+    parser.add_argument("--batch-sizes", default="1,16", help="scorer micro-batch / M2M batch 크기 목록")
+    parser.add_argument("--threads", default=str(os.cpu_count() or 1), help="torch intra-op 스레드 수 목록")
+    parser.add_argument("--concurrency", type=int, default=16, help="similarity/pipeline 동시 요청 수")
+    parser.add_argument("--repeat", type=int, default=3, help="corpus 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--num-beams", type=int, default=4)
+    parser.add_argument("--scoring-mode", default="full", help="similarity/pipeline 채점 모드 (full | tiered)")
+    parser.add_argument("--corpus", default=str(CORPUS_PATH))
+    parser.add_argument("--upstream-latency-ms", type=float, default=0.0, help="Google/Spring stand-in 응답 지연")
+    parser.add_argument("--stub-models", action="store_true", help="실제 모델 대신 작은 stub 모델 사용")
+    parser.add_argument("--with-caches", action="store_true", help="결과/임베딩 캐시를 켠 상태로 측정")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: bench-<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    args.stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    args.batch_sizes = _parse_ints(args.batch_sizes)
+    args.threads = _parse_ints(args.threads)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    _prepare_env(args)
+
+    report = asyncio.run(run_benchmarks(args))
+
+    output = Path(args.output or f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nresults saved to {output}")
+
+    if args.baseline:
+        compare(json.loads(Path(args.baseline).read_text(encoding="utf-8")), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+벤치마크용 작은 stand-in 모델.
+실제 가중치 없이 transformers / sentence_transformers / bert_score / comet 모듈 자리를 채우고,
+입력 길이·batch 크기·beam 수에 비례하는 torch 연산을 수행해 batching/스레드 효과를 측정할 수 있게 합니다.
+install() 은 app.core.models 를 import 하기 전에 호출해야 합니다.
+"""
+import hashlib
+import sys
+import types
+from typing import Dict, List
+
+import torch
+import torch.nn.functional as F
+
+FEATURE_DIM = 256
+HIDDEN_DIM = 768
+VOCAB_SIZE = 8192
+# 0~3 은 special token, 그 뒤로 언어 토큰
+_LANG_IDS = {"en": 4, "ko": 5, "ja": 6, "hi": 7}
+_FIRST_WORD_ID = 16
+
+
+def _seed(name: str) -> int:
+    return int.from_bytes(hashlib.sha1(name.encode("utf-8")).digest()[:4], "little")
+
+
+def _hash_id(token: str, buckets: int) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little") % buckets
+
+
+def _featurize(texts: List[str]) -> torch.Tensor:
+    """
+    문자 trigram hashing bag-of-features (n, FEATURE_DIM)
+    """
+    features = torch.zeros(len(texts), FEATURE_DIM)
+    for row, text in enumerate(texts):
+        padded = f"  {text}  "
+        for i in range(len(padded) - 2):
+            features[row, _hash_id(padded[i:i + 3], FEATURE_DIM)] += 1.0
+    return F.normalize(features, dim=-1)
+
+
+def _encoder(name: str) -> torch.nn.Sequential:
+    torch.manual_seed(_seed(name))
+    return torch.nn.Sequential(
+        torch.nn.Linear(FEATURE_DIM, HIDDEN_DIM),
+        torch.nn.GELU(),
+        torch.nn.Linear(HIDDEN_DIM, HIDDEN_DIM),
+    ).eval()
+
+
+class StubSentenceTransformer(torch.nn.Module):
+    def __init__(self, model_name_or_path: str, device: str = "cpu", backend: str = "torch", **kwargs):
+        super().__init__()
+        if backend != "torch":
+            raise RuntimeError(f"stub model does not support backend={backend}")
+        self.encoder = _encoder(model_name_or_path)
+
+    def encode(self, sentences: List[str], **kwargs) -> torch.Tensor:
+        with torch.inference_mode():
+            return F.normalize(self.encoder(_featurize(sentences)), dim=-1)
+
+
+class StubBERTScorer:
+    def __init__(self, model_type: str = "stub", **kwargs):
+        self._model = _encoder(f"bertscore:{model_type}")
+
+    def _token_embeddings(self, text: str) -> torch.Tensor:
+        tokens = text.split() or [text]
+        return F.normalize(self._model(_featurize(tokens)), dim=-1)
+
+    def score(self, cands: List[str], refs: List[str], batch_size: int = 64, **kwargs):
+        precision, recall, f1 = [], [], []
+        with torch.inference_mode():
+            for cand, ref in zip(cands, refs):
+                sim = self._token_embeddings(cand) @ self._token_embeddings(ref).T
+                p = sim.max(dim=1).values.mean()
+                r = sim.max(dim=0).values.mean()
+                precision.append(p)
+                recall.append(r)
+                f1.append(2 * p * r / (p + r))
+        return torch.stack(precision), torch.stack(recall), torch.stack(f1)
+
+
+class _Prediction:
+    def __init__(self, scores: List[float]):
+        self.scores = scores
+        self.system_score = sum(scores) / len(scores) if scores else 0.0
+
+
+class StubComet(torch.nn.Module):
+    def __init__(self, name: str):
+        super().__init__()
+        self.encoder = _encoder(f"comet:{name}")
+        self.head = torch.nn.Linear(HIDDEN_DIM * 2, 1)
+
+    def predict(self, samples: List[Dict[str, str]], batch_size: int = 8, gpus: int = 0, **kwargs) -> _Prediction:
+        scores: List[float] = []
+        with torch.inference_mode():
+            for i in range(0, len(samples), batch_size):
+                chunk = samples[i:i + batch_size]
+                src = self.encoder(_featurize([s["src"] for s in chunk]))
+                mt = self.encoder(_featurize([s["mt"] for s in chunk]))
+                scores.extend(torch.sigmoid(self.head(torch.cat([src, mt], dim=-1))).squeeze(-1).tolist())
+        return _Prediction(scores)
+
+
+class _Batch(dict):
+    def to(self, device):
+        return self
+
+
+class StubM2M100Tokenizer:
+    def __init__(self):
+        self.src_lang = "en"
+        self._words: Dict[int, str] = {}
+
+    @classmethod
+    def from_pretrained(cls, checkpoint: str, **kwargs):
+        return cls()
+
+    def get_lang_id(self, lang: str) -> int:
+        return _LANG_IDS.get(lang, 8)
+
+    def _encode(self, text: str, max_length: int) -> List[int]:
+        ids = [self.get_lang_id(self.src_lang)]
+        for word in text.split():
+            word_id = _FIRST_WORD_ID + _hash_id(word, VOCAB_SIZE - _FIRST_WORD_ID)
+            self._words[word_id] = word
+            ids.append(word_id)
+        return ids[:max_length - 1] + [2]
+
+    def __call__(self, texts, truncation: bool = False, max_length: int = 1024,
+                 return_tensors=None, padding: bool = False, **kwargs):
+        texts = [texts] if isinstance(texts, str) else texts
+        input_ids = [self._encode(text, max_length) for text in texts]
+        batch = {"input_ids": input_ids, "attention_mask": [[1] * len(ids) for ids in input_ids]}
+        if return_tensors == "pt":
+            return self.pad(batch, return_tensors="pt")
+        return batch
+
+    def pad(self, encoded, return_tensors=None, **kwargs) -> _Batch:
+        length = max(len(ids) for ids in encoded["input_ids"])
+        input_ids = [ids + [1] * (length - len(ids)) for ids in encoded["input_ids"]]
+        mask = [m + [0] * (length - len(m)) for m in encoded["attention_mask"]]
+        return _Batch(input_ids=torch.tensor(input_ids), attention_mask=torch.tensor(mask))
+
+    def batch_decode(self, sequences, skip_special_tokens: bool = True) -> List[str]:
+        return [
+            " ".join(self._words.get(int(i), "") for i in seq if int(i) >= _FIRST_WORD_ID).strip()
+            for seq in sequences
+        ]
+
+
+class StubM2M100(torch.nn.Module):
+    """
+    입력 토큰을 그대로 돌려주되, beam 수 × 출력 길이만큼 decoder step 연산을 수행합니다.
+    """
+
+    def __init__(self, checkpoint: str):
+        super().__init__()
+        torch.manual_seed(_seed(checkpoint))
+        self.embed = torch.nn.Embedding(VOCAB_SIZE, FEATURE_DIM)
+        self.encoder = torch.nn.Linear(FEATURE_DIM, FEATURE_DIM)
+        self.decoder = torch.nn.Linear(FEATURE_DIM * 2, FEATURE_DIM)
+
+    @classmethod
+    def from_pretrained(cls, checkpoint: str, **kwargs):
+        return cls(checkpoint).eval()
+
+    def generate(self, input_ids: torch.Tensor, attention_mask: torch.Tensor = None,
+                 forced_bos_token_id: int = 0, num_beams: int = 1, max_new_tokens: int = 64, **kwargs) -> torch.Tensor:
+        memory = self.encoder(self.embed(input_ids)).mean(dim=1)
+        state = memory.repeat_interleave(num_beams, dim=0)
+        context = state
+        for _ in range(min(max_new_tokens, input_ids.shape[1])):
+            state = torch.tanh(self.decoder(torch.cat([state, context], dim=-1)))
+        bos = torch.full((input_ids.shape[0], 1), forced_bos_token_id, dtype=input_ids.dtype)
+        return torch.cat([bos, input_ids[:, 1:]], dim=1)
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def install():
+    """
+    실제 모델 라이브러리 대신 stub 모듈을 sys.modules 에 등록합니다.
+    """
+    if "app.core.models" in sys.modules:
+        raise RuntimeError("stub models must be installed before app.core.models is imported")
+    sys.modules["transformers"] = _module(
+        "transformers",
+        M2M100Tokenizer=StubM2M100Tokenizer,
+        M2M100ForConditionalGeneration=StubM2M100,
+    )
+    sys.modules["sentence_transformers"] = _module(
+        "sentence_transformers", SentenceTransformer=StubSentenceTransformer
+    )
+    sys.modules["bert_score"] = _module("bert_score", BERTScorer=StubBERTScorer)
+    sys.modules["comet"] = _module(
+        "comet",
+        download_model=lambda name, **kwargs: name,
+        load_from_checkpoint=lambda path, **kwargs: StubComet(path),
+    )
@@ -0,0 +1,91 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+
+
+class Upstream:
+    """
+    외부 서비스 하나에 대한 keep-alive 연결 풀 + 동시 요청 수 제한.
+    client/semaphore 는 실행 중인 이벤트 루프에서 처음 사용할 때 만들어집니다(fork 이후 worker 별로 생성).
+    """
+
+    def __init__(self, name: str, timeout: float, max_concurrency: int):
+        self.name = name
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=max(HTTP_MAX_CONNECTIONS, self.max_concurrency),
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+                ),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def limit(self):
+        """
+        upstream 별 동시 요청 수 제한 구간
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        async with self.limit():
+            return await self.client.request(method, url, **kwargs)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "max_concurrency": self.max_concurrency}
+
+
+def _upstream(name: str, default_concurrency: int, default_timeout: float = HTTP_TIMEOUT_SECONDS) -> Upstream:
+    key = name.upper()
+    return Upstream(
+        name,
+        timeout=float(os.getenv(f"HTTP_TIMEOUT_{key}", str(default_timeout))),
+        max_concurrency=int(os.getenv(f"HTTP_CONCURRENCY_{key}", str(default_concurrency))),
+    )
+
+
+upstreams: Dict[str, Upstream] = {
+    "google": _upstream("google", 8),
+    "openai": _upstream("openai", 4),
+    "spring": _upstream("spring", 4, default_timeout=5),
+}
+
+
+async def close_upstreams():
+    for upstream in upstreams.values():
+        await upstream.aclose()
@@ -0,0 +1,351 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from app.client.http_client import upstreams
+from app.core.metrics import callback_seconds
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+TEXT_SIMILARITY_BE_URL = os.getenv("TEXT_SIMILARITY_BE_URL")
+RESULT_URL = f"{TEXT_SIMILARITY_BE_URL}/api/text-similarities"
+# 지정하면 결과 여러 개를 JSON 배열 하나로 묶어 전송 (예: {TEXT_SIMILARITY_BE_URL}/api/text-similarities/batch)
+OUTBOX_BATCH_URL = os.getenv("OUTBOX_BATCH_URL", "")
+# worker 프로세스들이 같은 파일을 공유 (WAL 모드)
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", "/tmp/text_similarity_cache/outbox.sqlite3")
+# 한 번에 꺼내서 전송할 결과 수 (batch 모드에서는 요청 하나에 담는 최대 개수)
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "12"))
+OUTBOX_BACKOFF_BASE_SECONDS = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "1"))
+OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "300"))
+# 새 결과 알림이 없어도 재시도 시각이 된 항목/다른 worker 가 남긴 항목을 확인하는 주기
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+# 꺼낸 항목을 다른 worker 가 가져가지 못하게 잠그는 시간 (전송 중 프로세스가 죽으면 이후 재시도)
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_name TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    locked_by TEXT,
+    locked_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, next_attempt_at);
+"""
+
+Row = Tuple[int, str, int]
+
+
+class DeliveryError(Exception):
+    """
+    전송 실패. retryable=False 면 다시 보내도 성공할 수 없는 응답(4xx)
+    """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class ResultOutbox:
+    """
+    Spring 결과 전송용 SQLite outbox.
+    결과는 먼저 파일에 기록하고, 백그라운드 sender 가 연결 풀을 통해 비동기로 전송합니다.
+    실패하면 지수 backoff 로 재시도하고, OUTBOX_MAX_ATTEMPTS 를 넘거나 4xx 응답이면 dead 로 남깁니다.
+    batch 전송이 4xx 로 거절되면 항목별로 다시 보내 실패한 항목만 dead 로 남깁니다.
+    pre-fork worker 들은 lease 로 항목을 나눠 가져가므로 같은 결과를 동시에 보내지 않습니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_url: str,
+        batch_size: int,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        poll_seconds: float,
+        lease_seconds: float,
+    ):
+        self.path = path
+        self.batch_url = batch_url
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outbox")
+        self._owner = uuid.uuid4().hex
+        self._sender: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.retried = 0
+        self.dead = 0
+
+    # ---- SQLite (outbox 스레드에서 실행) ----
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _insert(self, task_name: Optional[str], payload: str):
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO outbox (task_name, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+            (task_name, payload, now, now)
+        )
+
+    def _claim(self) -> List[Row]:
+        """
+        전송할 차례인 항목을 lease 로 잠그고 (id, payload, attempts) 리스트로 반환
+        """
+        conn = self._connect()
+        now = time.time()
+        locked_until = now + self.lease_seconds
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE outbox SET locked_by = ?, locked_until = ? WHERE id IN ("
+                "  SELECT id FROM outbox WHERE status = 'pending' AND next_attempt_at <= ?"
+                "  AND (locked_until IS NULL OR locked_until < ?) ORDER BY id LIMIT ?"
+                ")",
+                (self._owner, locked_until, now, now, self.batch_size)
+            )
+            # 이번에 잠근 항목만 (전에 잠갔다가 아직 lease 가 남은 항목은 이미 전송 중이므로 제외)
+            rows = conn.execute(
+                "SELECT id, payload, attempts FROM outbox"
+                " WHERE locked_by = ? AND locked_until = ? AND status = 'pending' ORDER BY id",
+                (self._owner, locked_until)
+            ).fetchall()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def _finish(self, delivered: List[int], failed: List[Tuple[int, int, str, bool]]) -> Set[int]:
+        """
+        전송 성공 항목은 삭제하고, 실패 항목은 다음 재시도 시각을 정하거나 dead 로 표시.
+        lease 가 만료되어 다른 worker 가 가져간 항목은 건드리지 않고, 실제로 반영된 id 집합을 반환
+        """
+        conn = self._connect()
+        now = time.time()
+        applied: Set[int] = set()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for row_id in delivered:
+                if conn.execute(
+                    "DELETE FROM outbox WHERE id = ? AND locked_by = ?", (row_id, self._owner)
+                ).rowcount:
+                    applied.add(row_id)
+            for row_id, attempts, error, retryable in failed:
+                if not retryable or attempts >= self.max_attempts:
+                    cursor = conn.execute(
+                        "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ?, "
+                        "locked_by = NULL, locked_until = NULL WHERE id = ? AND locked_by = ?",
+                        (attempts, error, row_id, self._owner)
+                    )
+                else:
+                    cursor = conn.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, "
+                        "locked_by = NULL, locked_until = NULL WHERE id = ? AND locked_by = ?",
+                        (attempts, now + self._backoff(attempts), error, row_id, self._owner)
+                    )
+                if cursor.rowcount:
+                    applied.add(row_id)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return applied
+
+    def _counts(self) -> dict:
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return dict(rows)
+
+    async def _db(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # ---- 전송 ----
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+        # 여러 worker 가 동시에 재시도하지 않도록 jitter
+        return delay * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _check(response: httpx.Response):
+        if response.is_success:
+            return
+        retryable = response.status_code >= 500 or response.status_code in (408, 429)
+        raise DeliveryError(f"HTTP {response.status_code}: {response.text[:200]}", retryable)
+
+    async def _post(self, url: str, body: str):
+        try:
+            with callback_seconds.time():
+                response = await upstreams["spring"].request(
+                    "POST", url, content=body, headers={"Content-Type": "application/json"}
+                )
+                self._check(response)
+        except httpx.HTTPError as e:
+            raise DeliveryError(f"{type(e).__name__}: {e}")
+
+    async def _deliver_each(self, rows: List[Row]) -> Tuple[List[int], List[Tuple[int, int, str, bool]]]:
+        """
+        항목마다 RESULT_URL 로 동시에 전송하고 (성공 id, 실패 항목) 반환
+        """
+        delivered: List[int] = []
+        failed: List[Tuple[int, int, str, bool]] = []
+        outcomes = await asyncio.gather(
+            *[self._post(RESULT_URL, payload) for _, payload, _ in rows], return_exceptions=True
+        )
+        for (row_id, _, attempts), outcome in zip(rows, outcomes):
+            if outcome is None:
+                delivered.append(row_id)
+            elif isinstance(outcome, DeliveryError):
+                failed.append((row_id, attempts + 1, str(outcome), outcome.retryable))
+            else:
+                failed.append((row_id, attempts + 1, repr(outcome), True))
+        return delivered, failed
+
+    async def _deliver(self, rows: List[Row]):
+        delivered: List[int] = []
+        failed: List[Tuple[int, int, str, bool]] = []
+
+        if self.batch_url:
+            try:
+                await self._post(self.batch_url, "[" + ",".join(payload for _, payload, _ in rows) + "]")
+                delivered = [row_id for row_id, _, _ in rows]
+            except DeliveryError as e:
+                if e.retryable:
+                    failed = [(row_id, attempts + 1, str(e), True) for row_id, _, attempts in rows]
+                else:
+                    # 잘못된 항목 하나 때문에 batch 전체가 거절될 수 있으므로 하나씩 다시 보내서 해당 항목만 dead 처리
+                    logging.warning(f"⚠️ batch of {len(rows)} results rejected ({e}); retrying one by one")
+                    delivered, failed = await self._deliver_each(rows)
+        else:
+            delivered, failed = await self._deliver_each(rows)
+
+        applied = await self._db(self._finish, delivered, failed)
+        self.delivered += sum(1 for row_id in delivered if row_id in applied)
+        for row_id, attempts, error, retryable in failed:
+            if row_id not in applied:
+                logging.warning(f"⚠️ result #{row_id} lease expired; left to the worker that reclaimed it")
+            elif not retryable or attempts >= self.max_attempts:
+                self.dead += 1
+                logging.error(f"❌ giving up on result #{row_id} after {attempts} attempts: {error}")
+            else:
+                self.retried += 1
+                logging.warning(f"⚠️ result #{row_id} delivery failed (attempt {attempts}): {error}")
+
+    async def _run(self):
+        while True:
+            try:
+                rows = await self._db(self._claim)
+                if rows:
+                    await self._deliver(rows)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"❌ outbox sender error: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """
+        실행 중인 이벤트 루프에서 sender task 시작 (이전 실행에서 남은 항목도 전송)
+        """
+        if self._sender is None or self._sender.done():
+            self._wakeup = asyncio.Event()
+            self._sender = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        sender 를 멈춥니다. 보내지 못한 항목은 파일에 남아 다음 실행에서 전송됩니다.
+        """
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+            self._sender = None
+
+    async def enqueue(self, payload: dict, task_name: Optional[str] = None):
+        """
+        결과를 outbox 에 기록하고 sender 를 깨웁니다. 기록에 실패하면 sqlite3.Error
+        """
+        await self._db(self._insert, task_name, json.dumps(payload, ensure_ascii=False))
+        self.enqueued += 1
+        self.start()
+        self._wakeup.set()
+
+    async def post_now(self, payload: dict):
+        """
+        outbox 를 거치지 않고 바로 한 번 전송 (outbox 기록이 불가능할 때 사용). 실패 시 DeliveryError
+        """
+        await self._post(RESULT_URL, json.dumps(payload, ensure_ascii=False))
+
+    async def stats(self) -> dict:
+        try:
+            counts = await self._db(self._counts)
+        except sqlite3.Error:
+            counts = {}
+        return {
+            "path": self.path,
+            "batch_url": self.batch_url or None,
+            "pending": counts.get("pending", 0),
+            "dead": counts.get("dead", 0),
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "gave_up": self.dead,
+            "sender_running": self._sender is not None and not self._sender.done(),
+        }
+
+
+result_outbox = ResultOutbox(
+    path=OUTBOX_PATH,
+    batch_url=OUTBOX_BATCH_URL,
+    batch_size=OUTBOX_BATCH_SIZE,
+    max_attempts=OUTBOX_MAX_ATTEMPTS,
+    backoff_base=OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max=OUTBOX_BACKOFF_MAX_SECONDS,
+    poll_seconds=OUTBOX_POLL_SECONDS,
+    lease_seconds=OUTBOX_LEASE_SECONDS,
+)
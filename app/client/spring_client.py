@@ -1,24 +1,24 @@
 import logging
-import os
-from pathlib import Path
+import sqlite3
 
-import requests
-from dotenv import load_dotenv
+from app.client.result_outbox import result_outbox, DeliveryError
 from app.schema.text_similarity_dto import TextSimilarityResult
 
-env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
-load_dotenv(dotenv_path=env_path)
-TEXT_SIMILARITY_BE_URL = os.getenv("TEXT_SIMILARITY_BE_URL")
-RESULT_URL = f"{TEXT_SIMILARITY_BE_URL}/api/text-similarities"
 
-
-def send_result_to_be(result: TextSimilarityResult):
+async def send_result_to_be(result: TextSimilarityResult):
+    """
+    결과를 outbox 에 기록하고 바로 반환합니다. 실제 전송/재시도는 outbox sender 가 백그라운드로 처리합니다.
+    outbox 에 기록할 수 없으면 한 번 바로 전송을 시도합니다.
+    """
+    logging.info(f"result: {result}")
+    payload = result.model_dump(mode="json")
     try:
+        await result_outbox.enqueue(payload, task_name=result.task_name)
+        return
+    except sqlite3.Error as e:
+        logging.error(f"❌ failed to write result to outbox: {e}; sending directly")
 
-        logging.info(f"result: {result}")
-
-        payload = result.model_dump()
-        resp = requests.post(RESULT_URL, json=payload, timeout=5)
-        resp.raise_for_status()
-    except Exception as e:
-        logging.info(f"Failed to send result to Spring: {e}")
\ No newline at end of file
+    try:
+        await result_outbox.post_now(payload)
+    except DeliveryError as e:
+        logging.error(f"❌ Failed to send result to Spring: {e}")
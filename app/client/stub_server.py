@@ -0,0 +1,88 @@
+"""
+Google Translation / OpenAI chat completions / Spring 결과 수신 API 를 흉내 내는 로컬 stub 서버.
+외부 네트워크 없이 테스트/벤치마크할 때 아래처럼 환경변수를 맞추고 실행합니다.
+
+    python -m app.client.stub_server            # 기본 127.0.0.1:8090
+    GOOGLE_TRANSLATE_URL=http://127.0.0.1:8090/language/translate/v2
+    GPT_BASE_URL=http://127.0.0.1:8090/v1
+    TEXT_SIMILARITY_BE_URL=http://127.0.0.1:8090
+    OUTBOX_BATCH_URL=http://127.0.0.1:8090/api/text-similarities/batch   # 결과 묶음 전송 시
+"""
+import asyncio
+import os
+import time
+from typing import List
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+STUB_HOST = os.getenv("STUB_HOST", "127.0.0.1")
+STUB_PORT = int(os.getenv("STUB_PORT", "8090"))
+# 응답 전 인위적인 지연 (네트워크 지연 흉내)
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "50"))
+
+app = FastAPI(title="Upstream stubs")
+
+# 수신한 Spring 결과 (최근 것만 보관)
+received_results: List[dict] = []
+
+
+async def _delay():
+    if STUB_LATENCY_MS > 0:
+        await asyncio.sleep(STUB_LATENCY_MS / 1000)
+
+
+@app.post("/language/translate/v2")
+async def google_translate(request: Request):
+    form = await request.form()
+    texts = form.getlist("q") or request.query_params.getlist("q")
+    target = form.get("target") or request.query_params.get("target")
+    await _delay()
+    return {"data": {"translations": [{"translatedText": f"[{target}] {text}"} for text in texts]}}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    user_message = body["messages"][-1]["content"]
+    src_text = user_message.split("\n", 1)[0].replace("src_text: ", "", 1)
+    await _delay()
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": f"[gpt] {src_text}"},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+@app.post("/api/text-similarities")
+async def receive_result(request: Request):
+    payload = await request.json()
+    received_results.append(payload)
+    del received_results[:-1000]
+    await _delay()
+    return {"status": "ok"}
+
+
+@app.post("/api/text-similarities/batch")
+async def receive_results(request: Request):
+    payloads = await request.json()
+    received_results.extend(payloads)
+    del received_results[:-1000]
+    await _delay()
+    return {"status": "ok", "received": len(payloads)}
+
+
+@app.get("/api/text-similarities")
+async def list_results():
+    return received_results
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host=STUB_HOST, port=STUB_PORT)
@@ -0,0 +1,252 @@
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+from dotenv import load_dotenv
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+
+load_dotenv(dotenv_path=env_path)
+
+BACKENDS = ("eager", "int8", "onnx")
+
+# 모델별 추론 backend (eager | int8 | onnx). 개별 설정이 없으면 INFERENCE_BACKEND 사용
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "eager")
+ONNX_CACHE_DIR = Path(os.getenv(
+    "ONNX_CACHE_DIR",
+    str(Path.home() / ".cache" / "text_similarity_agent" / "onnx")
+))
+# true 이면 backend 적용 전후 점수를 비교해서 fp32 대비 오차를 기록
+INFERENCE_PARITY_CHECK = os.getenv("INFERENCE_PARITY_CHECK", "false").lower() == "true"
+
+PARITY_PAIRS = [
+    ("Here's looking at you, kid.", "당신의 눈동자에 건배."),
+    ("The weather is nice today.", "오늘은 날씨가 좋네요."),
+    ("I will be back.", "다시 돌아올게."),
+    ("May the Force be with you.", "포스가 함께하기를."),
+]
+PARITY_SOURCES = {
+    "en": ["The weather is nice today.", "I will be back."],
+    "ko": ["오늘은 날씨가 좋네요.", "다시 돌아올게."],
+    "ja": ["今日は天気がいいですね。", "また戻ってきます。"],
+    "hi": ["आज मौसम अच्छा है।", "मैं वापस आऊंगा।"],
+}
+
+# 모델별 backend 적용 결과 및 parity 리포트
+backend_report: Dict[str, dict] = {}
+
+
+def backend_for(name: str) -> str:
+    """
+    INFERENCE_BACKEND_<NAME> 환경변수로 지정한 모델별 backend
+    """
+    backend = os.getenv(f"INFERENCE_BACKEND_{name.upper()}", INFERENCE_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported inference backend for {name}: {backend}")
+    return backend
+
+
+def quantize_int8(module: torch.nn.Module) -> torch.nn.Module:
+    """
+    nn.Linear 가중치를 int8 로 동적 양자화 (CPU 전용)
+    """
+    return torch.ao.quantization.quantize_dynamic(
+        module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+def _onnx_path(model_id: str) -> Path:
+    return ONNX_CACHE_DIR / model_id.replace("/", "__")
+
+
+def _record(name: str, backend: str, reference: Optional[List[float]], current: Optional[List[float]]):
+    report = {"backend": backend}
+    if reference is not None and current is not None:
+        diff = np.abs(np.asarray(current, dtype=np.float64) - np.asarray(reference, dtype=np.float64))
+        report["max_abs_drift"] = round(float(diff.max()), 6)
+        report["mean_abs_drift"] = round(float(diff.mean()), 6)
+        logging.info(
+            f"🔬 {name} backend={backend} parity: max drift {report['max_abs_drift']}, "
+            f"mean drift {report['mean_abs_drift']}"
+        )
+    backend_report[name] = report
+
+
+def _with_parity(
+    name: str,
+    backend: str,
+    model: Any,
+    convert: Callable[[Any], Any],
+    score: Callable[[Any], List[float]],
+) -> Any:
+    """
+    fp32 eager 모델로 기준 점수를 구한 뒤 backend 로 변환하고, 변환 후 점수와의 차이를 기록합니다.
+    """
+    reference = score(model) if INFERENCE_PARITY_CHECK and backend != "eager" else None
+    model = convert(model)
+    current = score(model) if reference is not None else None
+    _record(name, backend, reference, current)
+    return model
+
+
+def _sentence_scores(model) -> List[float]:
+    emb = model.encode(
+        [o for o, _ in PARITY_PAIRS] + [t for _, t in PARITY_PAIRS], convert_to_tensor=True
+    )
+    n = len(PARITY_PAIRS)
+    return torch.nn.functional.cosine_similarity(emb[:n], emb[n:], dim=-1).tolist()
+
+
+def load_sentence_transformer(name: str, model_id: str, device: str = "cpu"):
+    """
+    E5/LaBSE 같은 SentenceTransformer 모델을 설정된 backend 로 로드합니다.
+    onnx 는 처음 한 번 export 해서 ONNX_CACHE_DIR 에 저장하고, 이후에는 저장본을 바로 로드합니다.
+    fp32 eager 모델은 parity 확인이나 onnx 를 쓸 수 없을 때만 만듭니다.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    backend = backend_for(name)
+
+    def load_onnx():
+        try:
+            cached = _onnx_path(model_id)
+            if (cached / "onnx").exists():
+                return SentenceTransformer(str(cached), device=device, backend="onnx")
+            onnx_model = SentenceTransformer(model_id, device=device, backend="onnx")
+            onnx_model.save(str(cached))
+            return onnx_model
+        except Exception as e:
+            # optimum[onnxruntime] 미설치 또는 export 실패
+            logging.warning(f"{name}: onnx backend unavailable ({e}); falling back to eager")
+            return None
+
+    if backend == "onnx" and not INFERENCE_PARITY_CHECK:
+        onnx_model = load_onnx()
+        if onnx_model is not None:
+            backend_report[name] = {"backend": backend}
+            return onnx_model
+        backend_report[name] = {"backend": "eager"}
+        return SentenceTransformer(model_id, device=device)
+
+    model = SentenceTransformer(model_id, device=device)
+    fallback = []
+
+    def convert(eager_model):
+        if backend == "int8":
+            return quantize_int8(eager_model)
+        if backend == "onnx":
+            onnx_model = load_onnx()
+            if onnx_model is None:
+                fallback.append(backend)
+                return eager_model
+            return onnx_model
+        return eager_model
+
+    model = _with_parity(name, backend, model, convert, _sentence_scores)
+    if fallback:
+        backend_report[name]["backend"] = "eager"
+    return model
+
+
+def apply_bertscore_backend(scorer):
+    """
+    BERTScorer 내부 인코더(xlm-roberta)에 backend 적용. onnx 는 지원하지 않아 int8 로 대체합니다.
+    """
+    backend = backend_for("bertscore")
+    if backend == "onnx":
+        logging.warning("bertscore: onnx backend is not supported; using int8")
+        backend = "int8"
+
+    def convert(s):
+        if backend == "int8":
+            s._model = quantize_int8(s._model)
+        return s
+
+    def score(s) -> List[float]:
+        _, _, f1 = s.score([o for o, _ in PARITY_PAIRS], [t for _, t in PARITY_PAIRS])
+        return f1.tolist()
+
+    return _with_parity("bertscore", backend, scorer, convert, score)
+
+
+def apply_comet_backend(model):
+    """
+    COMET QE 모델에 backend 적용. onnx 는 지원하지 않아 int8 로 대체합니다.
+    """
+    backend = backend_for("comet")
+    if backend == "onnx":
+        logging.warning("comet: onnx backend is not supported; using int8")
+        backend = "int8"
+
+    def convert(m):
+        return quantize_int8(m) if backend == "int8" else m
+
+    def score(m) -> List[float]:
+        data = [{"src": o, "mt": t} for o, t in PARITY_PAIRS]
+        return [float(s) for s in m.predict(data, batch_size=8, gpus=0).scores]
+
+    return _with_parity("comet", backend, model, convert, score)
+
+
+def load_m2m_model(pair, checkpoint: str, tokenizer, device: str = "cpu"):
+    """
+    M2M100 언어쌍 모델을 backend 에 맞게 로드합니다.
+    parity 는 샘플 문장 번역 결과가 fp32 와 같은 비율(identical_ratio)로 기록합니다.
+    """
+    from transformers import M2M100ForConditionalGeneration
+
+    backend = backend_for("m2m")
+    src, tgt = pair
+    name = f"m2m_{src}-{tgt}"
+
+    def load_onnx():
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            logging.warning(f"{name}: onnx backend unavailable ({e}); falling back to eager")
+            return None
+        cached = _onnx_path(checkpoint)
+        if cached.exists():
+            return ORTModelForSeq2SeqLM.from_pretrained(str(cached))
+        onnx_model = ORTModelForSeq2SeqLM.from_pretrained(checkpoint, export=True)
+        onnx_model.save_pretrained(str(cached))
+        return onnx_model
+
+    if backend == "onnx" and not INFERENCE_PARITY_CHECK:
+        onnx_model = load_onnx()
+        if onnx_model is not None:
+            backend_report[name] = {"backend": backend}
+            return onnx_model
+
+    model = M2M100ForConditionalGeneration.from_pretrained(checkpoint).to(device)
+    model.eval()
+
+    def translate(m) -> List[str]:
+        tokenizer.src_lang = src
+        inputs = tokenizer(PARITY_SOURCES.get(src, PARITY_SOURCES["en"]), return_tensors="pt", padding=True)
+        with torch.inference_mode():
+            output = m.generate(**inputs, forced_bos_token_id=tokenizer.get_lang_id(tgt), max_new_tokens=64)
+        return tokenizer.batch_decode(output, skip_special_tokens=True)
+
+    reference = translate(model) if INFERENCE_PARITY_CHECK and backend != "eager" else None
+    if backend == "int8":
+        model = quantize_int8(model)
+    elif backend == "onnx":
+        onnx_model = load_onnx()
+        if onnx_model is None:
+            backend = "eager"
+        else:
+            model = onnx_model
+
+    report = {"backend": backend}
+    if reference is not None:
+        current = translate(model)
+        report["identical_ratio"] = round(
+            sum(a == b for a, b in zip(reference, current)) / len(reference), 4
+        )
+        logging.info(f"🔬 {name} backend={backend} parity: identical_ratio {report['identical_ratio']}")
+    backend_report[name] = report
+    return model
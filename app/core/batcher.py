@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.core.metrics import scorer_batch_seconds, scorer_batch_size, scorer_wait_seconds
+
+
+class MicroBatcher:
+    """
+    여러 동시 요청의 입력을 짧은 시간(window) 동안 모아서 한 번의 배치 호출로 처리합니다.
+    batch_fn 은 입력 리스트를 받아 같은 순서의 결과 리스트를 반환해야 합니다.
+    executor 가 주어지면 batch_fn 은 이벤트 루프 밖에서 실행됩니다.
+    모델 추론(COMET predict 등)은 thread-safe 하지 않으므로 batcher 당 한 번에 한 배치만 실행하고,
+    실행 중에 들어온 항목은 대기열에 모았다가 앞 배치가 끝나면 이어서 실행합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        executor=None,
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.executor = executor
+
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 실행 중인 배치 (없으면 None)
+        self._running: Optional[asyncio.Task] = None
+
+        # 통계
+        self.batch_count = 0
+        self.item_count = 0
+        self.max_observed_batch = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_observed_ms = 0.0
+        self.total_run_ms = 0.0
+
+    async def submit(self, item: Any) -> Any:
+        """
+        item 하나를 대기열에 넣고, 배치 처리 후 해당 item 의 결과를 반환합니다.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush_soon(loop)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush_soon, loop)
+
+        return await future
+
+    def _flush_soon(self, loop: asyncio.AbstractEventLoop):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # 실행 중인 배치가 있으면 끝난 뒤 남은 항목을 이어서 실행
+        if not self._pending or self._running is not None:
+            return
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        self._running = loop.create_task(self._run_batch(batch))
+        self._running.add_done_callback(lambda _: self._batch_done(loop))
+
+    def _batch_done(self, loop: asyncio.AbstractEventLoop):
+        self._running = None
+        # 앞 배치를 기다리는 동안 이미 window 이상 대기했으므로 바로 실행
+        self._flush_soon(loop)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        started = time.perf_counter()
+        items = [item for item, _, _ in batch]
+
+        for _, _, enqueued in batch:
+            wait_ms = (started - enqueued) * 1000
+            scorer_wait_seconds.observe(wait_ms / 1000, batcher=self.name)
+            self.total_wait_ms += wait_ms
+            self.max_wait_observed_ms = max(self.max_wait_observed_ms, wait_ms)
+
+        try:
+            results = await self._call(items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name} batch returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as e:
+            logging.error(f"❌ {self.name} batch failed (size={len(items)}): {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.batch_count += 1
+            self.item_count += len(items)
+            self.max_observed_batch = max(self.max_observed_batch, len(items))
+            run_seconds = time.perf_counter() - started
+            self.total_run_ms += run_seconds * 1000
+            scorer_batch_seconds.observe(run_seconds, batcher=self.name)
+            scorer_batch_size.observe(len(items), batcher=self.name)
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _call(self, items: List[Any]) -> List[Any]:
+        if self.executor is not None:
+            return await self.executor.run(self.batch_fn, items, name=self.name)
+        return self.batch_fn(items)
+
+    def stats(self) -> dict:
+        batches = self.batch_count or 1
+        items = self.item_count or 1
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "pending": len(self._pending),
+            "running": self._running is not None,
+            "batches": self.batch_count,
+            "items": self.item_count,
+            "avg_batch_size": round(self.item_count / batches, 2),
+            "max_observed_batch_size": self.max_observed_batch,
+            "avg_wait_ms": round(self.total_wait_ms / items, 3),
+            "max_wait_ms_observed": round(self.max_wait_observed_ms, 3),
+            "avg_batch_run_ms": round(self.total_run_ms / batches, 3),
+        }
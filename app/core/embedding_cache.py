@@ -0,0 +1,193 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+
+load_dotenv(dotenv_path=env_path)
+
+EMBEDDING_CACHE_MAX_MB = float(os.getenv("EMBEDDING_CACHE_MAX_MB", "256"))
+# 비어 있으면 디스크 저장 없이 메모리 LRU 만 사용
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "")
+
+CacheKey = Tuple[str, str, str]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _DiskStore:
+    """
+    모델 하나의 임베딩을 float32 행 단위로 append 하는 memory-mapped 저장소
+    (vectors.f32 + index.tsv + meta.json)
+    """
+
+    def __init__(self, root: Path, model_id: str):
+        self.dir = root / re.sub(r"[^A-Za-z0-9_.-]", "_", model_id)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.dir / "vectors.f32"
+        self.index_path = self.dir / "index.tsv"
+        self.meta_path = self.dir / "meta.json"
+
+        self.dim: Optional[int] = None
+        self.index: Dict[Tuple[str, str], int] = {}
+        self._mmap: Optional[np.memmap] = None
+
+        if self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text())["dim"]
+        if self.index_path.exists():
+            rows = self._rows()
+            owners: Dict[int, Tuple[str, str]] = {}
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) == 3 and int(parts[2]) < rows:
+                        # 쓰기 도중 종료된 뒤 재사용된 행은 나중에 기록된 줄이 유효
+                        owners[int(parts[2])] = (parts[0], parts[1])
+            self.index = {key: row for row, key in owners.items()}
+
+    def _rows(self) -> int:
+        if self.dim is None or not self.vectors_path.exists():
+            return 0
+        return self.vectors_path.stat().st_size // (self.dim * 4)
+
+    def get(self, prefix: str, digest: str) -> Optional[np.ndarray]:
+        row = self.index.get((prefix, digest))
+        if row is None:
+            return None
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            rows = self._rows()
+            if row >= rows:
+                # 쓰기 도중 종료되어 인덱스만 남고 벡터는 없는 행
+                return None
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return np.array(self._mmap[row])
+
+    def put_many(self, entries: Sequence[Tuple[str, str, np.ndarray]]):
+        if not entries:
+            return
+        if self.dim is None:
+            self.dim = int(entries[0][2].shape[-1])
+            self.meta_path.write_text(json.dumps({"dim": self.dim}))
+
+        with open(self.vectors_path, "ab") as vf, open(self.index_path, "a", encoding="utf-8") as xf:
+            # 여러 프로세스가 같은 저장소에 append 할 수 있으므로 파일 락으로 행 번호를 보호
+            fcntl.flock(vf, fcntl.LOCK_EX)
+            try:
+                row = vf.seek(0, os.SEEK_END) // (self.dim * 4)
+                # 쓰기 도중 종료되어 남은 불완전한 행은 잘라냄
+                vf.truncate(row * self.dim * 4)
+                for prefix, digest, vector in entries:
+                    vf.write(np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+                    xf.write(f"{prefix}\t{digest}\t{row}\n")
+                    self.index[(prefix, digest)] = row
+                    row += 1
+                # 락을 풀기 전에 벡터 → 인덱스 순서로 기록 (인덱스가 벡터보다 앞서지 않도록)
+                vf.flush()
+                xf.flush()
+            finally:
+                fcntl.flock(vf, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """
+    (model id, prefix, text hash) 로 문장 임베딩을 캐시합니다.
+    메모리는 max_bytes 이하 LRU, disk_dir 가 있으면 재시작 후에도 남는 memmap 저장소를 함께 사용합니다.
+    """
+
+    def __init__(self, max_bytes: int, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.disk_root = Path(disk_dir) if disk_dir else None
+        self._memory: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: Dict[str, _DiskStore] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_store(self, model_id: str) -> Optional[_DiskStore]:
+        if self.disk_root is None:
+            return None
+        store = self._disk.get(model_id)
+        if store is None:
+            store = _DiskStore(self.disk_root, model_id)
+            self._disk[model_id] = store
+            logging.info(f"💾 embedding disk cache for {model_id}: {len(store.index)} entries")
+        return store
+
+    def _remember(self, key: CacheKey, vector: np.ndarray):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = vector
+        self._memory_bytes += vector.nbytes
+        while self._memory_bytes > self.max_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def get_many(self, model_id: str, items: Sequence[Tuple[str, str]]) -> List[Optional[np.ndarray]]:
+        """
+        (prefix, text) 리스트에 대한 캐시된 임베딩 리스트 (없으면 None)
+        """
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            store = self._disk_store(model_id)
+            for prefix, text in items:
+                digest = text_hash(text)
+                key = (model_id, prefix, digest)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                elif store is not None and (vector := store.get(prefix, digest)) is not None:
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+                results.append(vector)
+        return results
+
+    def put_many(self, model_id: str, items: Sequence[Tuple[str, str]], vectors: np.ndarray):
+        with self._lock:
+            store = self._disk_store(model_id)
+            disk_entries = []
+            for (prefix, text), vector in zip(items, vectors):
+                digest = text_hash(text)
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember((model_id, prefix, digest), vector)
+                if store is not None and (prefix, digest) not in store.index:
+                    disk_entries.append((prefix, digest, vector))
+            if store is not None:
+                store.put_many(disk_entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "max_bytes": self.max_bytes,
+            "disk_entries": {model_id: len(s.index) for model_id, s in self._disk.items()},
+        }
+
+
+embedding_cache = EmbeddingCache(
+    max_bytes=int(EMBEDDING_CACHE_MAX_MB * 1024 * 1024),
+    disk_dir=EMBEDDING_CACHE_DIR or None,
+)
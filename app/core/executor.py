@@ -0,0 +1,146 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+
+load_dotenv(dotenv_path=env_path)
+
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+# 연산 하나가 쓰는 torch intra-op 스레드 수. 0 이면 CPU 코어 수를 worker 수로 나눠서 사용
+INFERENCE_TORCH_THREADS = int(os.getenv("INFERENCE_TORCH_THREADS", "0"))
+
+
+def _timed_call(fn: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+class InferenceExecutor:
+    """
+    CPU 바운드 모델 추론을 asyncio 이벤트 루프 밖 전용 thread pool 에서 실행합니다.
+    torch 연산은 GIL 을 풀고 실행되므로 thread 로 충분하고, 여러 프로세스가 필요하면
+    WEB_WORKERS 로 모델을 로드한 뒤 fork 된 서버 프로세스를 늘립니다.
+    """
+
+    def __init__(self, workers: int = 1, torch_threads: int = 0):
+        self.workers = max(1, workers)
+        self._fixed_torch_threads = torch_threads
+        # 같은 코어를 나눠 쓰는 서버 프로세스 수 (share_cpus)
+        self._processes = 1
+        self.torch_threads = torch_threads or self._shared_threads()
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._calls: Dict[str, Dict[str, float]] = {}
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            import torch
+            # torch 스레드 수는 worker 별이 아니라 프로세스 전역 설정이므로 pool 을 시작할 때 한 번만 설정.
+            # worker 들이 동시에 연산하면 각자 이 수만큼 스레드를 쓰므로 합이 코어 수를 넘지 않도록 나눈 값
+            torch.set_num_threads(self.torch_threads)
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="inference",
+            )
+            logging.info(
+                f"🧵 inference executor started: workers={self.workers}, torch_threads={self.torch_threads}"
+            )
+        return self._pool
+
+    def _shared_threads(self) -> int:
+        return max(1, (os.cpu_count() or 1) // (self.workers * self._processes))
+
+    def reserve_workers(self, workers: int):
+        """
+        pool 시작 전에 최소 worker 수를 보장하고, CPU 스레드를 worker 끼리 나눠 갖도록 재계산합니다.
+        """
+        if self._pool is not None:
+            logging.warning(f"inference executor already started; cannot reserve {workers} workers")
+            return
+        if workers <= self.workers:
+            return
+        self.workers = workers
+        if not self._fixed_torch_threads:
+            self.torch_threads = self._shared_threads()
+
+    def share_cpus(self, processes: int):
+        """
+        여러 서버 프로세스가 같은 코어를 나눠 쓰는 경우 프로세스당 torch 스레드 수를 줄입니다.
+        """
+        if self._fixed_torch_threads or processes <= 1:
+            return
+        self._processes = processes
+        self.torch_threads = self._shared_threads()
+
+    async def run(self, fn: Callable, *args, name: Optional[str] = None, **kwargs) -> Any:
+        """
+        fn(*args, **kwargs) 를 inference pool 에서 실행하고 결과를 반환합니다.
+        """
+        name = name or getattr(fn, "__name__", "call")
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        self._in_flight += 1
+        try:
+            result, exec_time = await loop.run_in_executor(
+                self._get_pool(),
+                functools.partial(_timed_call, fn, *args, **kwargs),
+            )
+        finally:
+            self._in_flight -= 1
+        self._record(name, time.perf_counter() - submitted, exec_time)
+        return result
+
+    def _record(self, name: str, latency: float, exec_time: float):
+        stat = self._calls.setdefault(name, {
+            "count": 0, "total_latency": 0.0, "max_latency": 0.0, "total_exec": 0.0,
+        })
+        stat["count"] += 1
+        stat["total_latency"] += latency
+        stat["max_latency"] = max(stat["max_latency"], latency)
+        stat["total_exec"] += exec_time
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        worker 를 기다리고 있는 호출 수
+        """
+        return max(0, self._in_flight - self.workers)
+
+    def stats(self) -> dict:
+        calls = {
+            name: {
+                "count": int(s["count"]),
+                "avg_latency_ms": round(s["total_latency"] / s["count"] * 1000, 2),
+                "max_latency_ms": round(s["max_latency"] * 1000, 2),
+                "avg_exec_ms": round(s["total_exec"] / s["count"] * 1000, 2),
+            }
+            for name, s in self._calls.items()
+        }
+        return {
+            "workers": self.workers,
+            "torch_threads": self.torch_threads,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "calls": calls,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+inference_executor = InferenceExecutor(
+    workers=INFERENCE_WORKERS,
+    torch_threads=INFERENCE_TORCH_THREADS,
+)
@@ -0,0 +1,147 @@
+"""
+Prometheus text format(0.0.4) 메트릭. 외부 의존성 없이 histogram 만 직접 누적하고,
+gauge/counter 값은 /metrics 요청 시 각 모듈의 stats 에서 읽어 옵니다.
+pre-fork 로 worker 가 여러 개면 값은 응답한 worker 프로세스 기준입니다.
+"""
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    label 조합별 누적 bucket 카운트를 보관하는 histogram (thread-safe)
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # bucket 카운트들 + sum + count
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        구간 실행 시간을 기록합니다. labelnames 에 outcome 이 있으면 ok/error 를 자동으로 채웁니다.
+        """
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            if "outcome" in self.labelnames:
+                labels["outcome"] = outcome
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in sorted(series.items()):
+            labels = dict(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, values):
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': le})} {int(count)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {values[-2]!r}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {int(values[-1])}")
+        return lines
+
+
+def render_samples(name: str, documentation: str, kind: str, samples: Iterable[Sample]) -> List[str]:
+    """
+    gauge / counter 한 종류를 Prometheus text 로 변환
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return lines
+
+
+def process_rss_bytes() -> Optional[int]:
+    """
+    현재 프로세스 RSS. /proc 이 없으면 최대 RSS 로 대체
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+scorer_batch_seconds = Histogram(
+    "text_similarity_batch_run_seconds", "Micro-batch inference time per batch", ["batcher"]
+)
+scorer_batch_size = Histogram(
+    "text_similarity_batch_size", "Items per micro-batch", ["batcher"], buckets=BATCH_SIZE_BUCKETS
+)
+scorer_wait_seconds = Histogram(
+    "text_similarity_batch_wait_seconds", "Time an item waited before its micro-batch started", ["batcher"]
+)
+translation_seconds = Histogram(
+    "text_similarity_translation_seconds", "Translation latency per call", ["engine", "mode", "outcome"]
+)
+storage_upload_seconds = Histogram(
+    "text_similarity_storage_upload_seconds", "Object storage upload latency", ["backend", "outcome"]
+)
+callback_seconds = Histogram(
+    "text_similarity_callback_seconds", "Spring result callback latency", ["outcome"]
+)
+task_seconds = Histogram(
+    "text_similarity_task_seconds", "Scheduled task run time", ["lane", "status"]
+)
+task_queue_wait_seconds = Histogram(
+    "text_similarity_task_queue_wait_seconds", "Time a task waited in the scheduler queue", ["lane"]
+)
+
+histograms = [
+    scorer_batch_seconds,
+    scorer_batch_size,
+    scorer_wait_seconds,
+    translation_seconds,
+    storage_upload_seconds,
+    callback_seconds,
+    task_seconds,
+    task_queue_wait_seconds,
+]
@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+Pair = Tuple[str, str]
+
+
+def _normalize(pair: Pair) -> Pair:
+    # Language enum 도 일반 문자열 코드로 맞춤
+    return tuple(getattr(lang, "value", lang) for lang in pair)
+
+
+def _model_bytes(model: Any) -> int:
+    """
+    모델 메모리 크기(byte) 추정. torch 모듈이면 parameter + buffer 크기,
+    onnx(ORT) 모델이면 ORT session 이 메모리에 올리는 디스크의 가중치 파일 크기. 알 수 없으면 0
+    """
+    if hasattr(model, "parameters") and hasattr(model, "buffers"):
+        tensors = list(model.parameters()) + list(model.buffers())
+        size = sum(t.numel() * t.element_size() for t in tensors)
+        if size:
+            return size
+    model_dir = getattr(model, "model_save_dir", None)
+    if model_dir is not None and Path(model_dir).is_dir():
+        # model.onnx, model.onnx_data(외부 가중치) 등
+        return sum(f.stat().st_size for f in Path(model_dir).rglob("*") if f.is_file() and ".onnx" in f.name)
+    return 0
+
+
+class ModelRegistry:
+    """
+    언어쌍별 번역 모델을 처음 요청될 때 로드하고,
+    resident 개수/메모리 예산을 넘으면 가장 오래 사용하지 않은 (pin 되지 않은) 모델을 내립니다.
+    새 모델은 예상 크기만큼 자리를 먼저 비운 뒤 로드하므로 로드 중에도 예산을 넘지 않습니다.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Pair], Tuple[Any, Any]],
+        supported_pairs: Iterable[Pair],
+        max_resident: int = 4,
+        memory_budget_bytes: int = 0,
+        pinned: Iterable[Pair] = (),
+        model_size_bytes: int = 0,
+    ):
+        self.loader = loader
+        self.supported_pairs: List[Pair] = list(supported_pairs)
+        self.max_resident = max(1, max_resident)
+        self.memory_budget_bytes = memory_budget_bytes
+        # 크기를 잴 수 없는 모델 / 처음 로드하는 모델의 예상 크기 (0 이면 모름)
+        self.model_size_bytes = model_size_bytes
+        self.pinned: Set[Pair] = set()
+        for pair in pinned:
+            self.pin(pair)
+
+        # pair -> (tokenizer, model, bytes)
+        self._resident: "OrderedDict[Pair, Tuple[Any, Any, int]]" = OrderedDict()
+        # 마지막으로 로드했을 때의 모델 크기 (내린 뒤에도 유지해서 다음 로드 전 예상치로 사용)
+        self._sizes: Dict[Pair, int] = {}
+        # 로드 중인 언어쌍의 예상 크기
+        self._loading: Dict[Pair, int] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Pair, threading.Lock] = {}
+
+        self.loads = 0
+        self.evictions = 0
+        self.hits = 0
+
+    def get(self, pair: Pair) -> Tuple[Any, Any]:
+        """
+        (tokenizer, model) 반환. 로드되어 있지 않으면 로드합니다.
+        """
+        pair = _normalize(pair)
+        with self._lock:
+            entry = self._resident.get(pair)
+            if entry is not None:
+                self._resident.move_to_end(pair)
+                self.hits += 1
+                return entry[0], entry[1]
+            load_lock = self._load_locks.setdefault(pair, threading.Lock())
+
+        # 같은 pair 를 동시에 두 번 로드하지 않도록 pair 별로 직렬화
+        with load_lock:
+            with self._lock:
+                entry = self._resident.get(pair)
+                if entry is not None:
+                    self._resident.move_to_end(pair)
+                    self.hits += 1
+                    return entry[0], entry[1]
+
+                # 로드 중 최대 메모리가 예산을 넘지 않도록 새 모델 자리를 먼저 비움
+                self._loading[pair] = self._estimate(pair)
+                self._evict(keep=pair)
+
+            started = time.time()
+            try:
+                tokenizer, model = self.loader(pair)
+            finally:
+                with self._lock:
+                    self._loading.pop(pair, None)
+            size = _model_bytes(model) or self.model_size_bytes
+            logging.info(
+                f"📦 loaded translation model {pair[0]}-{pair[1]} "
+                f"({size / 1024 ** 2:.0f}MB) in {time.time() - started:.1f}s"
+            )
+
+            with self._lock:
+                self._resident[pair] = (tokenizer, model, size)
+                self._sizes[pair] = size
+                self.loads += 1
+                # 예상보다 컸으면 다시 정리
+                self._evict(keep=pair)
+            return tokenizer, model
+
+    def _estimate(self, pair: Pair) -> int:
+        """
+        로드 전 예상 크기: 같은 언어쌍을 로드했던 크기, 없으면 지금까지 본 가장 큰 모델 크기 (처음이면 설정한 예상 크기)
+        """
+        return self._sizes.get(pair) or max(self._sizes.values(), default=0) or self.model_size_bytes
+
+    def _evict(self, keep: Pair):
+        """
+        resident + 로드 중인 모델이 개수/메모리 예산 이하가 될 때까지 오래 사용하지 않은 (pin 되지 않은) 모델부터 내림
+        """
+        def over_budget() -> bool:
+            count = len(self._resident) + sum(1 for pair in self._loading if pair not in self._resident)
+            if count > self.max_resident:
+                return True
+            total = self.resident_bytes + sum(self._loading.values())
+            return bool(self.memory_budget_bytes) and total > self.memory_budget_bytes
+
+        for pair in list(self._resident.keys()):
+            if not over_budget():
+                break
+            if pair == keep or pair in self.pinned:
+                continue
+            del self._resident[pair]
+            self.evictions += 1
+            logging.info(f"🗑 evicted translation model {pair[0]}-{pair[1]}")
+
+        if over_budget():
+            logging.warning("translation models exceed resident limit; remaining models are pinned")
+
+    def pin(self, pair: Pair):
+        """
+        언어쌍을 내리지 않도록 고정합니다. 지원하지 않는 언어쌍이면 ValueError
+        """
+        pair = _normalize(pair)
+        if pair not in self.supported_pairs:
+            supported = ", ".join(f"{src}-{tgt}" for src, tgt in self.supported_pairs)
+            raise ValueError(f"unsupported translation pair: {'-'.join(pair)} (supported: {supported})")
+        self.pinned.add(pair)
+
+    def unpin(self, pair: Pair):
+        self.pinned.discard(_normalize(pair))
+
+    def preload(self, pairs: Optional[Iterable[Pair]] = None):
+        """
+        지정한 (기본: pin 된) 언어쌍을 미리 로드합니다.
+        """
+        for pair in list(self.pinned if pairs is None else pairs):
+            self.get(pair)
+
+    def is_loaded(self, pair: Pair) -> bool:
+        return _normalize(pair) in self._resident
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(size for _, _, size in self._resident.values())
+
+    def stats(self) -> dict:
+        return {
+            "supported": [f"{src}-{tgt}" for src, tgt in self.supported_pairs],
+            "resident": [f"{src}-{tgt}" for src, tgt in self._resident.keys()],
+            "pinned": sorted(f"{src}-{tgt}" for src, tgt in self.pinned),
+            "resident_mb": round(self.resident_bytes / 1024 ** 2, 1),
+            "max_resident": self.max_resident,
+            "memory_budget_mb": round(self.memory_budget_bytes / 1024 ** 2, 1),
+            "loads": self.loads,
+            "hits": self.hits,
+            "evictions": self.evictions,
+        }
@@ -1,13 +1,20 @@
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, Optional
 
 from dotenv import load_dotenv
-from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
-from sentence_transformers import SentenceTransformer
+from transformers import M2M100Tokenizer
 from bert_score import BERTScorer
 from comet import download_model, load_from_checkpoint
 
+from app.core.backends import (
+    backend_for, backend_report, load_sentence_transformer, apply_bertscore_backend, apply_comet_backend, load_m2m_model
+)
+from app.core.model_registry import ModelRegistry
+
 env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
 
 load_dotenv(dotenv_path=env_path)
@@ -16,14 +23,18 @@ COMET_MODEL_REPO = os.getenv("COMET_MODEL_REPO")
 
 device = "cpu"
 
+E5_MODEL_ID = "intfloat/multilingual-e5-large"
+LABSE_MODEL_ID = "sentence-transformers/LaBSE"
+# backend 마다 임베딩 값이 조금씩 다르므로 임베딩 캐시 키에 backend 를 포함
+# (로드 후 실제로 적용된 backend 로 갱신: onnx 가 eager 로 대체되면 @eager)
+E5_CACHE_ID = f"{E5_MODEL_ID}@{backend_for('e5')}"
+LABSE_CACHE_ID = f"{LABSE_MODEL_ID}@{backend_for('labse')}"
+
 model_e5 = None
 model_labse = None
 bert_scorer = None
 model_comet = None
 
-models = {}
-tokenizers = {}
-
 SUPPORTED_PAIRS = [
     ("en", "ko"),
     ("en", "ja"),
@@ -34,30 +45,142 @@ SUPPORTED_PAIRS = [
     # ("en", "es")
 ]
 
-def init_models():
-    global model_e5, model_labse, bert_scorer, model_comet, models, tokenizers
-    logging.info("🔄 Loading models at startup…")
+# 동시에 메모리에 올려둘 M2M100 언어쌍 모델 수 / 메모리 예산(MB, 0 이면 제한 없음)
+M2M_MAX_RESIDENT = int(os.getenv("M2M_MAX_RESIDENT", str(len(SUPPORTED_PAIRS))))
+M2M_MEMORY_BUDGET_MB = int(os.getenv("M2M_MEMORY_BUDGET_MB", "0"))
+# 크기를 잴 수 없는 언어쌍 모델(가중치 파일을 찾지 못한 onnx 등)과 처음 로드할 모델의 예상 크기(MB, 0 이면 모름)
+M2M_MODEL_SIZE_MB = int(os.getenv("M2M_MODEL_SIZE_MB", "0"))
+# 시작 시 미리 로드하고 내리지 않을 언어쌍 (예: "en-ko,ko-en"). SUPPORTED_PAIRS 에 없으면 시작 시 ValueError
+M2M_PINNED_PAIRS = [
+    tuple(pair.strip().split("-"))
+    for pair in os.getenv("M2M_PINNED_PAIRS", "").split(",")
+    if pair.strip()
+]
+
+
+def _load_m2m_pair(pair):
+    src, tgt = pair
+    checkpoint = f"{COMET_MODEL_REPO}/m2m100_{src}-{tgt}"
+
+    # ① 토크나이저 로드
+    tokenizer = M2M100Tokenizer.from_pretrained(checkpoint)
+    # ② 모델 로드 (설정된 backend 적용)
+    model = load_m2m_model(pair, checkpoint, tokenizer, device)
+    return tokenizer, model
+
+
+m2m_registry = ModelRegistry(
+    loader=_load_m2m_pair,
+    supported_pairs=SUPPORTED_PAIRS,
+    max_resident=M2M_MAX_RESIDENT,
+    memory_budget_bytes=M2M_MEMORY_BUDGET_MB * 1024 * 1024,
+    pinned=M2M_PINNED_PAIRS,
+    model_size_bytes=M2M_MODEL_SIZE_MB * 1024 * 1024,
+)
+
+
+# 시작 시 모델을 동시에 로드할 스레드 수
+MODEL_LOAD_WORKERS = int(os.getenv("MODEL_LOAD_WORKERS", "4"))
+
+# 모델별 로드 상태 (pending | loading | ready | failed) 와 로드 시간(초)
+model_status: Dict[str, str] = {}
+model_load_seconds: Dict[str, float] = {}
+
+# 요청 종류별로 준비되어 있어야 하는 모델
+REQUIRED_MODELS = {
+    "similarity": ["e5", "labse", "bertscore", "comet"],
+    "m2m": ["e5", "labse", "bertscore", "comet", "m2m"],
+}
+
+
+def _cache_id(name: str, model_id: str) -> str:
+    backend = backend_report.get(name, {}).get("backend", backend_for(name))
+    return f"{model_id}@{backend}"
+
 
-    model_e5    = SentenceTransformer('intfloat/multilingual-e5-large', device='cpu')
-    model_labse = SentenceTransformer('sentence-transformers/LaBSE',      device='cpu')
-    bert_scorer = BERTScorer(
+def _load_e5():
+    global model_e5, E5_CACHE_ID
+    model_e5 = load_sentence_transformer("e5", E5_MODEL_ID, device=device)
+    E5_CACHE_ID = _cache_id("e5", E5_MODEL_ID)
+
+
+def _load_labse():
+    global model_labse, LABSE_CACHE_ID
+    model_labse = load_sentence_transformer("labse", LABSE_MODEL_ID, device=device)
+    LABSE_CACHE_ID = _cache_id("labse", LABSE_MODEL_ID)
+
+
+def _load_bertscore():
+    global bert_scorer
+    bert_scorer = apply_bertscore_backend(BERTScorer(
         model_type="xlm-roberta-base",
         lang="ko",
         rescale_with_baseline=False,
         idf=False
-    )
+    ))
+
 
+def _load_comet():
+    global model_comet
     model_comet_path = download_model("wmt20-comet-qe-da")
-    model_comet = load_from_checkpoint(model_comet_path)
+    model_comet = apply_comet_backend(load_from_checkpoint(model_comet_path))
+
+
+def _load_m2m():
+    # M2M100 언어쌍 모델은 pin 된 것만 미리 로드하고, 나머지는 첫 요청 때 로드
+    # (WEB_WORKERS > 1 이면 server.py 가 모든 언어쌍을 pin 해서 fork 전에 로드)
+    m2m_registry.preload()
+
+
+_LOADERS: Dict[str, Callable[[], None]] = {
+    "e5": _load_e5,
+    "labse": _load_labse,
+    "bertscore": _load_bertscore,
+    "comet": _load_comet,
+    "m2m": _load_m2m,
+}
 
-    for src, tgt in SUPPORTED_PAIRS:
-        checkpoint = f"{COMET_MODEL_REPO}/m2m100_{src}-{tgt}"
 
-        # ① 토크나이저 로드
-        tokenizer = M2M100Tokenizer.from_pretrained(checkpoint)
-        # ② 모델 로드
-        model = M2M100ForConditionalGeneration.from_pretrained(checkpoint).to(device)
-        tokenizers[(src, tgt)] = tokenizer
-        models[(src, tgt)] = model
+def _run_loader(name: str) -> bool:
+    model_status[name] = "loading"
+    started = time.time()
+    try:
+        _LOADERS[name]()
+    except Exception as e:
+        model_status[name] = "failed"
+        logging.exception(f"❌ failed to load {name}: {e}")
+        return False
+    model_load_seconds[name] = round(time.time() - started, 2)
+    model_status[name] = "ready"
+    logging.info(f"✅ {name} loaded in {model_load_seconds[name]:.2f}s")
+    return True
+
+
+def is_ready(scope: Optional[str] = None) -> bool:
+    """
+    scope(요청 종류)에 필요한 모델이 모두 로드되었는지 여부. scope 가 없으면 전체 모델 기준
+    """
+    names = REQUIRED_MODELS.get(scope, list(_LOADERS)) if scope else list(_LOADERS)
+    return all(model_status.get(name) == "ready" for name in names)
+
+
+def is_loaded() -> bool:
+    return is_ready()
+
+
+def init_models():
+    """
+    모든 모델을 MODEL_LOAD_WORKERS 개 스레드로 동시에 로드합니다. 하나라도 실패하면 RuntimeError
+    """
+    logging.info("🔄 Loading models at startup…")
+    started = time.time()
+    for name in _LOADERS:
+        model_status.setdefault(name, "pending")
+
+    with ThreadPoolExecutor(max_workers=MODEL_LOAD_WORKERS, thread_name_prefix="model-load") as pool:
+        results = dict(zip(_LOADERS, pool.map(_run_loader, _LOADERS)))
 
-    logging.info("✅ Models loaded successfully")
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        raise RuntimeError(f"Failed to load models: {', '.join(failed)}")
+    logging.info(f"✅ Models loaded successfully in {time.time() - started:.2f}s")
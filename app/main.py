@@ -5,19 +5,47 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.text_similarity import router as text_similarity_router
+from app.api.system import router as system_router
 from app.web_socket.notifier import websocket_endpoint
-from app.core.models import init_models
+from app.core.models import init_models, is_loaded
+from app.core.executor import inference_executor
+from app.client.http_client import close_upstreams
+from app.client.result_outbox import result_outbox
+from app.service.task_scheduler import task_scheduler
+from app.model.similarity.evaluate_similarity_agent import reserve_stage_workers
+
+
+async def _load_models_in_background():
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, init_models)
+    except Exception as e:
+        logging.error(f"❌ model loading failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_models()
+    # inference pool 이 처음 쓰이기 전에 worker 수 확정
+    reserve_stage_workers()
+    # pre-fork 서버(app.server)로 실행하면 부모 프로세스에서 이미 로드됨.
+    # 아니면 백그라운드로 로드하고, 준비 상태는 /ready 로 확인
+    loading = None
+    if not is_loaded():
+        loading = asyncio.create_task(_load_models_in_background())
+    # 이전 실행에서 보내지 못한 결과부터 전송
+    result_outbox.start()
     yield
+    if loading is not None and not loading.done():
+        loading.cancel()
+    await task_scheduler.shutdown()
+    await result_outbox.stop()
+    await close_upstreams()
+    inference_executor.shutdown()
 
 app = FastAPI(
     title="Translation Agent",
@@ -37,4 +65,5 @@ app.add_middleware(
 )
 
 app.include_router(text_similarity_router, prefix="/agent", tags=["text-similarity"])
+app.include_router(system_router, tags=["system"])
 app.websocket("/ws")(websocket_endpoint)
@@ -0,0 +1,189 @@
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import torch
+from dotenv import load_dotenv
+from torch.nn.utils.rnn import pad_sequence
+
+env_path = (Path(__file__).resolve().parents[2] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+# cached: 문장별 token 임베딩 캐시 + batch greedy matching | scorer: BERTScorer.score 그대로 사용
+BERTSCORE_ENGINE = os.getenv("BERTSCORE_ENGINE", "cached")
+BERTSCORE_CACHE_MAX_MB = float(os.getenv("BERTSCORE_CACHE_MAX_MB", "128"))
+# 한 번의 forward 로 인코딩할 문장 수
+BERTSCORE_ENCODE_BATCH_SIZE = int(os.getenv("BERTSCORE_ENCODE_BATCH_SIZE", "64"))
+# 한 번의 bmm 으로 greedy matching 할 쌍 수
+BERTSCORE_MATCH_BATCH_SIZE = int(os.getenv("BERTSCORE_MATCH_BATCH_SIZE", "64"))
+
+TokenStats = Tuple[torch.Tensor, torch.Tensor]
+
+
+class BERTScoreEngine:
+    """
+    로드된 BERTScorer 의 인코더/토크나이저를 그대로 사용하는 BERTScore 계산기.
+    문장마다 contextual token 임베딩(정규화)과 가중치를 한 번만 계산해 LRU 캐시에 보관하고,
+    여러 쌍의 greedy matching P/R/F1 을 padding 된 batch 행렬곱으로 계산합니다.
+    결과는 idf=False 인 BERTScorer.score(cands, refs) 와 같습니다.
+    """
+
+    def __init__(self, max_bytes: int, encode_batch_size: int, match_batch_size: int):
+        self.max_bytes = max_bytes
+        self.encode_batch_size = max(1, encode_batch_size)
+        self.match_batch_size = max(1, match_batch_size)
+        self._cache: "OrderedDict[str, TokenStats]" = OrderedDict()
+        self._cache_bytes = 0
+        self._scorer_id: Optional[int] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def supports(scorer) -> bool:
+        """
+        내부 모델/토크나이저에 접근할 수 있고 idf/all_layers 를 쓰지 않는 BERTScorer 인지 여부
+        """
+        return (
+            hasattr(scorer, "_model")
+            and hasattr(scorer, "_tokenizer")
+            and not getattr(scorer, "idf", False)
+            and not getattr(scorer, "all_layers", False)
+        )
+
+    def _idf_dict(self, scorer) -> dict:
+        # idf=False 일 때 BERTScorer.score 와 같은 가중치 ([CLS]/[SEP] 제외 1)
+        idf_dict = defaultdict(lambda: 1.0)
+        idf_dict[scorer._tokenizer.sep_token_id] = 0
+        idf_dict[scorer._tokenizer.cls_token_id] = 0
+        return idf_dict
+
+    def _encode(self, scorer, sentences: List[str]) -> List[TokenStats]:
+        from bert_score.utils import get_bert_embedding
+
+        idf_dict = self._idf_dict(scorer)
+        device = getattr(scorer, "device", "cpu")
+        stats: List[TokenStats] = []
+        with torch.inference_mode():
+            for start in range(0, len(sentences), self.encode_batch_size):
+                batch = sentences[start:start + self.encode_batch_size]
+                embeddings, masks, weights = get_bert_embedding(
+                    batch, scorer._model, scorer._tokenizer, idf_dict, device=device
+                )
+                embeddings = embeddings.cpu()
+                embeddings = embeddings / embeddings.norm(dim=-1, keepdim=True)
+                for i in range(len(batch)):
+                    length = int(masks[i].sum().item())
+                    stats.append((embeddings[i, :length].clone(), weights[i, :length].cpu().clone()))
+        return stats
+
+    def _put(self, sentence: str, stats: TokenStats):
+        size = stats[0].element_size() * stats[0].nelement() + stats[1].element_size() * stats[1].nelement()
+        if size > self.max_bytes:
+            return
+        self._cache[sentence] = stats
+        self._cache_bytes += size
+        while self._cache_bytes > self.max_bytes and self._cache:
+            _, (emb, weight) = self._cache.popitem(last=False)
+            self._cache_bytes -= emb.element_size() * emb.nelement() + weight.element_size() * weight.nelement()
+
+    def _token_stats(self, scorer, sentences: Sequence[str]) -> dict:
+        """
+        문장별 (token 임베딩, 가중치). 캐시에 없는 문장만 길이순으로 묶어서 인코딩합니다.
+        """
+        with self._lock:
+            if self._scorer_id != id(scorer):
+                # 모델이 바뀌면 캐시 무효화
+                self._cache.clear()
+                self._cache_bytes = 0
+                self._scorer_id = id(scorer)
+            found = {}
+            for sentence in set(sentences):
+                stats = self._cache.get(sentence)
+                if stats is not None:
+                    self._cache.move_to_end(sentence)
+                    found[sentence] = stats
+            self.hits += len(found)
+
+        missing = sorted({s for s in sentences if s not in found}, key=lambda s: len(s.split(" ")), reverse=True)
+        if missing:
+            encoded = self._encode(scorer, missing)
+            with self._lock:
+                self.misses += len(missing)
+                for sentence, stats in zip(missing, encoded):
+                    found[sentence] = stats
+                    self._put(sentence, stats)
+        return found
+
+    @staticmethod
+    def _greedy_match(hyps: List[TokenStats], refs: List[TokenStats]) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        hyp/ref token 임베딩을 padding 해서 batch 코사인 유사도 행렬을 만들고 greedy matching
+        """
+        hyp_emb = pad_sequence([e for e, _ in hyps], batch_first=True)
+        ref_emb = pad_sequence([e for e, _ in refs], batch_first=True)
+        hyp_weight = pad_sequence([w for _, w in hyps], batch_first=True)
+        ref_weight = pad_sequence([w for _, w in refs], batch_first=True)
+        hyp_lens = torch.tensor([e.shape[0] for e, _ in hyps])
+        ref_lens = torch.tensor([e.shape[0] for e, _ in refs])
+        hyp_mask = (torch.arange(hyp_emb.shape[1])[None, :] < hyp_lens[:, None]).float()
+        ref_mask = (torch.arange(ref_emb.shape[1])[None, :] < ref_lens[:, None]).float()
+
+        sim = torch.bmm(hyp_emb, ref_emb.transpose(1, 2))
+        sim = sim * torch.bmm(hyp_mask.unsqueeze(2), ref_mask.unsqueeze(1))
+        word_precision = sim.max(dim=2).values
+        word_recall = sim.max(dim=1).values
+
+        precision = (word_precision * hyp_weight / hyp_weight.sum(dim=1, keepdim=True)).sum(dim=1)
+        recall = (word_recall * ref_weight / ref_weight.sum(dim=1, keepdim=True)).sum(dim=1)
+        f1 = 2 * precision * recall / (precision + recall)
+
+        # [CLS]/[SEP] 만 있는 빈 문장
+        precision = precision.masked_fill(hyp_lens.eq(2), 0.0)
+        recall = recall.masked_fill(ref_lens.eq(2), 0.0)
+        f1 = f1.masked_fill(torch.isnan(f1), 0.0)
+        return precision, recall, f1
+
+    def score(self, scorer, cands: List[str], refs: List[str]) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        BERTScorer.score(cands, refs) 와 같은 (P, R, F1) 텐서를 반환합니다.
+        """
+        if not self.supports(scorer):
+            return scorer.score(cands, refs, batch_size=len(cands))
+
+        stats = self._token_stats(scorer, list(cands) + list(refs))
+        results = []
+        with torch.inference_mode():
+            for start in range(0, len(cands), self.match_batch_size):
+                results.append(self._greedy_match(
+                    [stats[s] for s in cands[start:start + self.match_batch_size]],
+                    [stats[s] for s in refs[start:start + self.match_batch_size]],
+                ))
+        precision, recall, f1 = (torch.cat(values) for values in zip(*results))
+
+        if getattr(scorer, "rescale_with_baseline", False):
+            baseline = scorer.baseline_vals
+            precision, recall, f1 = (
+                (value - baseline[i]) / (1 - baseline[i]) for i, value in enumerate((precision, recall, f1))
+            )
+        return precision, recall, f1
+
+    def stats(self) -> dict:
+        return {
+            "engine": BERTSCORE_ENGINE,
+            "entries": len(self._cache),
+            "bytes": self._cache_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+bertscore_engine = BERTScoreEngine(
+    max_bytes=int(BERTSCORE_CACHE_MAX_MB * 1024 * 1024),
+    encode_batch_size=BERTSCORE_ENCODE_BATCH_SIZE,
+    match_batch_size=BERTSCORE_MATCH_BATCH_SIZE,
+)
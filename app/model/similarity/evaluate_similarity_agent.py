@@ -1,10 +1,44 @@
+import asyncio
 import logging
+import os
 import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 import torch
-from sentence_transformers import util
+import torch.nn.functional as F
+from dotenv import load_dotenv
+from app.core.batcher import MicroBatcher
+from app.core.embedding_cache import embedding_cache
+from app.core.executor import inference_executor
+from app.model.similarity.bertscore_engine import bertscore_engine, BERTSCORE_ENGINE
 from app.web_socket.notifier import notify_progress
 import app.core.models as models
 
+env_path = (Path(__file__).resolve().parents[2] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+SIMILARITY_BATCH_MAX_SIZE = int(os.getenv("SIMILARITY_BATCH_MAX_SIZE", "16"))
+SIMILARITY_BATCH_WINDOW_MS = float(os.getenv("SIMILARITY_BATCH_WINDOW_MS", "5"))
+COMET_BATCH_SIZE = int(os.getenv("COMET_BATCH_SIZE", "8"))
+# 문서 모드에서 한 번에 scorer 로 보내는 segment 수 (메모리 상한)
+DOCUMENT_CHUNK_SIZE = int(os.getenv("DOCUMENT_CHUNK_SIZE", "64"))
+# true 이면 E5/LaBSE/BERTScore/COMET 단계를 동시에 실행
+SIMILARITY_STAGE_PARALLEL = os.getenv("SIMILARITY_STAGE_PARALLEL", "false").lower() == "true"
+# full: 요청한 지표를 모두 계산 | tiered: E5/LaBSE 판정이 확실하면 BERTScore/COMET 생략
+SCORING_MODE = os.getenv("SCORING_MODE", "full")
+# tiered 모드에서 E5/LaBSE 가 임계값에서 이만큼 이상 떨어져 있어야 확실한 판정으로 봄
+SCORING_CONFIDENCE_MARGIN = float(os.getenv("SCORING_CONFIDENCE_MARGIN", "0.05"))
+
+SCORING_MODES = ("full", "tiered")
+METRICS = ("e5", "labse", "bertscore", "comet")
+# tiered 모드에서 먼저 계산하는 가벼운 임베딩 지표
+EMBEDDING_METRICS = ("e5", "labse")
+_METRIC_BATCHERS = {"e5": "E5", "labse": "LaBSE", "bertscore": "BERTScore", "comet": "comet"}
+# score_pairs 결과 배열의 지표별 열 (e5, labse, precision, recall, f1, comet)
+_METRIC_COLUMNS = {"e5": 0, "labse": 1, "bertscore": slice(2, 5), "comet": 5}
+
 
 threshold_e5=0.8
 threshold_labse=0.7
@@ -12,57 +46,284 @@ threshold_bert=0.8
 threshold_comet=0.5
 
 
-def _encode_with_model(model, inputs):
+def _encode_with_model(model, model_id: str, items: List[Tuple[str, str]]) -> torch.Tensor:
     """
-    주어진 모델로 inputs 리스트를 인코딩하고, 결과를 torch.Tensor로 반환합니다.
+    (prefix, text) 리스트를 주어진 모델로 인코딩하고, 결과를 torch.Tensor로 반환합니다.
+    임베딩 캐시에 없는 항목만 (중복 제거 후) 한 번에 인코딩합니다.
     """
-    emb = model.encode(inputs)
-    return emb if isinstance(emb, torch.Tensor) else torch.tensor(emb)
+    vectors = embedding_cache.get_many(model_id, items)
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        missing_items = list(dict.fromkeys(items[i] for i in missing))
+        emb = model.encode([f"{prefix}{text}" for prefix, text in missing_items])
+        emb = emb.cpu().numpy() if isinstance(emb, torch.Tensor) else np.asarray(emb)
+        embedding_cache.put_many(model_id, missing_items, emb)
+        encoded = dict(zip(missing_items, emb))
+        for i in missing:
+            vectors[i] = encoded[items[i]]
+    return torch.from_numpy(np.stack(vectors).astype(np.float32))
 
 
-def _compute_e5(original: str, translated: str):
+def _pairwise_cos_sim(a: torch.Tensor, b: torch.Tensor) -> List[float]:
     """
-    E5 모델로 의미 유사도 점수 계산
+    a[i], b[i] 쌍별 코사인 유사도 리스트
     """
+    return F.cosine_similarity(a, b, dim=-1).tolist()
+
+
+def _compute_e5_batch(pairs: List[Tuple[str, str]]) -> List[float]:
+    """
+    E5 모델로 여러 (원문, 번역문) 쌍의 의미 유사도를 한 번에 계산
+    """
+    n = len(pairs)
     emb_tensor = _encode_with_model(
         models.model_e5,
-        [f"query: {original}", f"passage: {translated}"]
+        models.E5_CACHE_ID,
+        [("query: ", o) for o, _ in pairs] + [("passage: ", t) for _, t in pairs]
     )
-    return util.pytorch_cos_sim(emb_tensor[0], emb_tensor[1]).item()
+    return _pairwise_cos_sim(emb_tensor[:n], emb_tensor[n:])
 
 
-def _compute_labse(original: str, translated: str):
+def _compute_labse_batch(pairs: List[Tuple[str, str]]) -> List[float]:
     """
-    LaBSE 모델로 직역 유사도 점수 계산
+    LaBSE 모델로 여러 (원문, 번역문) 쌍의 직역 유사도를 한 번에 계산
     """
-    emb2_tensor = _encode_with_model(
+    n = len(pairs)
+    emb_tensor = _encode_with_model(
         models.model_labse,
-        [original, translated]
+        models.LABSE_CACHE_ID,
+        [("", o) for o, _ in pairs] + [("", t) for _, t in pairs]
     )
-    return util.pytorch_cos_sim(emb2_tensor[0], emb2_tensor[1]).item()
+    return _pairwise_cos_sim(emb_tensor[:n], emb_tensor[n:])
+
+
+def _compute_bertscore_batch(pairs: List[Tuple[str, str]]) -> List[Tuple[float, float, float]]:
+    """
+    BERTScore 모델로 여러 쌍의 precision, recall, f1 점수를 한 번에 계산
+    (cached 엔진은 문장별 token 임베딩을 재사용)
+    """
+    originals = [o for o, _ in pairs]
+    translated = [t for _, t in pairs]
+    if BERTSCORE_ENGINE == "cached":
+        p, r, f1 = bertscore_engine.score(models.bert_scorer, originals, translated)
+    else:
+        p, r, f1 = models.bert_scorer.score(originals, translated, batch_size=len(pairs))
+    return list(zip(p.tolist(), r.tolist(), f1.tolist()))
+
+
+def _compute_comet_batch(pairs: List[Tuple[str, str]]) -> List[float]:
+    """
+    comet 모델로 여러 쌍의 segment 단위 comet score 를 한 번에 계산
+    """
+    data = [{"src": o, "mt": t} for o, t in pairs]
+    logging.info(f"comet batch size: {len(data)}")
+    model_output = models.model_comet.predict(data, batch_size=COMET_BATCH_SIZE, gpus=0)
+    return [float(s) for s in model_output.scores]
+
+
+def _compute_e5(original: str, translated: str):
+    """
+    E5 모델로 의미 유사도 점수 계산
+    """
+    return _compute_e5_batch([(original, translated)])[0]
+
+
+def _compute_labse(original: str, translated: str):
+    """
+    LaBSE 모델로 직역 유사도 점수 계산
+    """
+    return _compute_labse_batch([(original, translated)])[0]
 
 
 def _compute_bertscore(original: str, translated: str):
     """
     BERTScore 모델로 precision, recall, f1 점수 계산
     """
-    p, r, f1 = models.bert_scorer.score([original], [translated])
-    return p.item(), r.item(), f1.item()
+    return _compute_bertscore_batch([(original, translated)])[0]
 
 
 def _compute_comet(original:str, translated: str):
     """
     comet 모델로 comet score 계산
     """
-    data = [
-        {
-            "src": original,
-            "mt": translated,
-        }
+    return _compute_comet_batch([(original, translated)])[0]
+
+
+# 여러 task 의 (원문, 번역문) 쌍을 모아 모델별로 한 번에 추론하는 micro-batcher
+scorer_batchers = {
+    name: MicroBatcher(
+        name,
+        batch_fn,
+        max_batch_size=SIMILARITY_BATCH_MAX_SIZE,
+        max_wait_ms=SIMILARITY_BATCH_WINDOW_MS,
+        executor=inference_executor,
+    )
+    for name, batch_fn in [
+        ("E5", _compute_e5_batch),
+        ("LaBSE", _compute_labse_batch),
+        ("BERTScore", _compute_bertscore_batch),
+        ("comet", _compute_comet_batch),
     ]
-    logging.info("data: {}".format(data))
-    model_output = models.model_comet.predict(data, batch_size=8, gpus=0)
-    return model_output.system_score
+}
+
+
+def reserve_stage_workers():
+    """
+    SIMILARITY_STAGE_PARALLEL 이면 서버 시작 시 단계(모델)마다 inference worker 하나씩을 확보합니다.
+    같은 모델의 배치는 batcher 가 한 번에 하나만 실행하므로 동시에 도는 것은 서로 다른 모델뿐입니다.
+    """
+    if SIMILARITY_STAGE_PARALLEL:
+        # CPU 스레드는 worker 수만큼 나눠서 사용
+        inference_executor.reserve_workers(len(scorer_batchers))
+
+
+def get_batch_stats() -> dict:
+    """
+    scorer 별 micro-batch 크기/대기 시간 통계
+    """
+    return {name: batcher.stats() for name, batcher in scorer_batchers.items()}
+
+
+def _build_descriptions(
+    sim_e5: Optional[float],
+    sim_labse: Optional[float],
+    f1: Optional[float],
+    comet_score: Optional[float],
+    threshold_e5_good: float,
+    threshold_labse_good: float,
+    skipped: Sequence[str] = ()
+) -> str:
+    """
+    점수별 임계값 비교 결과를 사람이 읽을 수 있는 설명 문자열로 만듭니다.
+    계산하지 않은 지표(None)는 건너뜁니다.
+    """
+    descriptions = []
+
+    if sim_e5 is not None and sim_labse is not None:
+        if sim_e5 > threshold_e5_good and sim_labse > threshold_labse_good:
+            descriptions.append(
+                f"✅ 직역 가능성 높음 (E5: {sim_e5:.2f} ≥ {threshold_e5}, "
+                f"LaBSE: {sim_labse:.2f} ≥ {threshold_labse})"
+            )
+        elif sim_e5 > threshold_e5_good:
+            descriptions.append(
+                f"✏️ 의역 가능성 있음 (E5: {sim_e5:.2f} ≥ {threshold_e5}, "
+                f"LaBSE: {sim_labse:.2f} < {threshold_labse})"
+            )
+        elif sim_labse > threshold_labse_good:
+            descriptions.append(
+                f"📖 직역 유사성만 높음 (E5: {sim_e5:.2f} < {threshold_e5}, "
+                f"LaBSE: {sim_labse:.2f} ≥ {threshold_labse})"
+            )
+        else:
+            descriptions.append(
+                f"⚠️ 의미 차이 큼 (E5: {sim_e5:.2f}, LaBSE: {sim_labse:.2f}); "
+                "COMET score 확인 요망"
+            )
+    elif sim_e5 is not None:
+        sign = "≥" if sim_e5 > threshold_e5_good else "<"
+        descriptions.append(f"🔎 의미 유사도 (E5: {sim_e5:.2f} {sign} {threshold_e5})")
+    elif sim_labse is not None:
+        sign = "≥" if sim_labse > threshold_labse_good else "<"
+        descriptions.append(f"🔎 직역 유사도 (LaBSE: {sim_labse:.2f} {sign} {threshold_labse})")
+
+    # BERTScore 평가
+    if f1 is not None:
+        if f1 >= threshold_bert:
+            descriptions.append(
+                f"👍 단어 단위 의미 유사도 우수 (BERTScore F1: {f1:.2f} ≥ {threshold_bert})"
+            )
+        else:
+            descriptions.append(
+                f"👎 단어 단위 의미 유사도 부족 (BERTScore F1: {f1:.2f} < {threshold_bert})"
+            )
+
+    # COMET 평가 추가
+    if comet_score is not None:
+        if comet_score >= threshold_comet:
+            descriptions.append(
+                f"🎯 번역 품질 우수 (COMET: {comet_score:.2f} ≥ {threshold_comet})"
+            )
+        else:
+            descriptions.append(
+                f"❗️ 번역 품질 미흡 (COMET: {comet_score:.2f} < {threshold_comet})"
+            )
+
+    if skipped:
+        descriptions.append(
+            f"⏩ E5/LaBSE 결과가 임계값에서 충분히 벗어나 {', '.join(skipped)} 계산 생략"
+        )
+
+    return "\n".join(descriptions) + "\n"
+
+
+def resolve_metrics(metrics: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    요청한 지표 목록을 METRICS 순서로 정리합니다. 비어 있으면 전체, 모르는 이름이면 ValueError
+    """
+    requested = {m.strip().lower() for m in metrics or () if m.strip()}
+    if not requested:
+        return list(METRICS)
+    unknown = requested - set(METRICS)
+    if unknown:
+        raise ValueError(f"unknown metrics: {', '.join(sorted(unknown))} (supported: {', '.join(METRICS)})")
+    return [m for m in METRICS if m in requested]
+
+
+def resolve_scoring_mode(mode: Optional[str] = None) -> str:
+    mode = (mode or SCORING_MODE).lower()
+    if mode not in SCORING_MODES:
+        raise ValueError(f"unknown scoring mode: {mode} (supported: {', '.join(SCORING_MODES)})")
+    return mode
+
+
+def _is_confident(sim_e5: float, sim_labse: float, threshold_e5_good: float, threshold_labse_good: float) -> bool:
+    """
+    E5/LaBSE 가 둘 다 임계값보다 margin 이상 높거나 둘 다 margin 이상 낮으면 판정이 확실하다고 봅니다.
+    """
+    margin = SCORING_CONFIDENCE_MARGIN
+    above = sim_e5 >= threshold_e5_good + margin and sim_labse >= threshold_labse_good + margin
+    below = sim_e5 <= threshold_e5_good - margin and sim_labse <= threshold_labse_good - margin
+    return above or below
+
+
+async def _run_stage(name: str, batcher: MicroBatcher, original: str, translated: str):
+    return name, await batcher.submit((original, translated))
+
+
+async def _score_stages(
+    task_name: str,
+    metrics: List[str],
+    original: str,
+    translated: str,
+    completed: int,
+    total_steps: int
+) -> dict:
+    """
+    지표별 단계를 순차적으로(SIMILARITY_STAGE_PARALLEL 이면 동시에) 실행하고 단계마다 진행률을 전송합니다.
+    """
+    if SIMILARITY_STAGE_PARALLEL:
+        # 끝나는 순서대로 결과 수신
+        stages = asyncio.as_completed([
+            _run_stage(name, scorer_batchers[_METRIC_BATCHERS[name]], original, translated) for name in metrics
+        ])
+    else:
+        stages = (
+            _run_stage(name, scorer_batchers[_METRIC_BATCHERS[name]], original, translated) for name in metrics
+        )
+
+    results = {}
+    for stage in stages:
+        # 다른 task 의 요청과 함께 배치 처리
+        name, result = await stage
+        results[name] = result
+
+        # 진행률 계산 및 알림
+        completed += 1
+        progress = int(completed / total_steps * 100)
+        await notify_progress(task_name, progress)
+        logging.info(f"Step '{name}' completed, progress={progress}%")
+    return results
 
 
 async def evaluate_dual_similarity(
@@ -70,110 +331,241 @@ async def evaluate_dual_similarity(
     original: str,
     translated: str,
     threshold_e5_good: float = 0.8,
-    threshold_labse_good: float = 0.7
+    threshold_labse_good: float = 0.7,
+    metrics: Optional[Iterable[str]] = None,
+    scoring_mode: Optional[str] = None
 ) -> dict:
     """
-    세 단계(E5, LaBSE, BERTScore)를 순차적으로 실행하며,
-    진행률을 WebSocket으로 전송하고 최종 유사도 결과를 반환합니다.
+    요청한 지표(기본: E5, LaBSE, BERTScore, COMET)를 순차적으로(SIMILARITY_STAGE_PARALLEL 이면 동시에) 실행하며,
+    단계가 끝날 때마다 진행률을 WebSocket으로 전송하고 최종 유사도 결과를 반환합니다.
+    tiered 모드에서는 E5/LaBSE 를 먼저 계산하고, 판정이 확실하면 BERTScore/COMET 을 생략합니다.
+    계산하지 않은 지표는 None 입니다.
     """
     start = time.time()
     await notify_progress(task_name, 0)
     logging.info(f"📝 Original: {original}")
     logging.info(f"🈶 Translated: {translated}")
 
-    # 단계별 계산 및 진행률 전송
-    step_funcs = [
-        ("E5", _compute_e5),
-        ("LaBSE", _compute_labse),
-        ("BERTScore", _compute_bertscore),
-        ("comet", _compute_comet)
-    ]
-    total_steps = len(step_funcs)
-    sim_e5 = sim_labse = None
-    p = r = f1 = None
-    comet_score = None
-
-    for idx, (name, func) in enumerate(step_funcs, start=1):
-        # 함수 호출
-        result = func(original, translated)
-        # 결과 저장
-        if name == "E5":
-            sim_e5 = result
-        elif name == "LaBSE":
-            sim_labse = result
-        elif name == "BERTScore":
-            p, r, f1 = result
-        else:
-            comet_score = result
+    metrics = resolve_metrics(metrics)
+    tiered = resolve_scoring_mode(scoring_mode) == "tiered" and "e5" in metrics and "labse" in metrics
+    first = [m for m in metrics if m in EMBEDDING_METRICS] if tiered else metrics
+    rest = [m for m in metrics if m not in first]
 
-        # 진행률 계산 및 알림
-        progress = int(idx / total_steps * 100)
-        await notify_progress(task_name, progress)
-        logging.info(f"Step '{name}' completed, progress={progress}%")
+    # 단계별 계산 및 진행률 전송
+    scores = await _score_stages(task_name, first, original, translated, 0, len(metrics))
+    skipped: List[str] = []
+    if rest and _is_confident(scores["e5"], scores["labse"], threshold_e5_good, threshold_labse_good):
+        skipped = rest
+        logging.info(f"⏩ confident verdict for task {task_name}; skipping {', '.join(skipped)}")
+        await notify_progress(task_name, 100)
+    elif rest:
+        scores.update(await _score_stages(task_name, rest, original, translated, len(first), len(metrics)))
 
     # 종합 판단
-    if sim_e5 is None or sim_labse is None or p is None:
+    if any(m not in scores for m in metrics if m not in skipped):
         err = "Similarity computation failed"
         logging.error(f"❌ {err} for task {task_name}")
         await notify_progress(task_name, -1, error=err)
         return {}
 
-    descriptions = []
+    sim_e5 = scores.get("e5")
+    sim_labse = scores.get("labse")
+    p, r, f1 = scores.get("bertscore") or (None, None, None)
+    comet_score = scores.get("comet")
 
-    if sim_e5 > threshold_e5_good and sim_labse > threshold_labse_good:
-        descriptions.append(
-            f"✅ 직역 가능성 높음 (E5: {sim_e5:.2f} ≥ {threshold_e5}, "
-            f"LaBSE: {sim_labse:.2f} ≥ {threshold_labse})"
-        )
-    elif sim_e5 > threshold_e5_good:
-        f"✏️ 의역 가능성 있음 (E5: {sim_e5:.2f} ≥ {threshold_e5}, "
-        f"LaBSE: {sim_labse:.2f} < {threshold_labse})"
-
-    elif sim_labse > threshold_labse_good:
-        descriptions.append(
-            f"📖 직역 유사성만 높음 (E5: {sim_e5:.2f} < {threshold_e5}, "
-            f"LaBSE: {sim_labse:.2f} ≥ {threshold_labse})"
-        )
-    else:
-        descriptions.append(
-            f"⚠️ 의미 차이 큼 (E5: {sim_e5:.2f}, LaBSE: {sim_labse:.2f}); "
-            "COMET score 확인 요망"
-        )
-
-    # BERTScore 평가
-    if f1 >= threshold_bert:
-        descriptions.append(
-            f"👍 단어 단위 의미 유사도 우수 (BERTScore F1: {f1:.2f} ≥ {threshold_bert})"
-        )
-    else:
-        descriptions.append(
-            f"👎 단어 단위 의미 유사도 부족 (BERTScore F1: {f1:.2f} < {threshold_bert})"
-        )
-
-    # COMET 평가 추가
-    if comet_score >= threshold_comet:
-        descriptions.append(
-            f"🎯 번역 품질 우수 (COMET: {comet_score:.2f} ≥ {threshold_comet})"
-        )
-    else:
-        descriptions.append(
-            f"❗️ 번역 품질 미흡 (COMET: {comet_score:.2f} < {threshold_comet})"
-        )
+    description = _build_descriptions(
+        sim_e5, sim_labse, f1, comet_score, threshold_e5_good, threshold_labse_good, skipped
+    )
 
     execution_time = time.time() - start
-    logging.info(f"E5 의미 유사도: {sim_e5:.4f}")
-    logging.info(f"LaBSE 직역 유사도: {sim_labse:.4f}")
-    logging.info(f"BERTScore - P: {p:.4f}, R: {r:.4f}, F1: {f1:.4f}")
-    logging.info(f"comet score: {comet_score:.4f}")
+    if sim_e5 is not None:
+        logging.info(f"E5 의미 유사도: {sim_e5:.4f}")
+    if sim_labse is not None:
+        logging.info(f"LaBSE 직역 유사도: {sim_labse:.4f}")
+    if f1 is not None:
+        logging.info(f"BERTScore - P: {p:.4f}, R: {r:.4f}, F1: {f1:.4f}")
+    if comet_score is not None:
+        logging.info(f"comet score: {comet_score:.4f}")
     logging.info(f"⏱ 실행 시간: {execution_time:.2f}s | ✅ completed similarity for task {task_name}")
 
     return {
         "original_text": original,
         "translated_text": translated,
-        "e5_semantic_similarity": round(sim_e5, 4),
-        "labse_literal_similarity": round(sim_labse, 4),
-        "bertscore": {"precision": round(p, 4), "recall": round(r, 4), "f1": round(f1, 4)},
+        "e5_semantic_similarity": _round(sim_e5),
+        "labse_literal_similarity": _round(sim_labse),
+        "bertscore": (
+            {"precision": round(p, 4), "recall": round(r, 4), "f1": round(f1, 4)} if f1 is not None else None
+        ),
         "comet_score": comet_score,
-        "description": "\n".join(descriptions) + "\n",
-        "execution_time": round(execution_time, 2)
+        "description": description,
+        "execution_time": round(execution_time, 2),
+        "metrics": [m for m in metrics if m not in skipped],
+        "skipped_metrics": skipped
     }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
+
+
+def summarize_scores(
+    scores: np.ndarray,
+    weights: Sequence[float],
+    threshold_e5_good: float = threshold_e5,
+    threshold_labse_good: float = threshold_labse
+) -> dict:
+    """
+    score_pairs 점수 배열을 가중 평균해 evaluate_* 결과와 같은 형태의 지표/설명 dict 로 집계합니다.
+    계산하지 않은 지표(NaN 열)는 None
+    """
+    sim_e5, sim_labse, p, r, f1, comet_score = (
+        None if np.isnan(v) else float(v) for v in np.average(scores, axis=0, weights=weights)
+    )
+    return {
+        "e5_semantic_similarity": _round(sim_e5),
+        "labse_literal_similarity": _round(sim_labse),
+        "bertscore": (
+            {"precision": round(p, 4), "recall": round(r, 4), "f1": round(f1, 4)} if f1 is not None else None
+        ),
+        "comet_score": comet_score,
+        "description": _build_descriptions(
+            sim_e5, sim_labse, f1, comet_score, threshold_e5_good, threshold_labse_good
+        ),
+    }
+
+
+async def score_pairs(pairs: List[Tuple[str, str]], metrics: Optional[Iterable[str]] = None) -> np.ndarray:
+    """
+    (원문, 번역문) 쌍 리스트를 요청한 scorer 에 동시에 제출하고 (n, 6) 점수 배열을 반환합니다.
+    열 순서: e5, labse, precision, recall, f1, comet (계산하지 않은 지표는 NaN)
+    한쪽이 빈 쌍(문장 정렬에서 대응 문장이 없는 문장)은 채점하지 않고 0점입니다.
+    """
+    metrics = resolve_metrics(metrics)
+    scorable = [i for i, (original, translated) in enumerate(pairs) if original and translated]
+    # 요청한 scorer 에 전체 쌍을 동시에 제출 → batcher 가 묶어서 추론
+    stage_results = await asyncio.gather(*[
+        asyncio.gather(*[scorer_batchers[_METRIC_BATCHERS[m]].submit(pairs[i]) for i in scorable])
+        for m in metrics
+    ])
+    results = dict(zip(metrics, stage_results))
+
+    scores = np.full((len(pairs), 6), np.nan, dtype=np.float64)
+    if pairs:
+        for metric, columns in _METRIC_COLUMNS.items():
+            if metric in results:
+                scores[:, columns] = 0.0
+                if scorable:
+                    scores[scorable, columns] = results[metric]
+    return scores
+
+
+class DocumentScorer:
+    """
+    문서 모드 채점 누적기. 받은 segment 쌍을 DOCUMENT_CHUNK_SIZE 씩 batch 로 채점하고,
+    segment 마다 점수와 진행률을 WebSocket으로 전송합니다.
+    문서 점수는 segment 길이(원문이 빈 segment 는 번역문 길이) 가중 평균입니다.
+    요청한 지표만 계산합니다(tiered 생략은 적용하지 않음).
+    """
+
+    def __init__(
+        self,
+        task_name: str,
+        metrics: Optional[Iterable[str]] = None,
+        threshold_e5_good: float = threshold_e5,
+        threshold_labse_good: float = threshold_labse
+    ):
+        self.task_name = task_name
+        self.metrics = resolve_metrics(metrics)
+        self.threshold_e5_good = threshold_e5_good
+        self.threshold_labse_good = threshold_labse_good
+        self.count = 0
+        self._start = time.time()
+        # 열 순서: e5, labse, precision, recall, f1, comet
+        self._scores: List[np.ndarray] = []
+        self._weights: List[int] = []
+        self._originals: List[str] = []
+        self._translations: List[str] = []
+
+    @property
+    def translated_text(self) -> str:
+        return "\n".join(self._translations)
+
+    async def add(self, originals: List[str], translations: List[str], progress: Callable[[int], int]):
+        """
+        segment 쌍을 채점합니다. progress(index) 는 index 번째 segment 까지 끝났을 때의 진행률(0~99)
+        """
+        if len(originals) != len(translations):
+            raise ValueError(
+                f"segment count mismatch: {len(originals)} originals, {len(translations)} translations"
+            )
+
+        for chunk_start in range(0, len(originals), DOCUMENT_CHUNK_SIZE):
+            pairs = list(zip(
+                originals[chunk_start:chunk_start + DOCUMENT_CHUNK_SIZE],
+                translations[chunk_start:chunk_start + DOCUMENT_CHUNK_SIZE]
+            ))
+            chunk = await score_pairs(pairs, self.metrics)
+            self._scores.append(chunk)
+
+            for row, (original, translated) in zip(chunk, pairs):
+                self._weights.append(max(len(original or translated), 1))
+                if original:
+                    self._originals.append(original)
+                if translated:
+                    self._translations.append(translated)
+                segment = {"index": self.count}
+                for key, column in (("e5", 0), ("labse", 1), ("bertscore_f1", 4), ("comet", 5)):
+                    if not np.isnan(row[column]):
+                        segment[key] = round(float(row[column]), 4)
+                # 100 은 문서 집계가 끝난 뒤 전송
+                await notify_progress(self.task_name, min(99, progress(self.count)), segment=segment)
+                self.count += 1
+
+    async def finish(self) -> dict:
+        """
+        가중 평균으로 문서 점수를 집계하고 evaluate_dual_similarity 와 같은 형태의 결과 dict 를 반환합니다.
+        """
+        scores = np.concatenate(self._scores) if self._scores else np.zeros((0, 6), dtype=np.float64)
+        summary = summarize_scores(scores, self._weights, self.threshold_e5_good, self.threshold_labse_good)
+
+        execution_time = time.time() - self._start
+        await notify_progress(self.task_name, 100)
+        logging.info(
+            f"⏱ 실행 시간: {execution_time:.2f}s | ✅ completed document similarity "
+            f"for task {self.task_name} ({self.count} segments)"
+        )
+
+        return {
+            "original_text": "\n".join(self._originals),
+            "translated_text": self.translated_text,
+            **summary,
+            "execution_time": round(execution_time, 2),
+            "segment_count": self.count,
+            "metrics": self.metrics,
+            "skipped_metrics": []
+        }
+
+
+async def evaluate_document_similarity(
+    task_name: str,
+    originals: List[str],
+    translations: List[str],
+    threshold_e5_good: float = 0.8,
+    threshold_labse_good: float = 0.7,
+    metrics: Optional[Iterable[str]] = None
+) -> dict:
+    """
+    문장 단위 segment 쌍 리스트를 DocumentScorer 로 채점합니다.
+    """
+    if len(originals) != len(translations):
+        raise ValueError(
+            f"segment count mismatch: {len(originals)} originals, {len(translations)} translations"
+        )
+
+    scorer = DocumentScorer(task_name, metrics, threshold_e5_good, threshold_labse_good)
+    total = len(originals)
+    await notify_progress(task_name, 0)
+    logging.info(f"📄 document task {task_name}: {total} segments")
+
+    await scorer.add(originals, translations, progress=lambda index: int((index + 1) / total * 100))
+    return await scorer.finish()
@@ -0,0 +1,186 @@
+import logging
+import math
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+env_path = (Path(__file__).resolve().parents[2] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+# 문서 모드에서 원문/비교 텍스트 문장 수가 다를 때 문장 정렬 사용 여부 (false 면 전체 텍스트를 한 쌍으로 채점)
+SENTENCE_ALIGNMENT = os.getenv("SENTENCE_ALIGNMENT", "true").lower() == "true"
+# 직전 행의 최고점 열 기준으로 탐색할 target 문장 범위 (±)
+ALIGN_BAND = int(os.getenv("ALIGN_BAND", "8"))
+# 1-2 / 2-1 병합 bead 의 감점 (평균 교차 유사도를 뺀 점수 기준)
+ALIGN_MERGE_PENALTY = float(os.getenv("ALIGN_MERGE_PENALTY", "0.1"))
+# 대응 문장이 없는 문장(1-0 / 0-1) 하나당 점수 (평균 교차 유사도를 뺀 점수 기준)
+ALIGN_SKIP_SCORE = float(os.getenv("ALIGN_SKIP_SCORE", "0.0"))
+
+# band 중심을 찾을 때 열 하나당 감점 (1 - 평균 교차 유사도 대비 비율).
+# 0-1 로 점수를 그대로 이어받은 오른쪽 칸보다 실제 경로 칸을 고르도록 함
+_TRACK_PENALTY = 0.1
+
+# bead 종류
+_M11, _M12, _M21, _M10, _M01 = 1, 2, 3, 4, 5
+
+Bead = Tuple[List[int], List[int]]
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-12)
+
+
+def _lookup(row: Tuple[int, np.ndarray], js: np.ndarray) -> np.ndarray:
+    """
+    DP 한 행(시작 열, 점수)에서 열 js 의 점수. band 밖이면 -inf
+    """
+    lo, scores = row
+    pos = js - lo
+    valid = (pos >= 0) & (pos < len(scores))
+    out = np.full(len(js), -np.inf)
+    out[valid] = scores[pos[valid]]
+    return out
+
+
+def _sims(matrix: np.ndarray, rows: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """
+    matrix[rows] 와 vector 의 코사인 유사도 (범위 밖 인덱스는 -inf)
+    """
+    out = np.full(len(rows), -np.inf)
+    valid = (rows >= 0) & (rows < len(matrix))
+    if valid.any():
+        out[valid] = matrix[rows[valid]] @ vector
+    return out
+
+
+def align_embeddings(src: np.ndarray, tgt: np.ndarray, band: int = ALIGN_BAND) -> List[Bead]:
+    """
+    정규화된 원문/번역문 문장 임베딩을 단조(monotonic) 정렬합니다.
+    bead 는 1-1, 1-2, 2-1 (대응 문장이 없으면 1-0, 0-1) 이고, 유사도 합이 최대가 되는 경로를
+    직전 행의 최고점 열 주변 band 안에서만 DP 로 찾으므로 O((n + m) * band) 입니다.
+    유사도는 문서 전체의 평균 교차 유사도를 뺀 값이라 무관한 문장은 0 근처가 되고,
+    병합 bead 는 병합된 문장 각각을 반대쪽 문장과 비교한 합에서 ALIGN_MERGE_PENALTY 를 뺍니다.
+    그래서 무관한 문장을 병합해 덮는 것보다 1-0 / 0-1 로 남기는 쪽이 유리합니다.
+    """
+    n, m = len(src), len(tgt)
+    if n == 0 or m == 0:
+        return [([i], []) for i in range(n)] + [([], [j]) for j in range(m)]
+
+    # 기울기가 가파르면 인접 행의 band 가 이어지도록 넓힘
+    band = max(band, math.ceil(m / n) + 2, math.ceil(n / m) + 2)
+    # 모든 (원문, 번역문) 쌍의 평균 유사도
+    baseline = float(src.mean(axis=0) @ tgt.mean(axis=0))
+    track_penalty = _TRACK_PENALTY * max(1.0 - baseline, 1e-3)
+
+    rows: List[Tuple[int, np.ndarray]] = []
+    moves: List[np.ndarray] = []
+    for i in range(n + 1):
+        if i == 0:
+            center = 0
+        else:
+            # 이전 행에서 누적 점수가 가장 높은 열을 따라 band 를 옮김 (긴 문서에서 경로가 대각선을 벗어나도 추적)
+            prev_lo, prev_best = rows[i - 1]
+            tracked = int(np.argmax(prev_best - track_penalty * np.arange(len(prev_best))))
+            center = round(prev_lo + tracked + m / n)
+        lo, hi = max(0, center - band), min(m, center + band)
+        if i == n:
+            # 마지막 행은 (n, m) 까지 닿아야 함
+            lo, hi = min(lo, m), m
+        js = np.arange(lo, hi + 1)
+        best = np.full(len(js), -np.inf)
+        move = np.zeros(len(js), dtype=np.int8)
+
+        def consider(candidate: np.ndarray, kind: int):
+            better = candidate > best
+            best[better] = candidate[better]
+            move[better] = kind
+
+        if i == 0:
+            best[js == 0] = 0.0
+        if i >= 1:
+            prev = rows[i - 1]
+            consider(_lookup(prev, js - 1) + _sims(tgt, js - 1, src[i - 1]) - baseline, _M11)
+            consider(
+                _lookup(prev, js - 2) + _sims(tgt, js - 2, src[i - 1]) + _sims(tgt, js - 1, src[i - 1])
+                - 2 * baseline - ALIGN_MERGE_PENALTY,
+                _M12
+            )
+            consider(_lookup(prev, js) + ALIGN_SKIP_SCORE, _M10)
+        if i >= 2:
+            consider(
+                _lookup(rows[i - 2], js - 1) + _sims(tgt, js - 1, src[i - 2]) + _sims(tgt, js - 1, src[i - 1])
+                - 2 * baseline - ALIGN_MERGE_PENALTY,
+                _M21
+            )
+
+        # 0-1 (같은 행 왼쪽 칸에서 오는 경로): best[j] = max(best[j], best[j-1] + skip) 를 누적 최대값으로 계산
+        steps = np.arange(len(js)) * ALIGN_SKIP_SCORE
+        carried = np.maximum.accumulate(best - steps) + steps
+        skipped = carried > best
+        best[skipped] = carried[skipped]
+        move[skipped] = _M01
+
+        rows.append((lo, best))
+        moves.append(move)
+
+    beads: List[Bead] = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        kind = moves[i][j - rows[i][0]]
+        if kind == _M11:
+            beads.append(([i - 1], [j - 1]))
+            i, j = i - 1, j - 1
+        elif kind == _M12:
+            beads.append(([i - 1], [j - 2, j - 1]))
+            i, j = i - 1, j - 2
+        elif kind == _M21:
+            beads.append(([i - 2, i - 1], [j - 1]))
+            i, j = i - 2, j - 1
+        elif kind == _M10:
+            beads.append(([i - 1], []))
+            i -= 1
+        elif kind == _M01:
+            beads.append(([], [j - 1]))
+            j -= 1
+        else:
+            raise RuntimeError(f"alignment backtrack failed at ({i}, {j})")
+    beads.reverse()
+    return beads
+
+
+def align_segments(sources: List[str], targets: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    LaBSE 임베딩으로 원문/번역문 문장을 정렬하고 대응된 (원문, 번역문) segment 리스트를 반환합니다.
+    병합된 문장은 공백으로 이어 붙입니다. 대응 문장이 없는 문장은 반대쪽을 빈 문자열로 남겨
+    0점 쌍으로 채점되므로, 누락/추가된 문장만큼 문서 점수가 낮아집니다.
+    임베딩은 LaBSE scorer 와 같은 캐시를 사용하므로 병합되지 않은 문장은 채점 시 다시 인코딩하지 않습니다.
+    """
+    # 정렬 DP(align_embeddings)는 numpy 만 사용하므로 모델 모듈은 여기서만 import
+    import app.core.models as models
+    from app.model.similarity.evaluate_similarity_agent import _encode_with_model
+
+    emb = _encode_with_model(
+        models.model_labse,
+        models.LABSE_CACHE_ID,
+        [("", s) for s in sources] + [("", t) for t in targets]
+    ).numpy()
+    emb = _normalize(emb.astype(np.float64))
+    beads = align_embeddings(emb[:len(sources)], emb[len(sources):])
+
+    aligned_sources: List[str] = []
+    aligned_targets: List[str] = []
+    unmatched = 0
+    for src_ids, tgt_ids in beads:
+        if not src_ids or not tgt_ids:
+            unmatched += len(src_ids) + len(tgt_ids)
+        aligned_sources.append(" ".join(sources[i] for i in src_ids))
+        aligned_targets.append(" ".join(targets[j] for j in tgt_ids))
+
+    logging.info(
+        f"🧭 aligned {len(sources)} source / {len(targets)} target sentences "
+        f"into {len(aligned_sources) - unmatched} pairs ({unmatched} unmatched)"
+    )
+    return aligned_sources, aligned_targets
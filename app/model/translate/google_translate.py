@@ -1,34 +1,66 @@
 from pathlib import Path
+from typing import List
 
 from app.schema.text_similarity_dto import TextSimilarityRequest
 from dotenv import load_dotenv
 import os
-import requests
+import httpx
 
+from app.client.http_client import upstreams
 from app.util.exception import TranslationError
 
 env_path = (Path(__file__).resolve().parents[2] / "config" / ".env")
 load_dotenv(dotenv_path=env_path)
 API_KEY = os.getenv("GOOGLE_TRANSLATOR_API_KEY")
+GOOGLE_TRANSLATE_URL = os.getenv(
+    "GOOGLE_TRANSLATE_URL", "https://translation.googleapis.com/language/translate/v2"
+)
+# Google Translation API v2 한 요청당 최대 segment 수
+GOOGLE_MAX_SEGMENTS = 128
+# 단건 번역은 format 미지정(html), batch 번역은 format=text 로 요청하므로 캐시 키를 구분
+GOOGLE_CACHE_VERSION = {"single": "v2:html", "batch": "v2:text"}
 
 
-def translate_google(request: TextSimilarityRequest) -> str:
+async def _post(data: dict) -> List[str]:
+    try:
+        response = await upstreams["google"].request("POST", GOOGLE_TRANSLATE_URL, data=data)
+    except httpx.HTTPError as e:
+        raise TranslationError(f"Google Translator API request failed: {e!r}")
+
+    if not response.is_success:
+        raise TranslationError(
+            f"Google Translator API error ({response.status_code}): {response.text}"
+        )
+
+    translations = response.json()["data"]["translations"]
+    return [t["translatedText"] for t in translations]
+
+
+async def translate_google(request: TextSimilarityRequest) -> str:
     """Google Translation API를 호출해 번역된 텍스트를 반환합니다.
     실패 시 TranslationError를 발생시킵니다.
     """
-    url = "https://translation.googleapis.com/language/translate/v2"
-    params = {
+    data = {
         "q": request.input_text,
-        "target": request.output_language,
+        "target": request.output_language.value,
         "key": API_KEY
     }
-    response = requests.post(url, params=params)
+    return (await _post(data))[0]
 
-    if not response.ok:
-        raise TranslationError(
-            f"Google Translator API error ({response.status_code}): {response.text}"
-        )
 
-    data = response.json()
-    translated_text = data["data"]["translations"][0]["translatedText"]
-    return translated_text
\ No newline at end of file
+async def translate_google_batch(texts: List[str], target: str) -> List[str]:
+    """여러 segment 를 요청당 최대 GOOGLE_MAX_SEGMENTS 개씩 묶어 번역하고 입력 순서대로 반환합니다.
+    실패 시 TranslationError를 발생시킵니다.
+    """
+    target = getattr(target, "value", target)
+    results: List[str] = []
+    for i in range(0, len(texts), GOOGLE_MAX_SEGMENTS):
+        data = {
+            "q": texts[i:i + GOOGLE_MAX_SEGMENTS],
+            "target": target,
+            "format": "text",
+            "key": API_KEY
+        }
+        # segment 가 많으면 query string 이 길어지므로 form body 로 전송
+        results.extend(await _post(data))
+    return results
@@ -1,20 +1,26 @@
+import hashlib
 import logging
 from pathlib import Path
 
 from app.schema.text_similarity_dto import TextSimilarityRequest
 from dotenv import load_dotenv
 import os
-from openai import OpenAI
+from typing import Optional
+
+from openai import AsyncOpenAI, OpenAIError
+
+from app.client.http_client import upstreams
+from app.util.exception import TranslationError
 
 env_path = (Path(__file__).resolve().parents[2] / "config" / ".env")
 load_dotenv(dotenv_path=env_path)
 API_KEY = os.getenv("GPT_API_KEY")
+# 로컬 stub 서버 등 다른 OpenAI 호환 엔드포인트를 쓸 때 지정
+GPT_BASE_URL = os.getenv("GPT_BASE_URL") or None
 
-client = OpenAI(api_key=API_KEY)
-
+GPT_MODEL = "gpt-4.1-nano"
 
-def translate_gpt(request: TextSimilarityRequest) -> str:
-    system_prompt = """
+SYSTEM_PROMPT = """
     You are a cinematic translator for movie dialogue.
     When given user input containing:
       - src_text: the original text in the source language
@@ -28,19 +34,42 @@ def translate_gpt(request: TextSimilarityRequest) -> str:
       4. Ensure the result feels like a natural, emotionally impactful movie dialogue.
       5. Output only the final translated line as a single plain string (no JSON or extra commentary).
     """
+# 모델/프롬프트가 바뀌면 번역 캐시 키도 바뀜
+GPT_CACHE_VERSION = hashlib.sha256(f"{GPT_MODEL}\n{SYSTEM_PROMPT}".encode("utf-8")).hexdigest()[:16]
+
+_client: Optional[AsyncOpenAI] = None
+_client_http = None
+
+
+def _get_client() -> AsyncOpenAI:
+    """
+    공유 연결 풀(upstreams["openai"])을 사용하는 AsyncOpenAI 클라이언트
+    """
+    global _client, _client_http
+    http_client = upstreams["openai"].client
+    if _client is None or _client_http is not http_client:
+        _client = AsyncOpenAI(api_key=API_KEY, base_url=GPT_BASE_URL, http_client=http_client)
+        _client_http = http_client
+    return _client
+
 
-    completion = client.chat.completions.create(
-        model="gpt-4.1-nano",
-        store=True,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content":
-                f"src_text: {request.input_text}\n"
-                f"src_lang: {request.input_language}\n"
-                f"tar_lang: {request.output_language}"
-             }
-        ]
-    )
+async def translate_gpt(request: TextSimilarityRequest) -> str:
+    try:
+        async with upstreams["openai"].limit():
+            completion = await _get_client().chat.completions.create(
+                model=GPT_MODEL,
+                store=True,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content":
+                        f"src_text: {request.input_text}\n"
+                        f"src_lang: {request.input_language.value}\n"
+                        f"tar_lang: {request.output_language.value}"
+                     }
+                ]
+            )
+    except OpenAIError as e:
+        raise TranslationError(f"GPT translation failed: {e}")
 
     logging.info(f"retranslation result: {completion}")
     return completion.choices[0].message.content.strip()
@@ -1,32 +1,99 @@
-from app.core.models import SUPPORTED_PAIRS, tokenizers, models, device
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import torch
+from dotenv import load_dotenv
+
+from app.core.backends import backend_for
+from app.core.models import SUPPORTED_PAIRS, COMET_MODEL_REPO, m2m_registry, device
 from app.schema.text_similarity_dto import TextSimilarityRequest
 from app.util.exception import TranslationError
 
+env_path = (Path(__file__).resolve().parents[2] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
 
-def translate_m2m100(request: TextSimilarityRequest) -> str:
-    pair = (request.input_language, request.output_language)
+# 한 번의 generate 로 번역할 segment 수
+M2M_BATCH_SIZE = int(os.getenv("M2M_BATCH_SIZE", "16"))
+# 1 이면 greedy decoding
+M2M_NUM_BEAMS = int(os.getenv("M2M_NUM_BEAMS", "4"))
+M2M_MAX_NEW_TOKENS = int(os.getenv("M2M_MAX_NEW_TOKENS", "256"))
+M2M_MAX_INPUT_LENGTH = int(os.getenv("M2M_MAX_INPUT_LENGTH", "256"))
+# 체크포인트/디코딩 설정이 바뀌면 번역 캐시 키도 바뀜
+M2M_CACHE_VERSION = (
+    f"{COMET_MODEL_REPO}|{backend_for('m2m')}|beams={M2M_NUM_BEAMS}"
+    f"|max_new={M2M_MAX_NEW_TOKENS}|max_in={M2M_MAX_INPUT_LENGTH}"
+)
+
+
+def _length_buckets(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """
+    토큰 길이 순으로 정렬한 인덱스를 batch_size 씩 묶어 padding 을 최소화합니다.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def translate_m2m100_batch(
+    texts: List[str],
+    src_lang: str,
+    tgt_lang: str,
+    num_beams: Optional[int] = None,
+    max_new_tokens: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> List[str]:
+    """
+    여러 문장을 길이 bucket 별로 묶어 M2M100 으로 batch 번역하고, 입력 순서대로 번역문 리스트를 반환합니다.
+    """
+    pair = (src_lang, tgt_lang)
     if pair not in SUPPORTED_PAIRS:
         raise TranslationError(400, f"지원하지 않는 언어쌍: {pair}")
-    tokenizer = tokenizers[pair]
-    model = models[pair]
+    if not texts:
+        return []
+    tokenizer, model = m2m_registry.get(pair)
+
+    num_beams = num_beams or M2M_NUM_BEAMS
+    max_new_tokens = max_new_tokens or M2M_MAX_NEW_TOKENS
+    batch_size = batch_size or M2M_BATCH_SIZE
 
     # 언어 설정
-    tokenizer.src_lang = request.input_language
+    tokenizer.src_lang = src_lang
     # 번역 언어 강제 지정
-    forced_bos = tokenizer.get_lang_id(request.output_language)
+    forced_bos = tokenizer.get_lang_id(tgt_lang)
+
+    # padding 없이 한 번만 토크나이즈하고, bucket 마다 필요한 길이만큼만 padding
+    encodings = tokenizer(texts, truncation=True, max_length=M2M_MAX_INPUT_LENGTH)
+    lengths = [len(ids) for ids in encodings["input_ids"]]
 
-    # 토크나이즈 + forced BOS
-    inputs = tokenizer(request.input_text,
-                       return_tensors="pt",
-                       padding=True, truncation=True, max_length=64
-                       ).to(device)
-    inputs["forced_bos_token_id"] = forced_bos
+    results: List[str] = [""] * len(texts)
+    with torch.inference_mode():
+        for bucket in _length_buckets(lengths, batch_size):
+            inputs = tokenizer.pad(
+                {
+                    "input_ids": [encodings["input_ids"][i] for i in bucket],
+                    "attention_mask": [encodings["attention_mask"][i] for i in bucket],
+                },
+                return_tensors="pt"
+            ).to(device)
 
-    # 생성
-    model.eval()
+            # 토큰화된 아웃풋
+            output = model.generate(
+                **inputs,
+                forced_bos_token_id=forced_bos,
+                num_beams=num_beams,
+                max_new_tokens=max_new_tokens,
+                early_stopping=num_beams > 1
+            )
 
-    # 토큰화된 아웃풋
-    output = model.generate(**inputs, num_beams=4, max_length=64, early_stopping=True)
+            # 토큰 -> 텍스트 복호화 후 원래 순서 자리에 배치
+            for index, text in zip(bucket, tokenizer.batch_decode(output, skip_special_tokens=True)):
+                results[index] = text
+    return results
 
-    # 토큰 -> 텍스트 복호화
-    return tokenizer.batch_decode(output, skip_special_tokens=True)[0]
\ No newline at end of file
+
+def translate_m2m100(request: TextSimilarityRequest) -> str:
+    return translate_m2m100_batch(
+        [request.input_text],
+        request.input_language,
+        request.output_language
+    )[0]
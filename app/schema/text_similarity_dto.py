@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -15,7 +15,8 @@ class TranslateType(str, Enum):
     GPT = "GPT"
 
 class TextSimilarityRequest(BaseModel):
-    input_text: str
+    # 업로드를 읽으면서 채점하는 문서 모드 작업은 채점이 끝난 뒤 채워짐
+    input_text: Optional[str] = None
     output_text: Optional[str] = None
     input_language: Language
     output_language: Language
@@ -23,12 +24,24 @@ class TextSimilarityRequest(BaseModel):
     input_text_key: str
     output_text_key: Optional[str] = None
     total_project_id: int
+    document_mode: bool = False
+    # 계산할 지표 (e5, labse, bertscore, comet). None 이면 전체
+    metrics: Optional[List[str]] = None
+    # full | tiered. None 이면 SCORING_MODE 설정값
+    scoring_mode: Optional[str] = None
+    # 업로드 파일 내용의 sha256 (input_text 가 아직 없을 때 결과 캐시 키로 사용)
+    input_sha256: Optional[str] = None
+    # 재번역 요청: 캐시된 결과를 재사용하지 않고 새로 계산한 뒤 캐시를 갱신
+    fresh: bool = False
 
 class RetranslateRequest(BaseModel):
     input_text: str
     input_language: Language
     output_language: Language
     total_project_id: int
+    document_mode: bool = False
+    metrics: Optional[List[str]] = None
+    scoring_mode: Optional[str] = None
 
 class TextSimilarityResult(BaseModel):
     total_project_id: int
@@ -44,11 +57,30 @@ class TextSimilarityResult(BaseModel):
     output_language: str
     task_name: str
     description: str
-    e5: float
-    labse: float
-    bertscore: float
-    comet_score: float
+    # 계산하지 않은 지표는 None
+    e5: Optional[float] = None
+    labse: Optional[float] = None
+    bertscore: Optional[float] = None
+    comet_score: Optional[float] = None
+
+class TextSimilarityComparison(BaseModel):
+    task_name: str
+    total_project_id: int
+    # 점수 높은 순으로 정렬된 번역 엔진별 결과
+    candidates: List[TextSimilarityResult]
+    # 번역에 실패한 엔진별 오류 메시지
+    errors: Dict[str, str] = {}
 
 class TextSimilarityResponse(BaseModel):
     task_name: str
-    status: str
\ No newline at end of file
+    status: str
+
+class TaskStatusResponse(BaseModel):
+    task_name: str
+    status: str
+    lane: str
+    position: Optional[int] = None
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
@@ -0,0 +1,136 @@
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import uvicorn
+from dotenv import load_dotenv
+
+env_path = (Path(__file__).resolve().parent / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# uvicorn worker process 수. 모델은 부모 프로세스에서 한 번만 로드한 뒤 fork 로 공유(copy-on-write)
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+# 바로 종료되는 worker 를 다시 띄우기 전 대기 시간(초): base 부터 2배씩 늘려 max 까지.
+# max 초 이상 살아 있던 worker 는 대기 시간을 초기화
+WORKER_RESTART_BACKOFF_BASE = float(os.getenv("WORKER_RESTART_BACKOFF_BASE", "1"))
+WORKER_RESTART_BACKOFF_MAX = float(os.getenv("WORKER_RESTART_BACKOFF_MAX", "60"))
+
+
+def _bind_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((HOST, PORT))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve(app, sock: socket.socket):
+    config = uvicorn.Config(app, log_config=None)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(app, sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        # 자식: 부모가 설치한 signal handler 를 기본값으로 되돌리고 uvicorn 실행
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            _serve(app, sock)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main():
+    """
+    pre-fork 서버: 부모 프로세스가 모델을 로드하고 소켓을 연 뒤 WEB_WORKERS 개의 worker 를 fork 합니다.
+    worker 들은 로드된 모델 가중치를 copy-on-write 로 공유하므로 RSS 가 worker 수만큼 늘지 않습니다.
+    worker 에서 처음 로드하는 모델은 공유되지 않으므로 M2M100 언어쌍도 모두 부모에서 미리 로드합니다.
+    """
+    import torch
+    from app.core.executor import inference_executor
+    from app.core.models import init_models, m2m_registry
+    from app.main import app
+
+    if WEB_WORKERS <= 1:
+        # 단일 프로세스: lifespan 에서 백그라운드로 모델 로드
+        _serve(app, _bind_socket())
+        return
+
+    # fork 전에 OpenMP 스레드 풀을 만들지 않도록 부모에서는 단일 스레드로 로드
+    torch.set_num_threads(1)
+    inference_executor.share_cpus(WEB_WORKERS)
+    # 모든 언어쌍을 pin 해서 init_models 에서 로드하고, worker 에서 내렸다가 각자 다시 로드하지 않도록 함
+    for pair in m2m_registry.supported_pairs:
+        m2m_registry.pin(pair)
+    init_models()
+    sock = _bind_socket()
+
+    # 이후 GC 가 공유 객체의 헤더를 건드려 페이지가 복사되는 것을 줄임
+    gc.collect()
+    gc.freeze()
+
+    workers: Dict[int, int] = {}
+    started: Dict[int, float] = {}
+    failures: Dict[int, int] = {}
+    for index in range(WEB_WORKERS):
+        workers[_spawn(app, sock)] = index
+        started[index] = time.monotonic()
+    logging.info(f"🚀 started {WEB_WORKERS} workers on {HOST}:{PORT} (pids={list(workers)})")
+
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        index = workers.pop(pid, None)
+        if index is None:
+            continue
+        if stopping:
+            continue
+
+        # 시작하자마자 죽는 worker 를 계속 fork 하지 않도록 연속 실패마다 대기 시간을 늘림
+        if time.monotonic() - started[index] >= WORKER_RESTART_BACKOFF_MAX:
+            failures[index] = 0
+        delay = min(WORKER_RESTART_BACKOFF_MAX, WORKER_RESTART_BACKOFF_BASE * 2 ** min(failures.get(index, 0), 16))
+        failures[index] = failures.get(index, 0) + 1
+        logging.warning(f"worker {pid} exited (status={status}); restarting in {delay:.0f}s")
+        deadline = time.monotonic() + delay
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(max(0.0, min(0.5, deadline - time.monotonic())))
+        if not stopping:
+            workers[_spawn(app, sock)] = index
+            started[index] = time.monotonic()
+
+    sock.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
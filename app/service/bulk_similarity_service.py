@@ -0,0 +1,220 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from app.client.spring_client import send_result_to_be
+from app.model.similarity.evaluate_similarity_agent import score_pairs, summarize_scores
+from app.schema.text_similarity_dto import TextSimilarityRequest
+from app.service.text_similarity_service import perform_segment_translation, build_result
+from app.util.exception import TranslationError
+from app.util.s3 import upload_s3_async
+from app.web_socket.notifier import notify_progress
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+# 한 번에 번역/채점하는 행 수
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "64"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "10000"))
+
+_SOURCE_KEYS = ("source", "input_text", "src")
+_TRANSLATION_KEYS = ("translation", "output_text", "mt")
+
+Row = Tuple[str, Optional[str]]
+
+
+def _pick(record: dict, keys: Tuple[str, ...]) -> Optional[str]:
+    for key in keys:
+        value = record.get(key)
+        if value is not None and value != "":
+            return str(value)
+    return None
+
+
+def parse_bulk_rows(raw: bytes, filename: str = "") -> List[Row]:
+    """
+    JSONL 또는 CSV(.csv) 를 (원문, 번역문|None) 리스트로 변환합니다.
+    JSONL 은 {"source": ..., "translation": ...}, CSV 는 source,translation 헤더(없으면 1, 2열)를 사용합니다.
+    형식 오류는 ValueError
+    """
+    text = raw.decode("utf-8-sig")
+    rows: List[Row] = []
+
+    if filename.lower().endswith(".csv"):
+        reader = csv.reader(io.StringIO(text))
+        header = next(reader, None)
+        if header is None:
+            return rows
+        lowered = [h.strip().lower() for h in header]
+        if any(key in lowered for key in _SOURCE_KEYS):
+            records = (dict(zip(lowered, values)) for values in reader)
+        else:
+            # 헤더 없는 CSV: 첫 줄도 데이터
+            records = (
+                {"source": values[0] if values else "", "translation": values[1] if len(values) > 1 else None}
+                for values in [header, *reader]
+            )
+        for line_no, record in enumerate(records, start=1):
+            source = _pick(record, _SOURCE_KEYS)
+            if source is None:
+                raise ValueError(f"row {line_no}: source is empty")
+            rows.append((source, _pick(record, _TRANSLATION_KEYS)))
+        return rows
+
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {line_no}: invalid JSON ({e})")
+        if not isinstance(record, dict):
+            raise ValueError(f"line {line_no}: expected a JSON object")
+        source = _pick(record, _SOURCE_KEYS)
+        if source is None:
+            raise ValueError(f"line {line_no}: source is empty")
+        rows.append((source, _pick(record, _TRANSLATION_KEYS)))
+    return rows
+
+
+async def _translate_chunk(request: TextSimilarityRequest, chunk: List[Row]) -> Tuple[List[Optional[str]], Optional[str]]:
+    """
+    번역문이 없는 행만 모아서 batch 번역합니다. (번역문 리스트, 오류 메시지) 반환
+    """
+    translations = [translation for _, translation in chunk]
+    missing = [i for i, translation in enumerate(translations) if translation is None]
+    if not missing:
+        return translations, None
+    try:
+        translated = await perform_segment_translation(request, [chunk[i][0] for i in missing])
+    except TranslationError as e:
+        logging.error(f"❌ bulk translation failed: {e}")
+        return translations, str(e)
+    for i, text in zip(missing, translated):
+        translations[i] = text
+    return translations, None
+
+
+async def run_bulk_similarity(
+    task_name: str,
+    request: TextSimilarityRequest,
+    rows: List[Row]
+) -> AsyncIterator[dict]:
+    """
+    행들을 BULK_CHUNK_SIZE 씩 번역(다음 chunk 번역은 현재 chunk 채점과 겹쳐서 진행) 후 batch 채점하고,
+    행 결과를 입력 순서대로 yield 합니다. 마지막에 요약을 yield 하고 집계 결과를 Spring 으로 한 번 전송합니다.
+    """
+    logging.info(f"📦 starting bulk task {task_name}: {len(rows)} rows")
+    start = time.time()
+    total = len(rows)
+    await notify_progress(task_name, 0)
+
+    chunks = [rows[i:i + BULK_CHUNK_SIZE] for i in range(0, total, BULK_CHUNK_SIZE)]
+    # 열 순서: e5, labse, precision, recall, f1, comet
+    scores = np.zeros((total, 6), dtype=np.float64)
+    scored = np.zeros(total, dtype=bool)
+    all_translations: List[str] = []
+
+    next_translation = asyncio.ensure_future(_translate_chunk(request, chunks[0])) if chunks else None
+    try:
+        for chunk_index, chunk in enumerate(chunks):
+            translations, error = await next_translation
+            if chunk_index + 1 < len(chunks):
+                next_translation = asyncio.ensure_future(_translate_chunk(request, chunks[chunk_index + 1]))
+
+            offset = chunk_index * BULK_CHUNK_SIZE
+            ok = [i for i, translation in enumerate(translations) if translation is not None]
+            if ok:
+                chunk_scores = await score_pairs([(chunk[i][0], translations[i]) for i in ok])
+                for i, row_scores in zip(ok, chunk_scores):
+                    scores[offset + i] = row_scores
+                    scored[offset + i] = True
+
+            for i, (source, _) in enumerate(chunk):
+                index = offset + i
+                translation = translations[i]
+                all_translations.append(translation or "")
+                result = {"index": index, "source": source, "translation": translation}
+                if scored[index]:
+                    row_scores = scores[index]
+                    result.update({
+                        "e5": round(float(row_scores[0]), 4),
+                        "labse": round(float(row_scores[1]), 4),
+                        "bertscore_f1": round(float(row_scores[4]), 4),
+                        "comet": round(float(row_scores[5]), 4),
+                    })
+                else:
+                    result["error"] = error or "translation missing"
+                yield result
+
+            progress = min(99, int((offset + len(chunk)) / total * 100))
+            await notify_progress(task_name, progress)
+    finally:
+        # 채점 실패 등으로 중단되면 미리 시작한 다음 chunk 번역을 정리
+        if next_translation is not None and not next_translation.done():
+            next_translation.cancel()
+            await asyncio.gather(next_translation, return_exceptions=True)
+
+    succeeded = int(scored.sum())
+    if succeeded:
+        # 채점된 행의 단순 평균 (임계값은 단일 채점과 같은 설정 사용)
+        metrics = summarize_scores(scores[scored], np.ones(succeeded))
+    else:
+        metrics = {
+            "e5_semantic_similarity": 0.0,
+            "labse_literal_similarity": 0.0,
+            "bertscore": {"precision": 0.0, "recall": 0.0, "f1": 0.0},
+            "comet_score": 0.0,
+            "description": "",
+        }
+    execution_time = round(time.time() - start, 2)
+
+    summary = {
+        "task_name": task_name,
+        "rows": total,
+        "scored": succeeded,
+        "failed": total - succeeded,
+        "e5": metrics["e5_semantic_similarity"],
+        "labse": metrics["labse_literal_similarity"],
+        "bertscore_f1": metrics["bertscore"]["f1"],
+        "comet": round(metrics["comet_score"], 4),
+        "execution_time": execution_time,
+    }
+    yield {"summary": summary}
+
+    if succeeded:
+        await notify_progress(task_name, 100)
+    else:
+        await notify_progress(task_name, -1, error="No rows could be scored")
+    logging.info(
+        f"⏱ 실행 시간: {execution_time:.2f}s | ✅ completed bulk task {task_name} "
+        f"({succeeded}/{total} rows scored)"
+    )
+
+    # 번역 결과를 한 파일로 저장하고 집계 결과를 한 번만 전송
+    translated_text = "\n".join(all_translations)
+    output_txt_key = f"text_similarity/{task_name}/translations.txt"
+    try:
+        await upload_s3_async(output_txt_key, translated_text.encode("utf-8"), "text/plain; charset=utf-8")
+        request.output_text_key = output_txt_key
+    except Exception as e:
+        # 저장되지 않은 번역 파일의 URL 은 결과에 넣지 않음
+        logging.error(f"❌ bulk translation upload failed for {task_name}: {e}")
+        request.output_text_key = None
+
+    result_dict = {
+        "original_text": request.input_text,
+        "translated_text": translated_text,
+        **metrics,
+        "execution_time": execution_time,
+    }
+    await send_result_to_be(build_result(result_dict, request, task_name))
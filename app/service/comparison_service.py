@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.client.spring_client import send_result_to_be
+from app.model.similarity.evaluate_similarity_agent import score_pairs, resolve_metrics, summarize_scores
+from app.schema.text_similarity_dto import (
+    TextSimilarityRequest, TextSimilarityResult, TextSimilarityComparison, TranslateType
+)
+from app.service.text_similarity_service import (
+    perform_translation, perform_segment_translation, build_result, build_failure_result
+)
+from app.util.exception import TranslationError, S3UploadError
+from app.util.s3 import upload_s3_async
+from app.util.segmenter import split_sentences
+from app.web_socket.notifier import notify_progress, manager
+
+
+async def _translate_candidate(request: TextSimilarityRequest, segments: List[str]) -> List[str]:
+    """
+    한 번역 엔진으로 segment 들을 번역합니다. 문서 모드가 아니면 segment 는 원문 하나입니다.
+    """
+    if request.document_mode:
+        return await perform_segment_translation(request, segments)
+    return [await perform_translation(request)]
+
+
+async def _upload_candidate(task_name: str, translate_type: TranslateType, request: TextSimilarityRequest, text: str):
+    """
+    엔진별 번역문 업로드. 실패해도 다른 엔진의 결과는 그대로 전송하도록 로그만 남기고 key 는 비워 둡니다.
+    """
+    output_txt_key = f"text_similarity/{task_name}/{translate_type.value.lower()}.txt"
+    try:
+        await upload_s3_async(output_txt_key, text.encode("utf-8"), "text/plain; charset=utf-8")
+    except S3UploadError as e:
+        logging.error(f"❌ translation upload failed for {task_name} ({translate_type.value}): {e}")
+        return
+    request.output_text_key = output_txt_key
+
+
+async def run_text_similarity_comparison(
+    task_name: str,
+    request: TextSimilarityRequest,
+    translate_types: List[TranslateType]
+) -> TextSimilarityComparison:
+    """
+    선택한 번역 엔진들로 동시에 번역하고, 모든 후보를 한 번의 batch 로 채점해 점수 순으로 정렬한 결과를 반환합니다.
+    같은 원문이 후보마다 반복되므로 원문 임베딩은 한 번만 계산됩니다.
+    엔진별 결과는 기존 작업과 같은 형태로 Spring 에 전송하고, 번역/채점에 실패한 엔진은 0점 결과를 전송합니다.
+    """
+    logging.info(f"⚖️ starting comparison task {task_name}: {', '.join(t.value for t in translate_types)}")
+    manager.track_task(task_name, request.total_project_id)
+    start = time.time()
+    await notify_progress(task_name, 0)
+
+    segments = split_sentences(request.input_text) if request.document_mode else []
+    if not segments:
+        segments = [request.input_text]
+
+    # 1) 엔진별 번역 동시 실행
+    candidate_requests = {
+        translate_type: request.model_copy(update={"translate_type": translate_type})
+        for translate_type in translate_types
+    }
+    outcomes = await asyncio.gather(
+        *[_translate_candidate(candidate, segments) for candidate in candidate_requests.values()],
+        return_exceptions=True
+    )
+
+    translations: Dict[TranslateType, List[str]] = {}
+    errors: Dict[str, str] = {}
+    for translate_type, outcome in zip(candidate_requests, outcomes):
+        if isinstance(outcome, TranslationError):
+            logging.error(f"❌ {translate_type.value} translation failed for {task_name}: {outcome}")
+            errors[translate_type.value] = str(outcome)
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            translations[translate_type] = outcome
+
+    # 번역에 실패한 엔진은 기존 작업처럼 0점 결과를 Spring 에 전송
+    failed = [
+        build_failure_result(candidate_requests[translate_type], task_name, "")
+        for translate_type in candidate_requests if translate_type.value in errors
+    ]
+
+    if not translations:
+        await notify_progress(task_name, -1, error="All translations failed")
+        logging.info("⏹ comparison task exited after translation errors")
+        for result in failed:
+            await send_result_to_be(result)
+        return TextSimilarityComparison(
+            task_name=task_name, total_project_id=request.total_project_id, candidates=[], errors=errors
+        )
+    await notify_progress(task_name, 50)
+
+    # 2) 모든 후보의 (원문, 번역문) 쌍을 한 번에 채점
+    metrics = resolve_metrics(request.metrics)
+    pairs = [(source, target) for targets in translations.values() for source, target in zip(segments, targets)]
+    try:
+        scores = await score_pairs(pairs, metrics)
+    except Exception as e:
+        logging.error(f"❌ similarity evaluation failed for {task_name}: {e}")
+        await notify_progress(task_name, -1, error="Similarity evaluation error")
+        logging.info("⏹ comparison task exited after similarity error")
+
+        for translate_type, targets in translations.items():
+            target_text = "\n".join(targets)
+            candidate = candidate_requests[translate_type]
+            await _upload_candidate(task_name, translate_type, candidate, target_text)
+            errors[translate_type.value] = str(e)
+            failed.append(build_failure_result(candidate, task_name, target_text))
+        for result in failed:
+            await send_result_to_be(result)
+        return TextSimilarityComparison(
+            task_name=task_name, total_project_id=request.total_project_id, candidates=[], errors=errors
+        )
+    weights = np.fromiter((max(len(s), 1) for s in segments), dtype=np.float64, count=len(segments))
+    execution_time = round(time.time() - start, 2)
+
+    # 3) 엔진별 집계 → 점수 순 정렬
+    ranked: List[Tuple[TranslateType, TextSimilarityResult]] = []
+    for index, (translate_type, targets) in enumerate(translations.items()):
+        target_text = "\n".join(targets)
+        candidate = candidate_requests[translate_type]
+        await _upload_candidate(task_name, translate_type, candidate, target_text)
+
+        result_dict = summarize_scores(scores[index * len(segments):(index + 1) * len(segments)], weights)
+        result_dict.update({"translated_text": target_text, "execution_time": execution_time})
+        ranked.append((translate_type, build_result(result_dict, candidate, task_name)))
+    ranked.sort(key=lambda item: item[1].score, reverse=True)
+    candidates = [result for _, result in ranked]
+
+    await notify_progress(task_name, 100)
+    logging.info(
+        f"⏱ 실행 시간: {execution_time:.2f}s | ✅ completed comparison task {task_name}: "
+        + ", ".join(f"{translate_type.value}={result.score}" for translate_type, result in ranked)
+    )
+
+    for result in candidates + failed:
+        await send_result_to_be(result)
+
+    return TextSimilarityComparison(
+        task_name=task_name,
+        total_project_id=request.total_project_id,
+        candidates=candidates,
+        errors=errors
+    )
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.schema.text_similarity_dto import TextSimilarityRequest
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+# 캐시된 결과(원문/번역문 포함)의 총 크기 상한. 문서 결과는 수 MB 이므로 항목 수만으로는 메모리를 제한할 수 없음
+RESULT_CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "64"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    유니코드 NFC 정규화 + 연속 공백 축약 + 앞뒤 공백 제거
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_result_key(request: TextSimilarityRequest) -> str:
+    """
+    (정규화된 원문, 비교용 출력 텍스트 또는 번역 엔진, 언어쌍, 문서 모드, 지표/채점 모드) 기준 캐시 키
+    업로드를 읽으면서 채점해 원문이 아직 없으면 업로드 파일 내용의 sha256 을 사용합니다.
+    """
+    if request.input_text is not None:
+        source = normalize_text(request.input_text)
+    else:
+        source = "sha256:" + request.input_sha256
+    if request.output_text is not None:
+        target = "output:" + normalize_text(request.output_text)
+    else:
+        target = "engine:" + request.translate_type.value
+    parts = [
+        source,
+        target,
+        request.input_language.value,
+        request.output_language.value,
+        "document" if request.document_mode else "single",
+        ",".join(sorted(m.lower() for m in request.metrics or [])),
+        (request.scoring_mode or "").lower(),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    캐시 값의 대략적인 크기(byte). 문자열은 UTF-8 길이, dict/list/tuple 은 내용의 합, 그 외는 8
+    """
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    return 8
+
+
+class ResultCache:
+    """
+    TTL/항목 수/총 크기 제한 LRU 결과 캐시. max_bytes 보다 큰 결과 하나는 캐시하지 않습니다.
+    같은 키의 계산이 진행 중이면 새로 계산하지 않고 진행 중인 결과를 함께 기다립니다(single-flight).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # 0 이면 크기 제한 없음
+        self.max_bytes = max_bytes
+        # key -> (만료 시각, 값, 크기)
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def put(self, key: str, value: Any):
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        size = estimate_size(value)
+        if key in self._entries:
+            self._remove(key)
+        if self.max_bytes and size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+        refresh: bool = False
+    ) -> Tuple[Any, str]:
+        """
+        (값, 출처) 반환. 출처는 "hit" | "shared" | "computed"
+        compute 에서 발생한 예외는 같은 키를 기다리던 모든 호출자에게 전파되고 캐시되지 않습니다.
+        refresh=True 면 캐시/진행 중인 계산을 재사용하지 않고 새로 계산해 캐시를 갱신합니다.
+        """
+        if not refresh:
+            value = self.get(key)
+            if value is not None:
+                self.hits += 1
+                return value, "hit"
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                self.shared += 1
+                return await asyncio.shield(in_flight), "shared"
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 호출자가 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        else:
+            if should_cache(value):
+                self.put(key, value)
+            future.set_result(value)
+            return value, "computed"
+        finally:
+            # refresh 로 같은 키의 새 계산이 등록됐으면 그대로 둠
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "shared": self.shared,
+            "misses": self.misses,
+        }
+
+
+result_cache = ResultCache(
+    max_entries=RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+    max_bytes=int(RESULT_CACHE_MAX_MB * 1024 * 1024),
+)
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.metrics import task_seconds, task_queue_wait_seconds
+from app.util.exception import QueueFullError
+from app.web_socket.notifier import manager
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+# 동시에 실행할 interactive 작업 수. 기본값은 scorer micro-batch 한 배치를 채울 수 있는 SIMILARITY_BATCH_MAX_SIZE
+TASK_MAX_CONCURRENCY = int(os.getenv("TASK_MAX_CONCURRENCY", os.getenv("SIMILARITY_BATCH_MAX_SIZE", "16")))
+# 동시에 실행할 bulk 작업 수. interactive 와 별도로 세므로 긴 bulk 작업이 interactive 자리를 차지하지 않음
+TASK_BULK_MAX_CONCURRENCY = int(os.getenv("TASK_BULK_MAX_CONCURRENCY", "2"))
+# 대기열 최대 길이 (lane 합계). 넘으면 QueueFullError → 429
+TASK_QUEUE_MAX = int(os.getenv("TASK_QUEUE_MAX", "100"))
+# interactive 작업을 연속으로 이만큼 꺼내면 대기 중인 bulk 작업을 하나 끼워 넣음 (기아 방지)
+TASK_INTERACTIVE_BURST = int(os.getenv("TASK_INTERACTIVE_BURST", "4"))
+# 완료된 작업 상태를 보관할 최대 개수
+TASK_STATUS_MAX_ENTRIES = int(os.getenv("TASK_STATUS_MAX_ENTRIES", "1000"))
+TASK_RETRY_AFTER_SECONDS = int(os.getenv("TASK_RETRY_AFTER_SECONDS", "10"))
+
+
+class Lane(str, Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+class TaskInfo:
+    """
+    스케줄러에 등록된 작업 하나의 상태
+    """
+
+    def __init__(self, task_name: str, lane: Lane, job: Callable[[], Awaitable[Any]]):
+        self.task_name = task_name
+        self.lane = lane
+        self.job = job
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # 작업 결과를 기다릴 수 있는 future
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class TaskScheduler:
+    """
+    lane 별 동시 실행 수/대기열 길이를 제한하는 in-process 작업 스케줄러.
+    interactive lane 을 bulk lane 보다 먼저 꺼내되, bulk 가 굶지 않도록 주기적으로 하나씩 섞습니다.
+    worker task 는 실행 중인 이벤트 루프에서 처음 submit 할 때 만들어집니다(fork 이후 worker 별로 생성).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        interactive_burst: int,
+        max_status_entries: int,
+        bulk_max_concurrency: int = 1,
+    ):
+        self.max_concurrency: Dict[Lane, int] = {
+            Lane.INTERACTIVE: max(1, max_concurrency),
+            Lane.BULK: max(1, bulk_max_concurrency),
+        }
+        self.max_queue = max_queue
+        self.interactive_burst = max(1, interactive_burst)
+        self.max_status_entries = max_status_entries
+
+        self._queues: Dict[Lane, Deque[TaskInfo]] = {lane: deque() for lane in Lane}
+        self._tasks: "OrderedDict[str, TaskInfo]" = OrderedDict()
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Condition] = None
+        self._interactive_streak = 0
+
+        self.running: Dict[Lane, int] = {lane: 0 for lane in Lane}
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def check_capacity(self):
+        """
+        대기열이 가득 찼으면 QueueFullError
+        """
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise QueueFullError(f"task queue is full ({self.max_queue})", TASK_RETRY_AFTER_SECONDS)
+
+    def _ensure_workers(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Condition()
+        if not self._workers:
+            self._workers = [
+                asyncio.get_running_loop().create_task(self._worker(i))
+                for i in range(sum(self.max_concurrency.values()))
+            ]
+
+    async def submit(self, task_name: str, lane: Lane, fn: Callable[..., Awaitable[Any]], *args) -> TaskInfo:
+        """
+        작업을 대기열에 넣고 TaskInfo 를 반환합니다. 대기열이 가득 차면 QueueFullError
+        """
+        self._ensure_workers()
+        self.check_capacity()
+
+        info = TaskInfo(task_name, lane, lambda: fn(*args))
+        self._tasks[task_name] = info
+        self._queues[lane].append(info)
+        self._trim()
+        async with self._wakeup:
+            self._wakeup.notify()
+        return info
+
+    def _runnable(self, lane: Lane) -> bool:
+        return bool(self._queues[lane]) and self.running[lane] < self.max_concurrency[lane]
+
+    def _next(self) -> Optional[TaskInfo]:
+        interactive, bulk = self._runnable(Lane.INTERACTIVE), self._runnable(Lane.BULK)
+        if interactive and (not bulk or self._interactive_streak < self.interactive_burst):
+            self._interactive_streak += 1
+            return self._queues[Lane.INTERACTIVE].popleft()
+        if bulk:
+            self._interactive_streak = 0
+            return self._queues[Lane.BULK].popleft()
+        return None
+
+    async def _worker(self, index: int):
+        while True:
+            async with self._wakeup:
+                await self._wakeup.wait_for(lambda: any(self._runnable(lane) for lane in Lane))
+                info = self._next()
+                self.running[info.lane] += 1
+
+            info.status = "running"
+            info.started_at = time.time()
+            task_queue_wait_seconds.observe(info.started_at - info.submitted_at, lane=info.lane.value)
+            try:
+                result = await info.job()
+            except asyncio.CancelledError:
+                info.status = "cancelled"
+                if not info.future.done():
+                    info.future.cancel()
+                raise
+            except Exception as e:
+                logging.error(f"❌ task {info.task_name} failed: {e}")
+                info.status = "failed"
+                info.error = str(e)
+                self.failed += 1
+                if not info.future.done():
+                    info.future.set_exception(e)
+                    # 아무도 기다리지 않는 future 의 예외 경고 방지
+                    info.future.exception()
+            else:
+                info.status = "done"
+                self.completed += 1
+                if not info.future.done():
+                    info.future.set_result(result)
+            finally:
+                info.finished_at = time.time()
+                task_seconds.observe(info.finished_at - info.started_at, lane=info.lane.value, status=info.status)
+                info.job = None
+                self.running[info.lane] -= 1
+                # 완료 메시지 없이 끝난 작업(취소/예외)도 진행률 라우팅 정보 정리
+                manager.forget_task(info.task_name)
+
+            # lane 자리가 비었으므로 그 lane 작업을 기다리던 worker 를 깨움
+            async with self._wakeup:
+                self._wakeup.notify_all()
+
+    def _trim(self):
+        """
+        끝난 작업 상태를 오래된 순으로 정리
+        """
+        if len(self._tasks) <= self.max_status_entries:
+            return
+        for task_name in list(self._tasks):
+            if len(self._tasks) <= self.max_status_entries:
+                break
+            if self._tasks[task_name].finished_at is not None:
+                del self._tasks[task_name]
+
+    def position(self, info: TaskInfo) -> Optional[int]:
+        """
+        대기 중인 작업의 같은 lane 안 순번 (1 부터). lane 마다 동시 실행 수를 따로 세므로 다른 lane 은 제외합니다.
+        """
+        if info.status != "queued":
+            return None
+        return self._queues[info.lane].index(info) + 1
+
+    def status(self, task_name: str) -> Optional[dict]:
+        info = self._tasks.get(task_name)
+        if info is None:
+            return None
+        return {
+            "task_name": info.task_name,
+            "status": info.status,
+            "lane": info.lane.value,
+            "position": self.position(info),
+            "submitted_at": info.submitted_at,
+            "started_at": info.started_at,
+            "finished_at": info.finished_at,
+            "error": info.error,
+        }
+
+    def result(self, task_name: str) -> Optional[Any]:
+        """
+        정상 완료된 작업의 반환값. 모르는 작업이거나 아직 끝나지 않았거나 실패했으면 None
+        """
+        info = self._tasks.get(task_name)
+        if info is None or info.status != "done":
+            return None
+        return info.future.result()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": {lane.value: limit for lane, limit in self.max_concurrency.items()},
+            "max_queue": self.max_queue,
+            "running": {lane.value: count for lane, count in self.running.items()},
+            "queued": {lane.value: len(queue) for lane, queue in self._queues.items()},
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    async def shutdown(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+task_scheduler = TaskScheduler(
+    TASK_MAX_CONCURRENCY,
+    TASK_QUEUE_MAX,
+    TASK_INTERACTIVE_BURST,
+    TASK_STATUS_MAX_ENTRIES,
+    TASK_BULK_MAX_CONCURRENCY,
+)
@@ -1,50 +1,180 @@
+import asyncio
 import logging
+import time
+from typing import Dict, List, Optional, Tuple
 
-from app.model.translate.gpt import translate_gpt
-from app.model.translate.m2m100 import translate_m2m100
+from app.core.executor import inference_executor
+from app.core.metrics import translation_seconds
+from app.model.translate.gpt import translate_gpt, GPT_CACHE_VERSION
+from app.model.translate.m2m100 import translate_m2m100, translate_m2m100_batch, M2M_CACHE_VERSION
 from app.schema.text_similarity_dto import TextSimilarityResult, TextSimilarityRequest, TranslateType
-from app.model.similarity.evaluate_similarity_agent import evaluate_dual_similarity
-from app.model.translate.google_translate import translate_google, TranslationError
+from app.model.similarity.evaluate_similarity_agent import (
+    evaluate_dual_similarity, evaluate_document_similarity, DocumentScorer, DOCUMENT_CHUNK_SIZE
+)
+from app.model.similarity.sentence_alignment import align_segments, SENTENCE_ALIGNMENT
+from app.model.translate.google_translate import (
+    translate_google, translate_google_batch, TranslationError, GOOGLE_CACHE_VERSION
+)
+from app.util.segmenter import split_sentences
 from app.client.spring_client import send_result_to_be
-from app.util.s3 import upload_s3, make_public_url
+from app.service.result_cache import result_cache, make_result_key
+from app.service.translation_cache import translation_cache, make_translation_key
+from app.util.exception import SimilarityEvaluationError, S3UploadError
+from app.util.ingest import UploadReader
+from app.util.s3 import upload_s3_async, make_public_url
+from app.web_socket.notifier import notify_progress, manager
 
 
-def _perform_translation(request: TextSimilarityRequest) -> str:
+def _translation_keys(request: TextSimilarityRequest, texts: List[str], mode: str) -> List[str]:
     """
-    요청에 맞는 번역기를 사용해 텍스트를 번역합니다.
-    실패 시 TranslationError를 전파합니다.
+    번역 엔진/모델·프롬프트 버전/언어쌍 기준 번역 캐시 키 (mode: single | batch)
     """
     if request.translate_type == TranslateType.GOOGLE:
-        return translate_google(request)
+        version = GOOGLE_CACHE_VERSION[mode]
     elif request.translate_type == TranslateType.M2M:
-        return translate_m2m100(request)
-    elif request.translate_type == TranslateType.GPT:
-        return translate_gpt(request)
+        version = M2M_CACHE_VERSION
     else:
-        raise TranslationError(f"Unsupported translate_type: {request.translate_type}")
+        version = GPT_CACHE_VERSION
+    return [
+        make_translation_key(
+            request.translate_type.value,
+            version,
+            request.input_language.value,
+            request.output_language.value,
+            text
+        )
+        for text in texts
+    ]
+
+
+async def perform_translation(request: TextSimilarityRequest) -> str:
+    """
+    요청에 맞는 번역기를 사용해 텍스트를 번역합니다. 번역 캐시에 있으면 재사용합니다(재번역 요청은 제외).
+    M2M100 추론은 inference executor 에서 실행됩니다.
+    실패 시 TranslationError를 전파합니다.
+    """
+    key = _translation_keys(request, [request.input_text], "single")[0]
+    cached = None if request.fresh else await translation_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with translation_seconds.time(engine=request.translate_type.value, mode="single"):
+        if request.translate_type == TranslateType.GOOGLE:
+            translated = await translate_google(request)
+        elif request.translate_type == TranslateType.M2M:
+            translated = await inference_executor.run(translate_m2m100, request)
+        elif request.translate_type == TranslateType.GPT:
+            translated = await translate_gpt(request)
+        else:
+            raise TranslationError(f"Unsupported translate_type: {request.translate_type}")
+
+    await translation_cache.put(key, translated)
+    return translated
+
+
+async def _translate_segments(
+    request: TextSimilarityRequest,
+    segments: List[str]
+) -> List[str]:
+    with translation_seconds.time(engine=request.translate_type.value, mode="batch"):
+        if request.translate_type == TranslateType.GOOGLE:
+            return await translate_google_batch(segments, request.output_language)
+        elif request.translate_type == TranslateType.M2M:
+            return await inference_executor.run(
+                translate_m2m100_batch, segments, request.input_language, request.output_language
+            )
+        elif request.translate_type == TranslateType.GPT:
+            # 동시 요청 수는 openai upstream 제한을 따름
+            return list(await asyncio.gather(*[
+                translate_gpt(request.model_copy(update={"input_text": segment}))
+                for segment in segments
+            ]))
+        else:
+            raise TranslationError(f"Unsupported translate_type: {request.translate_type}")
 
 
-def _build_result(
+async def perform_segment_translation(
+    request: TextSimilarityRequest,
+    segments: List[str]
+) -> List[str]:
+    """
+    문서 모드에서 segment 리스트를 번역기별 batch 방식으로 번역합니다.
+    번역 캐시에 있는 문장은 재사용하고(재번역 요청은 제외), 새 문장(중복 제거)만 번역합니다.
+    실패 시 TranslationError를 전파합니다.
+    """
+    keys = _translation_keys(request, segments, "batch")
+    cached = {} if request.fresh else await translation_cache.get_many(keys)
+
+    missing: Dict[str, str] = {}
+    for key, segment in zip(keys, segments):
+        if key not in cached and key not in missing:
+            missing[key] = segment
+    if missing:
+        translated = await _translate_segments(request, list(missing.values()))
+        fresh = list(zip(missing.keys(), translated))
+        cached.update(fresh)
+        await translation_cache.put_many(fresh)
+        logging.info(f"🗂 segment translation: {len(segments) - len(missing)} reused, {len(missing)} translated")
+
+    return [cached[key] for key in keys]
+
+
+async def _prepare_segments(request: TextSimilarityRequest) -> Tuple[List[str], List[str]]:
+    """
+    원문을 문장 단위로 분할하고, 같은 길이의 번역 segment 리스트를 만듭니다.
+    비교용 출력 텍스트의 문장 수가 원문과 다르면 LaBSE 문장 정렬(1-1, 1-2, 2-1)로 대응 쌍을 만들고
+    (대응 문장이 없는 문장은 반대쪽이 빈 0점 쌍),
+    정렬을 끈 경우나 대응 쌍이 없으면 전체 텍스트를 하나의 쌍으로 사용합니다.
+    """
+    source_segments = split_sentences(request.input_text)
+    if not source_segments:
+        source_segments = [request.input_text]
+
+    if request.output_text is None:
+        return source_segments, await perform_segment_translation(request, source_segments)
+
+    target_segments = split_sentences(request.output_text)
+    if len(target_segments) != len(source_segments):
+        logging.warning(
+            f"segment count mismatch (input={len(source_segments)}, output={len(target_segments)}); "
+            + ("aligning sentences with LaBSE" if SENTENCE_ALIGNMENT else "scoring whole text as a single pair")
+        )
+        if SENTENCE_ALIGNMENT and target_segments:
+            try:
+                aligned_sources, aligned_targets = await inference_executor.run(
+                    align_segments, source_segments, target_segments, name="alignment"
+                )
+            except Exception as e:
+                logging.error(f"❌ sentence alignment failed: {e}; scoring whole text as a single pair")
+            else:
+                if aligned_sources:
+                    return aligned_sources, aligned_targets
+        return [request.input_text], [request.output_text]
+    return source_segments, target_segments
+
+
+def build_result(
     result_dict: dict,
     request: TextSimilarityRequest,
     task_name: str
 ) -> TextSimilarityResult:
     """
     evaluate_dual_similarity 결과 dict 으로 TextSimilarityResult DTO 생성
-    및 전체 점수(산술 평균) 계산
-    """
-    e5 = result_dict.get("e5_semantic_similarity", 0)
-    labse = result_dict.get("labse_literal_similarity", 0)
-    bs_dict = result_dict.get("bertscore") or {}
-    bertscore = float(bs_dict.get("f1") or 0)
-    comet_score = result_dict.get("comet_score") or 0
-    overall_score_float = (e5 + labse + bertscore + comet_score) / 4
+    및 전체 점수(계산된 지표들의 산술 평균) 계산
+    """
+    e5 = result_dict.get("e5_semantic_similarity")
+    labse = result_dict.get("labse_literal_similarity")
+    bs_value = result_dict.get("bertscore")
+    bertscore = bs_value.get("f1") if isinstance(bs_value, dict) else bs_value
+    comet_score = result_dict.get("comet_score")
+    computed = [float(v) for v in (e5, labse, bertscore, comet_score) if v is not None]
+    overall_score_float = sum(computed) / len(computed) if computed else 0
     overall_score = round(overall_score_float * 100)
 
     return TextSimilarityResult(
         total_project_id=request.total_project_id,
         score=overall_score,
-        input_text=request.input_text,
+        input_text=request.input_text if request.input_text is not None else result_dict.get("original_text", ""),
         translation_text=result_dict.get("translated_text"),
         input_text_key=make_public_url(request.input_text_key),
         translation_text_key=make_public_url(request.output_text_key),
@@ -62,67 +192,213 @@ def _build_result(
     )
 
 
-async def run_text_similarity(
+async def _translate_and_evaluate(
     task_name: str,
     request: TextSimilarityRequest
+) -> Tuple[str, dict]:
+    """
+    번역 후 유사도 평가를 수행하고 (번역문, 평가 결과 dict) 를 반환합니다.
+    번역 실패는 TranslationError, 평가 실패는 번역문을 담은 SimilarityEvaluationError 로 전파합니다.
+    """
+    # 1) 번역
+    if request.document_mode:
+        source_segments, target_segments = await _prepare_segments(request)
+        target_text = "\n".join(t for t in target_segments if t)
+    else:
+        target_text = request.output_text or await perform_translation(request)
+
+    # 2) 유사도 평가
+    try:
+        if request.document_mode:
+            result_dict = await evaluate_document_similarity(
+                task_name=task_name,
+                originals=source_segments,
+                translations=target_segments,
+                metrics=request.metrics
+            )
+        else:
+            result_dict = await evaluate_dual_similarity(
+                task_name=task_name,
+                original=request.input_text,
+                translated=target_text,
+                metrics=request.metrics,
+                scoring_mode=request.scoring_mode
+            )
+    except Exception as e:
+        raise SimilarityEvaluationError(str(e), target_text) from e
+
+    return target_text, result_dict
+
+
+async def _read_segment_chunks(reader: UploadReader, queue: asyncio.Queue):
+    """
+    업로드를 읽으면서 문장을 DOCUMENT_CHUNK_SIZE 씩 queue 에 넣습니다. 끝나면 None, 실패하면 예외를 넣습니다.
+    """
+    try:
+        chunk: List[str] = []
+        async for segment in reader.iter_segments():
+            chunk.append(segment)
+            if len(chunk) == DOCUMENT_CHUNK_SIZE:
+                await queue.put(chunk)
+                chunk = []
+        if chunk:
+            await queue.put(chunk)
+        await queue.put(None)
+    except Exception as e:
+        await queue.put(e)
+
+
+async def _stream_and_evaluate(
+    task_name: str,
+    request: TextSimilarityRequest,
+    reader: UploadReader
+) -> Tuple[str, dict]:
+    """
+    문서 모드에서 업로드를 읽는 대로 문장을 DOCUMENT_CHUNK_SIZE 씩 번역/채점합니다.
+    읽기(저장소 업로드 포함)는 별도 task 에서 최대 두 chunk 앞서 진행되므로 채점과 겹치고,
+    문서 전체 원문을 문장 리스트와 텍스트로 함께 들고 있지 않습니다. 진행률은 읽은 바이트 비율입니다.
+    번역 실패는 TranslationError, 평가 실패는 SimilarityEvaluationError, 저장소 업로드 실패는 S3UploadError
+    """
+    scorer = DocumentScorer(task_name, request.metrics)
+
+    async def _score(chunk: List[str]):
+        translations = await perform_segment_translation(request, chunk)
+        try:
+            await scorer.add(chunk, translations, progress=lambda index: int(reader.progress * 100))
+        except Exception as e:
+            raise SimilarityEvaluationError(str(e), scorer.translated_text) from e
+
+    await notify_progress(task_name, 0)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    reading = asyncio.ensure_future(_read_segment_chunks(reader, queue))
+    try:
+        while (chunk := await queue.get()) is not None:
+            if isinstance(chunk, Exception):
+                raise chunk
+            await _score(chunk)
+        if not scorer.count:
+            # 문장이 없는 문서는 빈 원문 하나를 채점
+            await _score([""])
+    finally:
+        reading.cancel()
+        await asyncio.gather(reading, return_exceptions=True)
+
+    try:
+        result_dict = await scorer.finish()
+    except Exception as e:
+        raise SimilarityEvaluationError(str(e), scorer.translated_text) from e
+    logging.info(f"📄 document task {task_name}: {scorer.count} segments streamed from upload")
+    return result_dict["translated_text"], result_dict
+
+
+async def _upload_translation(task_name: str, request: TextSimilarityRequest, target_text: str):
+    output_txt_key = f"text_similarity/{task_name}/{request.input_text_key.split('/')[2]}.txt"
+    await upload_s3_async(output_txt_key, target_text.encode("utf-8"), "text/plain; charset=utf-8")
+
+    request.output_text_key = output_txt_key
+
+
+def build_failure_result(
+    request: TextSimilarityRequest,
+    task_name: str,
+    translated_text: str = ""
+) -> TextSimilarityResult:
+    """
+    번역/채점/업로드에 실패한 작업의 0점 결과
+    """
+    error_result = {
+        "original_text": request.input_text or "",
+        "translated_text": translated_text,
+        "e5_semantic_similarity": 0,
+        "labse_literal_similarity": 0,
+        "bertscore": 0,
+        "comet_score": 0,
+        "execution_time": 0,
+        "description": ""
+    }
+    return build_result(error_result, request, task_name)
+
+
+async def send_failure_result(
+    task_name: str,
+    request: TextSimilarityRequest,
+    error: str,
+    translated_text: str = ""
 ):
+    """
+    실패한 작업을 WebSocket 으로 알리고 0점 결과를 Spring 에 전송합니다.
+    """
+    manager.track_task(task_name, request.total_project_id)
+    await notify_progress(task_name, -1, error=error)
+    return await send_result_to_be(build_failure_result(request, task_name, translated_text))
+
+
+async def run_text_similarity(
+    task_name: str,
+    request: TextSimilarityRequest,
+    reader: Optional[UploadReader] = None
+):
+    """
+    번역 → 유사도 평가 → 결과 전송.
+    reader 가 있으면(문서 모드 업로드) 업로드를 읽으면서 저장소에 올리고, 읽은 문장부터 번역/채점합니다.
+    """
     logging.info(f"🔄 starting text-similarity task: {task_name}")
+    manager.track_task(task_name, request.total_project_id)
+    started = time.time()
 
-    # 1) 번역
-    try:
-        target_text = request.output_text or _perform_translation(request)
+    def _forget_unstored_input():
+        # 끝까지 저장되지 않은 업로드 파일의 URL 은 결과에 넣지 않음
+        if reader is not None and not reader.stored:
+            request.input_text_key = ""
 
-        output_txt_key = f"text_similarity/{task_name}/{request.input_text_key.split('/')[2]}.txt"
-        upload_s3(output_txt_key, target_text.encode("utf-8"), "text/plain; charset=utf-8")
+    # 1) 번역 + 2) 유사도 평가 (같은 입력은 캐시/진행 중인 계산 결과 재사용)
+    try:
+        (target_text, result_dict), source = await result_cache.get_or_compute(
+            make_result_key(request),
+            lambda: (
+                _stream_and_evaluate(task_name, request, reader) if reader is not None
+                else _translate_and_evaluate(task_name, request)
+            ),
+            should_cache=lambda value: bool(value[1]),
+            refresh=request.fresh
+        )
+        if reader is not None and not reader.stored:
+            # 다른 작업의 결과를 재사용해도 업로드 파일은 이 작업의 key 로 저장
+            await reader.drain()
 
-        request.output_text_key = output_txt_key
+    except S3UploadError as e:
+        logging.error(f"❌ input upload failed for {task_name}: {e}")
+        _forget_unstored_input()
+        logging.info("⏹ run_text_similarity exited after upload error")
+        return await send_failure_result(task_name, request, "Input upload error")
 
     except TranslationError as e:
         logging.error(f"❌ translation failed for {task_name}: {e}")
-        from app.web_socket.notifier import notify_progress
-        await notify_progress(task_name, -1, error=str(e))
+        _forget_unstored_input()
         logging.info("⏹ run_text_similarity exited after translation error")
+        return await send_failure_result(task_name, request, str(e), request.output_text or "")
 
-        empty_result = {
-            "original_text": request.input_text,
-            "translated_text": request.output_text or "",
-            "e5_semantic_similarity": 0,
-            "labse_literal_similarity": 0,
-            "bertscore": 0,
-            "comet_score": 0,
-            "execution_time": 0,
-            "description": ""
-        }
-        dto = _build_result(empty_result, request, task_name)
-        return send_result_to_be(dto)
-
-    # 2) 유사도 평가
-    try:
-        result_dict = await evaluate_dual_similarity(
-            task_name=task_name,
-            original=request.input_text,
-            translated=target_text
-        )
-    except Exception as e:
+    except SimilarityEvaluationError as e:
         logging.error(f"❌ similarity evaluation failed for {task_name}: {e}")
-        from app.web_socket.notifier import notify_progress
-        await notify_progress(task_name, -1, error="Similarity evaluation error")
+        # 번역문 업로드가 실패해도 실패 결과는 항상 알림/전송
+        try:
+            await _upload_translation(task_name, request, e.target_text)
+        except Exception as upload_error:
+            logging.error(f"❌ translation upload failed for {task_name}: {upload_error}")
+        _forget_unstored_input()
         logging.info("⏹ run_text_similarity exited after similarity error")
+        return await send_failure_result(task_name, request, "Similarity evaluation error", e.target_text)
+
+    if request.input_text is None:
+        request.input_text = result_dict["original_text"]
+    if source != "computed":
+        logging.info(f"♻️ reused {source} similarity result for task: {task_name}")
+        result_dict = {**result_dict, "execution_time": round(time.time() - started, 2)}
+        await notify_progress(task_name, 100)
 
-        error_result = {
-            "original_text": request.input_text,
-            "translated_text": target_text,
-            "e5_semantic_similarity": 0,
-            "labse_literal_similarity": 0,
-            "bertscore": 0,
-            "comet_score": 0,
-            "execution_time": 0,
-            "description": ""
-        }
-        dto = _build_result(error_result, request, task_name)
-        return send_result_to_be(dto)
+    await _upload_translation(task_name, request, target_text)
 
     # 3) 결과 전송
     logging.info(f"✅ completed text-similarity task: {task_name}")
-    dto = _build_result(result_dict, request, task_name)
-    return send_result_to_be(dto)
\ No newline at end of file
+    dto = build_result(result_dict, request, task_name)
+    return await send_result_to_be(dto)
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+from app.service.result_cache import normalize_text
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+TRANSLATION_CACHE_ENABLED = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
+# worker 프로세스들이 같은 파일을 공유 (WAL 모드)
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "/tmp/text_similarity_cache/translations.sqlite3")
+TRANSLATION_CACHE_TTL_SECONDS = float(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+TRANSLATION_CACHE_MAX_MB = float(os.getenv("TRANSLATION_CACHE_MAX_MB", "256"))
+# 이 횟수만큼 저장할 때마다 만료/용량 초과 항목 정리
+TRANSLATION_CACHE_EVICT_EVERY = int(os.getenv("TRANSLATION_CACHE_EVICT_EVERY", "200"))
+
+# SQLite 변수 개수 제한보다 작게 나눠서 조회
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    translation TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS translations_accessed_at ON translations (accessed_at);
+"""
+
+
+def make_translation_key(engine: str, version: str, src_lang: str, tgt_lang: str, text: str) -> str:
+    """
+    (번역 엔진, 모델/프롬프트 버전, 언어쌍, 정규화된 원문) 기준 캐시 키
+    """
+    parts = [engine, version, src_lang, tgt_lang, normalize_text(text)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    SQLite 기반 번역 결과 캐시 (TTL + 용량 초과 시 오래 안 쓴 항목부터 삭제).
+    DB 접근은 전용 스레드에서 실행하고, 오류가 나면 캐시 미스로 취급해 번역은 계속 진행합니다.
+    조회와 저장은 두 스레드에서 동시에 실행되므로 저장 횟수 집계와 정리는 lock 으로 한 번에 하나만 합니다.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int, evict_every: int, enabled: bool = True):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.evict_every = max(1, evict_every)
+        self.enabled = enabled and ttl_seconds > 0 and max_bytes > 0
+
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="translation-cache")
+        self._evict_lock = threading.Lock()
+        self._writes_since_evict = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        conn = self._connect()
+        now = time.time()
+        found: Dict[str, str] = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), _LOOKUP_CHUNK):
+            chunk = unique[i:i + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, translation FROM translations WHERE key IN ({placeholders}) AND expires_at > ?",
+                (*chunk, now)
+            ).fetchall()
+            found.update(rows)
+        if found:
+            hit_keys = list(found)
+            for i in range(0, len(hit_keys), _LOOKUP_CHUNK):
+                chunk = hit_keys[i:i + _LOOKUP_CHUNK]
+                conn.execute(
+                    f"UPDATE translations SET accessed_at = ? WHERE key IN ({','.join('?' * len(chunk))})",
+                    (now, *chunk)
+                )
+        return found
+
+    def _put_many(self, items: Sequence[Tuple[str, str]]):
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, translation, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, translation, len(key) + len(translation.encode("utf-8")), now + self.ttl_seconds, now)
+                    for key, translation in items
+                ]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._evict_lock:
+            self._writes_since_evict += len(items)
+            if self._writes_since_evict >= self.evict_every:
+                self._writes_since_evict = 0
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """
+        만료된 항목을 지우고, 총 크기가 max_bytes 를 넘으면 마지막 사용 시각이 오래된 순서로 삭제.
+        다른 worker 프로세스의 저장과 섞이지 않도록 한 트랜잭션에서 실행합니다.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = conn.execute("DELETE FROM translations WHERE expires_at <= ?", (time.time(),)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                rows = conn.execute("SELECT key, size FROM translations ORDER BY accessed_at").fetchall()
+                victims: List[str] = []
+                for key, size in rows:
+                    if excess <= 0:
+                        break
+                    victims.append(key)
+                    excess -= size
+                for i in range(0, len(victims), _LOOKUP_CHUNK):
+                    chunk = victims[i:i + _LOOKUP_CHUNK]
+                    conn.execute(f"DELETE FROM translations WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                removed += len(victims)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if removed:
+            self.evicted += removed
+            logging.info(f"🧹 translation cache evicted {removed} entries")
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        """
+        캐시에 있는 키만 {키: 번역문} 으로 반환
+        """
+        if not self.enabled or not keys:
+            return {}
+        try:
+            found = await asyncio.get_running_loop().run_in_executor(self._executor, self._get_many, keys)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logging.warning(f"⚠️ translation cache lookup failed: {e}")
+            return {}
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    async def get(self, key: str) -> Optional[str]:
+        return (await self.get_many([key])).get(key)
+
+    async def put_many(self, items: Sequence[Tuple[str, str]]):
+        if not self.enabled or not items:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._put_many, items)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logging.warning(f"⚠️ translation cache write failed: {e}")
+            return
+        self.writes += len(items)
+
+    async def put(self, key: str, translation: str):
+        await self.put_many([(key, translation)])
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "ttl_seconds": self.ttl_seconds,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evicted": self.evicted,
+            "errors": self.errors,
+        }
+
+
+translation_cache = TranslationCache(
+    path=TRANSLATION_CACHE_PATH,
+    ttl_seconds=TRANSLATION_CACHE_TTL_SECONDS,
+    max_bytes=int(TRANSLATION_CACHE_MAX_MB * 1024 * 1024),
+    evict_every=TRANSLATION_CACHE_EVICT_EVERY,
+    enabled=TRANSLATION_CACHE_ENABLED,
+)
@@ -4,4 +4,16 @@ class S3UploadError(Exception):
 
 class TranslationError(Exception):
     """번역 API 호출 실패 시 던지는 예외"""
-    pass
\ No newline at end of file
+    pass
+
+class SimilarityEvaluationError(Exception):
+    """유사도 평가 실패 시 던지는 예외 (이미 만들어진 번역문을 함께 전달)"""
+    def __init__(self, message: str, target_text: str):
+        super().__init__(message)
+        self.target_text = target_text
+
+class QueueFullError(Exception):
+    """작업 대기열이 가득 찼을 때 던지는 예외 (재시도까지 권장 대기 시간을 함께 전달)"""
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,115 @@
+import codecs
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import AsyncIterator
+
+from dotenv import load_dotenv
+from fastapi import UploadFile
+
+from app.util.s3 import UploadStream
+from app.util.segmenter import SentenceStream
+
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+# 업로드 파일을 한 번에 읽는 크기
+INGEST_CHUNK_SIZE_KB = int(os.getenv("INGEST_CHUNK_SIZE_KB", "1024"))
+
+
+def detach_upload(upload: UploadFile) -> UploadFile:
+    """
+    요청이 끝나면 FastAPI 가 업로드 파일을 닫으므로, 임시 파일을 새 UploadFile 로 옮겨 대기열의 task 가 읽을 수 있게 합니다.
+    원래 UploadFile 에는 빈 파일을 남기며, 넘겨받은 쪽에서 close 해야 합니다.
+    """
+    detached = UploadFile(upload.file, size=upload.size, filename=upload.filename, headers=upload.headers)
+    upload.file = io.BytesIO()
+    return detached
+
+
+async def inspect_upload(upload: UploadFile) -> str:
+    """
+    업로드 파일을 청크 단위로 한 번 읽어 UTF-8 인지 확인하고 내용의 sha256 을 반환한 뒤 처음으로 되돌립니다.
+    잘못된 UTF-8 이면 UnicodeDecodeError
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    digest = hashlib.sha256()
+    while chunk := await upload.read(INGEST_CHUNK_SIZE_KB * 1024):
+        decoder.decode(chunk)
+        digest.update(chunk)
+    decoder.decode(b"", final=True)
+    await upload.seek(0)
+    return digest.hexdigest()
+
+
+class UploadReader:
+    """
+    업로드 파일을 청크 단위로 읽으면서 저장소로 스트리밍 업로드하고 UTF-8 을 점진적으로 디코딩합니다.
+    텍스트 조각(또는 문장)을 만들어지는 대로 내보내므로 메모리에는 청크 하나와 분할 중인 문장만 남습니다.
+    저장소 업로드는 끝까지 완료된 뒤에 반복이 끝나고, 실패하면 S3UploadError
+    """
+
+    def __init__(self, upload: UploadFile, key: str):
+        self.upload = upload
+        self.key = key
+        # 지금까지 읽은 바이트 수
+        self.size = 0
+        # 저장소 업로드까지 끝났는지
+        self.stored = False
+
+    @property
+    def progress(self) -> float:
+        """
+        읽은 비율 (0~1). 파일 크기를 모르면 0
+        """
+        if not self.upload.size:
+            return 0.0
+        return min(1.0, self.size / self.upload.size)
+
+    async def iter_text(self) -> AsyncIterator[str]:
+        """
+        디코딩한 텍스트 조각을 차례로 내보냅니다. 잘못된 UTF-8 이면 UnicodeDecodeError
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        stream = UploadStream(self.key, self.upload.content_type)
+        try:
+            while chunk := await self.upload.read(INGEST_CHUNK_SIZE_KB * 1024):
+                self.size += len(chunk)
+                await stream.write(chunk)
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+        except BaseException:
+            await stream.abort()
+            raise
+        # 마지막 part 업로드/완료까지 기다려서 key 가 가리키는 객체가 있을 때만 끝남
+        await stream.close()
+        self.stored = True
+
+    async def iter_segments(self) -> AsyncIterator[str]:
+        """
+        완성된 문장부터 차례로 내보냅니다. 결과는 전체 텍스트에 split_sentences 를 적용한 것과 같습니다.
+        """
+        sentences = SentenceStream()
+        async for text in self.iter_text():
+            for segment in sentences.feed(text):
+                yield segment
+        for segment in sentences.close():
+            yield segment
+
+    async def read_text(self) -> str:
+        """
+        전체 텍스트가 필요한 호출자용 (단일 쌍 채점, 비교용 출력 텍스트 등)
+        """
+        return "".join([text async for text in self.iter_text()])
+
+    async def drain(self):
+        """
+        내용은 쓰지 않고 저장소 업로드만 끝냅니다.
+        """
+        async for _ in self.iter_text():
+            pass
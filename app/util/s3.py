@@ -1,10 +1,20 @@
+import asyncio
+import io
 import logging
 import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, List, Optional, Set
+from urllib.parse import quote, quote_plus
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from dotenv import load_dotenv
 
+from app.core.metrics import storage_upload_seconds
 from app.util.exception import S3UploadError
 
 env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
@@ -14,23 +24,250 @@ load_dotenv(dotenv_path=env_path)
 AWS_REGION = os.getenv('AWS_DEFAULT_REGION', "ap-northeast-2")
 S3_BUCKET = os.getenv('S3_BUCKET')
 
-s3_client = boto3.client(
-    "s3",
-    region_name="ap-northeast-2"
-)
+# s3 | local
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "s3")
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "/tmp/text_similarity_storage")
+# 비어 있으면 file:// URL 반환
+LOCAL_STORAGE_BASE_URL = os.getenv("LOCAL_STORAGE_BASE_URL", "")
+# 이 크기 이상이면 multipart 업로드
+S3_MULTIPART_THRESHOLD_MB = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8"))
+STORAGE_UPLOAD_WORKERS = int(os.getenv("STORAGE_UPLOAD_WORKERS", "4"))
 
 
-def make_public_url(key: str) -> str:
-    # 1) 버킷의 리전 가져오기
-    loc = s3_client.get_bucket_location(Bucket=S3_BUCKET)['LocationConstraint']
-    # us-east-1 은 URL에 region 부분이 생략됩니다
-    if loc is None or loc == 'us-east-1':
-        endpoint = f"https://{S3_BUCKET}.s3.amazonaws.com"
-    else:
-        endpoint = f"https://{S3_BUCKET}.s3.{loc}.amazonaws.com"
-    # 2) key 부분 URL 인코딩
-    from urllib.parse import quote_plus
-    return f"{endpoint}/{quote_plus(key)}"
+class Storage(ABC):
+    """
+    업로드/공개 URL 생성 인터페이스
+    """
+
+    @abstractmethod
+    def upload(self, key: str, body: bytes, content_type: str):
+        ...
+
+    @abstractmethod
+    def open_stream(self, key: str, content_type: str) -> "StreamWriter":
+        ...
+
+    @abstractmethod
+    def public_url(self, key: str) -> str:
+        ...
+
+
+class StreamWriter(ABC):
+    """
+    청크를 순서대로 받아 저장하는 writer. 메서드는 blocking 이므로 I/O 스레드에서 호출합니다.
+    """
+
+    @abstractmethod
+    def write(self, data: bytes):
+        ...
+
+    @abstractmethod
+    def close(self):
+        ...
+
+    @abstractmethod
+    def abort(self):
+        ...
+
+
+class _S3StreamWriter(StreamWriter):
+    """
+    part 크기만큼 모이면 multipart 로 올리고, 전체가 part 하나보다 작으면 put_object 한 번으로 저장
+    """
+
+    def __init__(self, storage: "S3Storage", key: str, content_type: str):
+        self.storage = storage
+        self.key = key
+        self.content_type = content_type
+        # S3 multipart 의 마지막 part 외에는 최소 5MB
+        self.part_size = max(storage.transfer_config.multipart_chunksize, 5 * 1024 * 1024)
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[dict] = []
+
+    def _upload_part(self, body: bytes):
+        client = self.storage.client
+        if self._upload_id is None:
+            self._upload_id = client.create_multipart_upload(
+                Bucket=self.storage.bucket, Key=self.key, ContentType=self.content_type
+            )["UploadId"]
+        part_number = len(self._parts) + 1
+        response = client.upload_part(
+            Bucket=self.storage.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    def write(self, data: bytes):
+        self._buffer += data
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+
+    def close(self):
+        if self._upload_id is None:
+            self.storage.client.put_object(
+                Bucket=self.storage.bucket,
+                Key=self.key,
+                Body=bytes(self._buffer),
+                ContentType=self.content_type,
+            )
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self.storage.client.complete_multipart_upload(
+                Bucket=self.storage.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer = bytearray()
+
+    def abort(self):
+        self._buffer = bytearray()
+        if self._upload_id is not None:
+            self.storage.client.abort_multipart_upload(
+                Bucket=self.storage.bucket, Key=self.key, UploadId=self._upload_id
+            )
+            self._upload_id = None
+
+
+class _LocalStreamWriter(StreamWriter):
+    def __init__(self, path: Path):
+        self.path = path
+        self.tmp = path.with_name(path.name + ".part")
+        self._file = None
+
+    def write(self, data: bytes):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.tmp, "wb")
+        self._file.write(data)
+
+    def close(self):
+        if self._file is None:
+            self.write(b"")
+        self._file.close()
+        self.tmp.replace(self.path)
+
+    def abort(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.tmp.unlink(missing_ok=True)
+
+
+class S3Storage(Storage):
+    """
+    S3 저장소. 버킷 리전/endpoint 는 처음 한 번만 조회해서 캐시합니다.
+    """
+
+    def __init__(self, bucket: str, region: str, multipart_threshold: int):
+        self.bucket = bucket
+        self.region = region
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_threshold,
+        )
+        self._client = None
+        self._endpoint: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = boto3.client("s3", region_name=self.region)
+        return self._client
+
+    @property
+    def endpoint(self) -> str:
+        if self._endpoint is None:
+            # 1) 버킷의 리전 가져오기
+            loc = self.client.get_bucket_location(Bucket=self.bucket)['LocationConstraint']
+            # us-east-1 은 URL에 region 부분이 생략됩니다
+            if loc is None or loc == 'us-east-1':
+                self._endpoint = f"https://{self.bucket}.s3.amazonaws.com"
+            else:
+                self._endpoint = f"https://{self.bucket}.s3.{loc}.amazonaws.com"
+        return self._endpoint
+
+    def upload(self, key: str, body: bytes, content_type: str):
+        if len(body) >= self.transfer_config.multipart_threshold:
+            self.client.upload_fileobj(
+                io.BytesIO(body),
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": content_type},
+                Config=self.transfer_config,
+            )
+        else:
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=body,
+                ContentType=content_type,
+            )
+
+    def open_stream(self, key: str, content_type: str) -> StreamWriter:
+        return _S3StreamWriter(self, key, content_type)
+
+    def public_url(self, key: str) -> str:
+        # 2) key 부분 URL 인코딩
+        return f"{self.endpoint}/{quote_plus(key)}"
+
+
+class LocalStorage(Storage):
+    """
+    로컬 파일시스템 저장소 (오프라인 테스트/벤치마크용)
+    """
+
+    def __init__(self, root: str, base_url: str = ""):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"invalid storage key: {key}")
+        return path
+
+    def upload(self, key: str, body: bytes, content_type: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".part")
+        tmp.write_bytes(body)
+        tmp.replace(path)
+
+    def open_stream(self, key: str, content_type: str) -> StreamWriter:
+        return _LocalStreamWriter(self._path(key))
+
+    def public_url(self, key: str) -> str:
+        if self.base_url:
+            return f"{self.base_url}/{quote(key)}"
+        return self._path(key).as_uri()
+
+
+if STORAGE_BACKEND == "local":
+    storage: Storage = LocalStorage(LOCAL_STORAGE_DIR, LOCAL_STORAGE_BASE_URL)
+elif STORAGE_BACKEND == "s3":
+    storage = S3Storage(S3_BUCKET, AWS_REGION, S3_MULTIPART_THRESHOLD_MB * 1024 * 1024)
+else:
+    raise ValueError(f"Unsupported STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+_upload_pool: Optional[ThreadPoolExecutor] = None
+_background_uploads: Set[asyncio.Task] = set()
+
+
+def make_public_url(key: Optional[str]) -> str:
+    # 번역 실패 결과처럼 업로드된 파일이 없으면 빈 문자열
+    if not key:
+        return ""
+    return storage.public_url(key)
 
 
 def upload_s3(
@@ -39,12 +276,93 @@ def upload_s3(
     content_type: str,
 ):
     try:
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=key,
-            Body=body,
-            ContentType=content_type,
-        )
+        with storage_upload_seconds.time(backend=STORAGE_BACKEND):
+            storage.upload(key, body, content_type)
     except Exception as e:
         logging.error(f"S3 upload error: {e}")
-        raise S3UploadError(f"S3 upload error: {e}")
\ No newline at end of file
+        raise S3UploadError(f"S3 upload error: {e}")
+
+
+def _get_upload_pool() -> ThreadPoolExecutor:
+    global _upload_pool
+    if _upload_pool is None:
+        _upload_pool = ThreadPoolExecutor(max_workers=STORAGE_UPLOAD_WORKERS, thread_name_prefix="storage")
+    return _upload_pool
+
+
+async def upload_s3_async(key: str, body: bytes, content_type: str):
+    """
+    업로드를 전용 I/O 스레드 풀에서 실행합니다. 실패 시 S3UploadError
+    """
+    await asyncio.get_running_loop().run_in_executor(_get_upload_pool(), upload_s3, key, body, content_type)
+
+
+def _background_upload_done(task: asyncio.Task):
+    _background_uploads.discard(task)
+    # 작업이 대기열에 들어가지 못해 아무도 기다리지 않는 경우에도 예외 경고가 남지 않도록 확인
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"❌ background upload failed: {task.exception()}")
+
+
+def upload_s3_background(key: str, body: bytes, content_type: str) -> asyncio.Task:
+    """
+    업로드를 백그라운드 task 로 시작하고 바로 반환합니다.
+    결과를 쓰기 전에 반환된 task 를 await 해서 완료를 확인해야 하며, 실패 시 S3UploadError
+    """
+    task = asyncio.get_running_loop().create_task(upload_s3_async(key, body, content_type))
+    _background_uploads.add(task)
+    task.add_done_callback(_background_upload_done)
+    return task
+
+
+class UploadStream:
+    """
+    청크 단위 스트리밍 업로드. 직전 청크의 기록이 끝날 때까지만 기다리므로
+    읽기와 업로드가 겹쳐서 진행되고, 메모리에는 청크 하나와 S3 part 하나만 남습니다.
+    실패 시 S3UploadError
+    """
+
+    def __init__(self, key: str, content_type: str):
+        self.key = key
+        self.size = 0
+        self._writer = storage.open_stream(key, content_type)
+        self._pending: Optional[asyncio.Future] = None
+        self._started = time.perf_counter()
+
+    async def _call(self, fn: Callable, *args):
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_get_upload_pool(), fn, *args)
+        except Exception as e:
+            logging.error(f"S3 upload error: {e}")
+            raise S3UploadError(f"S3 upload error: {e}")
+
+    async def _wait_pending(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            await pending
+
+    async def write(self, data: bytes):
+        await self._wait_pending()
+        self.size += len(data)
+        self._pending = asyncio.ensure_future(self._call(self._writer.write, data))
+
+    async def close(self):
+        try:
+            await self._wait_pending()
+            await self._call(self._writer.close)
+        except S3UploadError:
+            storage_upload_seconds.observe(time.perf_counter() - self._started, backend=STORAGE_BACKEND, outcome="error")
+            await self.abort()
+            raise
+        storage_upload_seconds.observe(time.perf_counter() - self._started, backend=STORAGE_BACKEND, outcome="ok")
+
+    async def abort(self):
+        if self._pending is not None:
+            try:
+                await self._wait_pending()
+            except S3UploadError:
+                pass
+        try:
+            await self._call(self._writer.abort)
+        except S3UploadError:
+            logging.error(f"❌ failed to abort upload: {self.key}")
@@ -0,0 +1,162 @@
+import re
+from typing import Iterable, List, Optional
+
+# 마침표류 뒤 공백, 또는 공백 없이 쓰는 CJK/힌디어 종결 부호 뒤에서 문장을 나눕니다.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|(?<=[。！？।])")
+
+DEFAULT_MAX_SEGMENT_CHARS = 400
+
+
+def _pack_words(words: Iterable[str], max_chars: int, pieces: List[str], current: str = "") -> str:
+    """
+    단어들을 max_chars 이하 조각으로 이어 붙입니다. 다 채운 조각은 pieces 에 추가하고 채우는 중인 조각을 반환합니다.
+    """
+    for word in words:
+        while len(word) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    return current
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """
+    구두점 없이 너무 긴 문장은 공백 기준으로 max_chars 이하 조각으로 나눕니다.
+    """
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces: List[str] = []
+    current = _pack_words(sentence.split(" "), max_chars, pieces)
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sentences(text: str, max_chars: int = DEFAULT_MAX_SEGMENT_CHARS) -> List[str]:
+    """
+    텍스트를 줄/문장 단위 segment 리스트로 분할합니다. 빈 segment 는 제외합니다.
+    """
+    segments: List[str] = []
+    # 줄 경계는 정규식 대신 str.split 으로 나눔 (\s*\n\s* 는 긴 공백에서 역추적으로 O(n²))
+    for line in text.split("\n"):
+        for sentence in _SENTENCE_BOUNDARY.split(line.strip()):
+            sentence = sentence.strip()
+            if sentence:
+                segments.extend(_split_long(sentence, max_chars))
+    return segments
+
+
+class SentenceStream:
+    """
+    텍스트 조각을 받아 확정된 segment 부터 분할합니다.
+    줄바꿈, 뒤에 글자가 이어진 문장 경계, max_chars 를 넘는 긴 문장의 다 채운 조각은 바로 내보내므로
+    줄바꿈 없는 큰 입력도 남겨두는 텍스트가 커지지 않습니다.
+    결과는 전체 텍스트에 split_sentences 를 적용한 것과 같습니다.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_SEGMENT_CHARS):
+        self.max_chars = max_chars
+        # 아직 끝나지 않은 줄의 텍스트 (문자열을 이어 붙이지 않고 조각 리스트로 보관)
+        self._chunks: List[str] = []
+        self._size = 0
+        self._compact_at = 4 * max_chars
+        # 긴 문장을 조각내는 중이면 _pack_words 의 채우는 중인 조각 (None 이면 남은 텍스트가 문장 시작)
+        self._current: Optional[str] = None
+
+    def feed(self, text: str) -> List[str]:
+        segments: List[str] = []
+        cut = text.rfind("\n")
+        if cut >= 0:
+            self._chunks.append(text[:cut])
+            lines = "".join(self._chunks)
+            first = lines.find("\n")
+            if first < 0:
+                first = len(lines)
+            segments.extend(self._drain(lines[:first], line_end=True))
+            segments.extend(split_sentences(lines[first + 1:], self.max_chars))
+            text = text[cut + 1:]
+            self._compact_at = 4 * self.max_chars
+        if text:
+            self._chunks.append(text)
+            self._size += len(text)
+        if self._size > self._compact_at:
+            segments.extend(self._drain("".join(self._chunks), line_end=False))
+            # 남은 텍스트가 줄지 않는 입력(긴 공백 등)에서도 다시 합치는 비용이 선형이 되도록 기준을 늘림
+            self._compact_at = max(4 * self.max_chars, 2 * self._size)
+        return segments
+
+    def close(self) -> List[str]:
+        return self._drain("".join(self._chunks), line_end=True)
+
+    def _drain(self, buffer: str, line_end: bool) -> List[str]:
+        """
+        줄 안의 텍스트에서 확정된 segment 를 분할합니다. line_end 가 아니면 이어질 수 있는 부분은 남겨둡니다.
+        """
+        segments: List[str] = []
+        if self._current is not None:
+            # 조각내던 긴 문장은 첫 문장 경계(줄이 끝났으면 텍스트 끝)에서 끝남
+            match = _SENTENCE_BOUNDARY.search(buffer)
+            if match is not None and not line_end and match.end() == len(buffer):
+                match = None
+            if match is not None or line_end:
+                tail = buffer[:match.start() if match else len(buffer)].rstrip()
+                current = _pack_words(tail.split(" ") if tail else [], self.max_chars, segments, self._current)
+                if current:
+                    segments.append(current)
+                self._current = None
+                buffer = buffer[match.end():] if match else ""
+
+        if self._current is None:
+            if line_end:
+                segments.extend(split_sentences(buffer, self.max_chars))
+                buffer = ""
+            else:
+                # 뒤에 글자가 이어진 경계까지는 확정 (끝의 공백은 다음 조각과 이어질 수 있음)
+                last = None
+                for match in _SENTENCE_BOUNDARY.finditer(buffer):
+                    if match.end() < len(buffer):
+                        last = match
+                if last is not None:
+                    segments.extend(split_sentences(buffer[:last.end()], self.max_chars))
+                    buffer = buffer[last.end():]
+                buffer = buffer.lstrip()
+
+        if not line_end:
+            buffer = self._pack_long(buffer, segments)
+        self._chunks = [buffer] if buffer else []
+        self._size = len(buffer)
+        return segments
+
+    def _pack_long(self, text: str, segments: List[str]) -> str:
+        """
+        끝나지 않은 문장이 max_chars 를 넘으면 _split_long 과 같은 방식으로 다 채운 조각을 내보내고,
+        다음 텍스트와 이어질 수 있는 마지막 단어부터 남깁니다.
+        """
+        content = len(text.rstrip())
+        if self._current is None and content <= self.max_chars:
+            return text
+
+        current = self._current or ""
+        space = text.rfind(" ", 0, content)
+        if space >= 0:
+            current = _pack_words(text[:space].split(" "), self.max_chars, segments, current)
+            text = text[space + 1:]
+            content -= space + 1
+        # 공백 없이 긴 단어는 max_chars 씩 자르고, 다음 글자와 이어질 수 있는 끝부분만 남김
+        if content > self.max_chars:
+            if current:
+                segments.append(current)
+                current = ""
+            whole = (content - 1) // self.max_chars * self.max_chars
+            segments.extend(text[i:i + self.max_chars] for i in range(0, whole, self.max_chars))
+            text = text[whole:]
+        self._current = current
+        return text
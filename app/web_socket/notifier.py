@@ -1,52 +1,288 @@
 import json
-from typing import Optional, List
+import logging
+import os
+from collections import OrderedDict
+from itertools import count
+from pathlib import Path
+from typing import Dict, Iterable, Optional, List, Set, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
+from dotenv import load_dotenv
 import asyncio
 
+env_path = (Path(__file__).resolve().parents[1] / "config" / ".env")
+load_dotenv(dotenv_path=env_path)
+
+# 연결 하나당 보내지 못하고 쌓아 둘 수 있는 최대 메시지 수. 넘으면 느린 연결로 보고 끊음
+WS_QUEUE_MAX = int(os.getenv("WS_QUEUE_MAX", "256"))
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+# 구독 정보가 없는 (기존) 클라이언트에게 모든 task 의 진행률을 보낼지 여부.
+# segment 메시지는 합쳐지지 않아 대기열이 금방 차므로 구독한 클라이언트에게만 보냄
+WS_BROADCAST_UNSUBSCRIBED = os.getenv("WS_BROADCAST_UNSUBSCRIBED", "true").lower() == "true"
+
+
+class Connection:
+    """
+    WebSocket 하나의 구독 정보 + 전송 대기열.
+    같은 task 의 진행률 메시지는 대기열에서 최신 것 하나로 합쳐집니다(segment 메시지는 합치지 않음).
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.task_names: Set[str] = set()
+        self.project_ids: Set[int] = set()
+        self._pending: "OrderedDict[Tuple[str, object], str]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._sender: Optional[asyncio.Task] = None
+        self.closed = False
+        self.coalesced = 0
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self.task_names or self.project_ids)
+
+    def enqueue(self, key: Tuple[str, object], data: str) -> bool:
+        """
+        전송 대기열에 넣습니다. 대기열이 가득 차면 False
+        """
+        if key in self._pending:
+            # 최신 진행률이 앞서 쌓인 segment 메시지보다 먼저 나가지 않도록 뒤로 이동
+            self._pending[key] = data
+            self._pending.move_to_end(key)
+            self.coalesced += 1
+            return True
+        if len(self._pending) >= WS_QUEUE_MAX:
+            return False
+        self._pending[key] = data
+        self._ready.set()
+        return True
+
+    async def _send_loop(self, on_dead):
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._pending:
+                    _, data = self._pending.popitem(last=False)
+                    await asyncio.wait_for(self.websocket.send_text(data), WS_SEND_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.info(f"🔌 websocket send failed, dropping connection: {e!r}")
+            await on_dead(self)
+
+    def start(self, on_dead):
+        self._sender = asyncio.get_running_loop().create_task(self._send_loop(on_dead))
+
+    async def close(self, code: int = 1000):
+        if self.closed:
+            return
+        self.closed = True
+        if self._sender is not None and self._sender is not asyncio.current_task():
+            self._sender.cancel()
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+
 class ConnectionManager:
+    """
+    task_name / project 별 구독자 인덱스를 유지하고, 메시지를 구독자 대기열에만 넣습니다.
+    실제 전송은 연결마다 별도 sender task 가 동시에 수행하므로 느린 연결이 다른 연결을 막지 않습니다.
+    """
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Dict[WebSocket, Connection] = {}
+        self._by_task: Dict[str, Set[Connection]] = {}
+        self._by_project: Dict[int, Set[Connection]] = {}
+        self._unsubscribed: Set[Connection] = set()
+        # task_name -> total_project_id (project 구독자에게 라우팅하기 위함)
+        self._task_projects: Dict[str, int] = {}
+        self._segment_seq = count()
+
+        self.sent_messages = 0
+        self.dropped_connections = 0
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(
+        self,
+        websocket: WebSocket,
+        task_names: Iterable[str] = (),
+        project_ids: Iterable[int] = ()
+    ) -> Connection:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        conn = Connection(websocket)
+        self.active_connections[websocket] = conn
+        self._unsubscribed.add(conn)
+        self.subscribe(conn, task_names, project_ids)
+        conn.start(self._drop)
+        return conn
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        conn = self.active_connections.pop(websocket, None)
+        if conn is None:
+            return
+        self._unsubscribed.discard(conn)
+        self.unsubscribe(conn, list(conn.task_names), list(conn.project_ids))
+        asyncio.get_running_loop().create_task(conn.close())
+
+    async def _drop(self, conn: Connection, code: int = 1011):
+        if conn.websocket in self.active_connections:
+            self.dropped_connections += 1
+        self.disconnect(conn.websocket)
+        await conn.close(code)
+
+    def subscribe(self, conn: Connection, task_names: Iterable[str] = (), project_ids: Iterable[int] = ()):
+        for task_name in task_names:
+            conn.task_names.add(task_name)
+            self._by_task.setdefault(task_name, set()).add(conn)
+        for project_id in project_ids:
+            conn.project_ids.add(project_id)
+            self._by_project.setdefault(project_id, set()).add(conn)
+        if conn.subscribed:
+            self._unsubscribed.discard(conn)
+
+    def unsubscribe(self, conn: Connection, task_names: Iterable[str] = (), project_ids: Iterable[int] = ()):
+        for task_name in task_names:
+            conn.task_names.discard(task_name)
+            subscribers = self._by_task.get(task_name)
+            if subscribers is not None:
+                subscribers.discard(conn)
+                if not subscribers:
+                    del self._by_task[task_name]
+        for project_id in project_ids:
+            conn.project_ids.discard(project_id)
+            subscribers = self._by_project.get(project_id)
+            if subscribers is not None:
+                subscribers.discard(conn)
+                if not subscribers:
+                    del self._by_project[project_id]
+
+    def track_task(self, task_name: str, project_id: int):
+        """
+        task 의 진행률을 project 구독자에게도 보내도록 task → project 를 등록
+        """
+        self._task_projects[task_name] = project_id
+
+    def forget_task(self, task_name: str):
+        """
+        끝난 task 의 task → project 등록 해제 (취소/예외로 완료 메시지를 못 보낸 경우 포함)
+        """
+        self._task_projects.pop(task_name, None)
+
+    def _recipients(self, task_name: str, segment: bool = False) -> Set[Connection]:
+        recipients = set(self._by_task.get(task_name, ()))
+        project_id = self._task_projects.get(task_name)
+        if project_id is not None:
+            recipients.update(self._by_project.get(project_id, ()))
+        if WS_BROADCAST_UNSUBSCRIBED and not segment:
+            recipients.update(self._unsubscribed)
+        return recipients
 
     async def broadcast(self, message: dict):
+        """
+        메시지를 task 구독자들의 대기열에 넣습니다 (전송 완료를 기다리지 않음)
+        """
+        task_name = message["task_name"]
+        # segment 메시지는 모두 전달, 진행률만 있는 메시지는 task 별 최신 값으로 합침
+        segment = "segment" in message
+        if segment:
+            key = ("segment", next(self._segment_seq))
+        else:
+            key = ("progress", task_name)
+
         data = json.dumps(message)
-        for ws in list(self.active_connections):
-            try:
-                await ws.send_text(data)
-            except WebSocketDisconnect:
-                self.disconnect(ws)
+        for conn in self._recipients(task_name, segment):
+            if conn.enqueue(key, data):
+                self.sent_messages += 1
+            else:
+                logging.info("🔌 websocket queue overflow, dropping slow connection")
+                await self._drop(conn, code=1013)
+
+        if message.get("status") in ("completed", "failed"):
+            self.forget_task(task_name)
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self.active_connections),
+            "unsubscribed_connections": len(self._unsubscribed),
+            "subscribed_tasks": len(self._by_task),
+            "subscribed_projects": len(self._by_project),
+            "tracked_tasks": len(self._task_projects),
+            "queued_messages": sum(len(conn._pending) for conn in self.active_connections.values()),
+            "messages": self.sent_messages,
+            "coalesced": sum(conn.coalesced for conn in self.active_connections.values()),
+            "dropped_connections": self.dropped_connections,
+        }
 
 manager = ConnectionManager()
 
+
+def _parse_project_ids(values: Iterable) -> List[int]:
+    project_ids = []
+    for value in values:
+        try:
+            project_ids.append(int(value))
+        except (TypeError, ValueError):
+            pass
+    return project_ids
+
+
 async def websocket_endpoint(websocket: WebSocket):
-    # 1) 클라이언트 연결 수락 & 저장
-    await manager.connect(websocket)
+    """
+    /ws?task_name=...&project_id=... 로 구독 대상을 지정합니다(여러 번 지정 가능).
+    연결 후에도 아래 메시지로 구독을 바꿀 수 있습니다.
+    {"action": "subscribe" | "unsubscribe", "task_names": [...], "project_ids": [...]}
+    """
+    params = websocket.query_params
+    # 1) 클라이언트 연결 수락 & 구독 등록
+    conn = await manager.connect(
+        websocket,
+        task_names=params.getlist("task_name"),
+        project_ids=_parse_project_ids(params.getlist("project_id"))
+    )
     try:
-        # 2) 연결 유지 (클라이언트 메시지 무시)
+        # 2) 구독 메시지 수신 (연결 종료도 여기서 감지)
         while True:
-            await asyncio.sleep(1)
-    except WebSocketDisconnect:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+                action = message.get("action")
+                task_names = message.get("task_names") or []
+                if isinstance(task_names, str):
+                    task_names = [task_names]
+                if message.get("task_name"):
+                    task_names.append(message["task_name"])
+                project_ids = message.get("project_ids") or []
+                if not isinstance(project_ids, list):
+                    project_ids = [project_ids]
+                project_ids = _parse_project_ids(project_ids)
+                if message.get("project_id") is not None:
+                    project_ids.extend(_parse_project_ids([message["project_id"]]))
+            except (ValueError, AttributeError):
+                continue
+            if action == "subscribe":
+                manager.subscribe(conn, task_names, project_ids)
+            elif action == "unsubscribe":
+                manager.unsubscribe(conn, task_names, project_ids)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
         manager.disconnect(websocket)
 
 async def notify_progress(
     task_name: str,
     progress: int,
-    error: Optional[str] = None
+    error: Optional[str] = None,
+    segment: Optional[dict] = None
 ):
     """
-    전체 WS 구독자에게 아래 포맷으로 푸시됩니다.
+    task_name 또는 해당 project 를 구독한 WS 클라이언트(진행률은 구독 정보가 없는 클라이언트 포함)에게 아래 포맷으로 푸시됩니다.
     {
       "task_name": "...",
       "progress": 0|25|50|75|100|-1,
       "status": "running"|"completed"|"failed",
-      "error": "..."  # optional
+      "error": "...",  # optional
+      "segment": {"index": 0, "e5": ..., ...}  # optional, 문서 모드 segment 별 점수
     }
     """
     status = (
@@ -61,5 +297,7 @@ async def notify_progress(
     }
     if error:
         payload["error"] = error
+    if segment is not None:
+        payload["segment"] = segment
 
     await manager.broadcast(payload)
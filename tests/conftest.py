@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 저장소 루트를 sys.path 에 넣어서 tests/ 에서 app 패키지를 import 할 수 있게 함
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
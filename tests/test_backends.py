@@ -0,0 +1,67 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from app.core import backends
+
+
+class _FakeSentenceTransformer:
+    """
+    생성 인자만 기록하는 SentenceTransformer
+    """
+    created = []
+
+    def __init__(self, model_id, device="cpu", backend="torch"):
+        self.model_id = model_id
+        self.backend = backend
+        self.created.append((model_id, backend))
+
+    def save(self, path):
+        (Path(path) / "onnx").mkdir(parents=True)
+
+    def encode(self, texts, convert_to_tensor=False):
+        import torch
+        return torch.ones(len(texts), 4)
+
+
+@pytest.fixture
+def fake_st(tmp_path, monkeypatch):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = _FakeSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    monkeypatch.setattr(backends, "ONNX_CACHE_DIR", tmp_path)
+    monkeypatch.setenv("INFERENCE_BACKEND_E5", "onnx")
+    _FakeSentenceTransformer.created = []
+    return _FakeSentenceTransformer.created
+
+
+def test_cached_onnx_model_is_loaded_without_building_eager(fake_st, monkeypatch):
+    monkeypatch.setattr(backends, "INFERENCE_PARITY_CHECK", False)
+    (backends._onnx_path("intfloat/e5") / "onnx").mkdir(parents=True)
+
+    model = backends.load_sentence_transformer("e5", "intfloat/e5")
+
+    assert fake_st == [(str(backends._onnx_path("intfloat/e5")), "onnx")]
+    assert model.backend == "onnx"
+    assert backends.backend_report["e5"] == {"backend": "onnx"}
+
+
+def test_first_onnx_load_exports_without_building_eager(fake_st, monkeypatch):
+    monkeypatch.setattr(backends, "INFERENCE_PARITY_CHECK", False)
+
+    backends.load_sentence_transformer("e5", "intfloat/e5")
+
+    assert fake_st == [("intfloat/e5", "onnx")]
+    assert (backends._onnx_path("intfloat/e5") / "onnx").exists()
+
+
+def test_parity_check_builds_eager_reference(fake_st, monkeypatch):
+    monkeypatch.setattr(backends, "INFERENCE_PARITY_CHECK", True)
+
+    model = backends.load_sentence_transformer("e5", "intfloat/e5")
+
+    assert fake_st == [("intfloat/e5", "torch"), ("intfloat/e5", "onnx")]
+    assert model.backend == "onnx"
+    assert backends.backend_report["e5"]["max_abs_drift"] == 0
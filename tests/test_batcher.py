@@ -0,0 +1,148 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.batcher import MicroBatcher
+
+
+def test_results_follow_submit_order_under_concurrent_submitters():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return [item * 10 for item in items]
+
+    async def main():
+        batcher = MicroBatcher("test", batch_fn, max_batch_size=4, max_wait_ms=2)
+
+        async def submitter(base):
+            results = []
+            for i in range(10):
+                await asyncio.sleep(random.random() / 1000)
+                results.append(await batcher.submit(base + i))
+            return results
+
+        return await asyncio.gather(*(submitter(base) for base in (0, 100, 200, 300)))
+
+    results = asyncio.run(main())
+
+    assert results == [[(base + i) * 10 for i in range(10)] for base in (0, 100, 200, 300)]
+    assert all(len(batch) <= 4 for batch in calls)
+    assert sorted(item for batch in calls for item in batch) == sorted(
+        base + i for base in (0, 100, 200, 300) for i in range(10)
+    )
+
+
+def test_batch_fn_exception_reaches_every_waiter():
+    def batch_fn(items):
+        raise ValueError("model exploded")
+
+    async def main():
+        batcher = MicroBatcher("test", batch_fn, max_batch_size=3, max_wait_ms=50)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert len(results) == 3
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_wrong_result_count_fails_the_whole_batch():
+    async def main():
+        batcher = MicroBatcher("test", lambda items: items[:-1], max_batch_size=2, max_wait_ms=50)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(2)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_partial_batch_is_flushed_by_the_timer():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return items
+
+    async def main():
+        batcher = MicroBatcher("test", batch_fn, max_batch_size=16, max_wait_ms=20)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await asyncio.wait_for(asyncio.gather(batcher.submit("a"), batcher.submit("b")), timeout=1)
+        return results, loop.time() - started, batcher.stats()
+
+    results, elapsed, stats = asyncio.run(main())
+
+    assert results == ["a", "b"]
+    assert calls == [["a", "b"]]
+    assert elapsed >= 0.015
+    assert stats["batches"] == 1 and stats["pending"] == 0
+
+
+def test_full_batch_does_not_wait_for_the_timer():
+    async def main():
+        batcher = MicroBatcher("test", lambda items: items, max_batch_size=2, max_wait_ms=10_000)
+        return await asyncio.wait_for(asyncio.gather(batcher.submit(1), batcher.submit(2)), timeout=1)
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+@pytest.mark.parametrize("count", [5, 17])
+def test_overflow_is_split_into_max_size_batches(count):
+    calls = []
+
+    def batch_fn(items):
+        calls.append(len(items))
+        return items
+
+    async def main():
+        batcher = MicroBatcher("test", batch_fn, max_batch_size=4, max_wait_ms=5)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(count)))
+
+    assert asyncio.run(main()) == list(range(count))
+    assert sum(calls) == count
+    assert max(calls) <= 4
+
+
+def test_one_batch_in_flight_per_batcher():
+    """
+    full window 가 여러 번 와도 같은 모델의 배치가 executor 스레드에서 겹쳐 실행되지 않아야 함
+    """
+    lock = threading.Lock()
+    state = {"running": 0, "max_running": 0}
+
+    class _ThreadExecutor:
+        def __init__(self):
+            self.pool = ThreadPoolExecutor(max_workers=4)
+
+        async def run(self, fn, *args, name=None):
+            return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+    def batch_fn(items):
+        with lock:
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        return [item * 2 for item in items]
+
+    executor = _ThreadExecutor()
+
+    async def main():
+        batcher = MicroBatcher("test", batch_fn, max_batch_size=4, max_wait_ms=1, executor=executor)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(40)))
+        return results, batcher.stats()
+
+    try:
+        results, stats = asyncio.run(main())
+    finally:
+        executor.pool.shutdown()
+
+    assert results == [i * 2 for i in range(40)]
+    assert state["max_running"] == 1
+    assert stats["pending"] == 0 and not stats["running"]
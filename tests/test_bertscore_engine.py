@@ -0,0 +1,114 @@
+import os
+
+import pytest
+import torch
+
+from app.model.similarity.bertscore_engine import BERTScoreEngine
+
+TOLERANCE = 1e-4
+
+PAIRS = [
+    ("The weather is nice today.", "오늘은 날씨가 좋네요."),
+    ("I will be back.", "다시 돌아올게."),
+    ("Here's looking at you, kid.", "Here's looking at you, kid."),
+    ("", "빈 후보 문장"),
+    ("빈 참조 문장", ""),
+    ("Hi", "안녕"),
+    ("a", "a"),
+]
+
+
+def _engine(**overrides) -> BERTScoreEngine:
+    options = dict(max_bytes=64 * 1024 * 1024, encode_batch_size=3, match_batch_size=2)
+    options.update(overrides)
+    return BERTScoreEngine(**options)
+
+
+def _token_stats(length: int, dim: int = 8, generator=None):
+    # BERTScorer 처럼 padding 칸을 0 으로 두고 max 를 취하므로, 실제 문맥 임베딩처럼 코사인이 양수가 되도록 생성
+    embeddings = torch.rand(length, dim, generator=generator)
+    embeddings = embeddings / embeddings.norm(dim=-1, keepdim=True)
+    weights = torch.ones(length)
+    # [CLS]/[SEP] 가중치 0
+    weights[0] = weights[-1] = 0
+    return embeddings, weights
+
+
+def _reference_match(hyp, ref):
+    (hyp_emb, hyp_weight), (ref_emb, ref_weight) = hyp, ref
+    sim = hyp_emb @ ref_emb.T
+    precision = (sim.max(dim=1).values * hyp_weight).sum() / hyp_weight.sum()
+    recall = (sim.max(dim=0).values * ref_weight).sum() / ref_weight.sum()
+    return precision, recall, 2 * precision * recall / (precision + recall)
+
+
+def test_padded_greedy_match_equals_per_pair_matching():
+    generator = torch.Generator().manual_seed(0)
+    lengths = [(3, 9), (12, 4), (5, 5), (3, 3), (20, 7)]
+    hyps = [_token_stats(h, generator=generator) for h, _ in lengths]
+    refs = [_token_stats(r, generator=generator) for _, r in lengths]
+
+    precision, recall, f1 = BERTScoreEngine._greedy_match(hyps, refs)
+
+    for i, (hyp, ref) in enumerate(zip(hyps, refs)):
+        expected = _reference_match(hyp, ref)
+        assert precision[i].item() == pytest.approx(expected[0].item(), abs=1e-6)
+        assert recall[i].item() == pytest.approx(expected[1].item(), abs=1e-6)
+        assert f1[i].item() == pytest.approx(expected[2].item(), abs=1e-6)
+
+
+def test_empty_sentence_scores_zero():
+    generator = torch.Generator().manual_seed(1)
+    empty = _token_stats(2, generator=generator)
+    sentence = _token_stats(6, generator=generator)
+
+    precision, recall, f1 = BERTScoreEngine._greedy_match([empty, sentence], [sentence, empty])
+
+    assert precision[0].item() == 0.0
+    assert recall[1].item() == 0.0
+    assert f1.tolist() == [0.0, 0.0]
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    bert_score = pytest.importorskip("bert_score")
+    model_type = os.getenv("BERTSCORE_TEST_MODEL", "xlm-roberta-base")
+    try:
+        return bert_score.BERTScorer(model_type=model_type, lang="ko", rescale_with_baseline=False, idf=False)
+    except OSError as e:
+        pytest.skip(f"cannot load {model_type}: {e}")
+
+
+def test_scores_match_bert_scorer(scorer):
+    cands = [c for c, _ in PAIRS]
+    refs = [r for _, r in PAIRS]
+    expected = scorer.score(cands, refs, batch_size=len(cands))
+
+    engine = _engine()
+    assert engine.supports(scorer)
+    first = engine.score(scorer, cands, refs)
+    # 두 번째 호출은 캐시된 token 임베딩으로 계산
+    second = engine.score(scorer, cands, refs)
+
+    for actual in (first, second):
+        for value, reference in zip(actual, expected):
+            assert torch.allclose(value, reference, atol=TOLERANCE), (value, reference)
+    assert engine.stats()["hits"] > 0
+
+
+def test_scores_match_bert_scorer_with_baseline_rescale(scorer, monkeypatch):
+    cands = [c for c, _ in PAIRS if c]
+    refs = [r for c, r in PAIRS if c]
+    baseline = torch.tensor([0.8, 0.8, 0.8])
+    # 버전에 따라 baseline_vals 가 _baseline_vals 를 읽는 property
+    if isinstance(getattr(type(scorer), "baseline_vals", None), property):
+        monkeypatch.setattr(scorer, "_baseline_vals", baseline, raising=False)
+    else:
+        monkeypatch.setattr(scorer, "baseline_vals", baseline, raising=False)
+    monkeypatch.setattr(scorer, "rescale_with_baseline", True)
+    expected = scorer.score(cands, refs, batch_size=len(cands))
+
+    actual = _engine().score(scorer, cands, refs)
+
+    for value, reference in zip(actual, expected):
+        assert torch.allclose(value, reference, atol=TOLERANCE), (value, reference)
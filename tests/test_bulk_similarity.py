@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+# bulk_similarity_service 는 app.core.models 를 import 하므로 모델 의존성이 있어야 함
+for _module in ("transformers", "bert_score", "comet", "sentence_transformers"):
+    pytest.importorskip(_module)
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import text_similarity  # noqa: E402
+from app.schema.text_similarity_dto import Language, TextSimilarityRequest, TranslateType  # noqa: E402
+from app.service import bulk_similarity_service as bulk  # noqa: E402
+from app.service.bulk_similarity_service import parse_bulk_rows  # noqa: E402
+from app.service.task_scheduler import TaskScheduler  # noqa: E402
+
+
+def test_csv_rows_with_and_without_header():
+    with_header = "translation,source\n안녕,Hello\n,Bye\n".encode("utf-8-sig")
+    without_header = b"Hello,hi\nBye\n"
+
+    assert parse_bulk_rows(with_header, "rows.csv") == [("Hello", "안녕"), ("Bye", None)]
+    assert parse_bulk_rows(without_header, "rows.CSV") == [("Hello", "hi"), ("Bye", None)]
+
+
+def test_jsonl_rows_accept_key_aliases_and_report_bad_lines():
+    raw = '{"source": "Hello", "translation": "안녕"}\n\n{"src": "Bye", "mt": ""}\n'.encode("utf-8")
+
+    assert parse_bulk_rows(raw, "rows.jsonl") == [("Hello", "안녕"), ("Bye", None)]
+    with pytest.raises(ValueError, match="line 2"):
+        parse_bulk_rows(b'{"source": "a"}\nnot json\n', "rows.jsonl")
+    with pytest.raises(ValueError, match="source is empty"):
+        parse_bulk_rows(b'{"translation": "a"}\n', "rows.jsonl")
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """
+    번역/채점/업로드/전송을 가짜로 바꾸고 호출 기록을 반환합니다.
+    """
+    calls = {"translated": [], "sent": [], "uploaded": []}
+
+    async def translate_segments(request, segments):
+        calls["translated"].append(list(segments))
+        await asyncio.sleep(0.01)
+        return [f"번역:{segment}" for segment in segments]
+
+    async def score_pairs(pairs, metrics=None):
+        if calls.get("fail_scoring"):
+            raise RuntimeError("scorer crashed")
+        return np.array([[0.9, 0.8, 0.9, 0.9, 0.9, 0.6] for _ in pairs], dtype=np.float64)
+
+    async def upload(key, body, content_type):
+        calls["uploaded"].append(key)
+
+    async def send(result):
+        calls["sent"].append(result)
+
+    async def notify(task_name, progress, **kwargs):
+        pass
+
+    def upload_background(key, body, content_type):
+        return asyncio.get_running_loop().create_task(upload(key, body, content_type))
+
+    monkeypatch.setattr(bulk, "perform_segment_translation", translate_segments)
+    monkeypatch.setattr(bulk, "score_pairs", score_pairs)
+    monkeypatch.setattr(bulk, "upload_s3_async", upload)
+    monkeypatch.setattr(bulk, "send_result_to_be", send)
+    monkeypatch.setattr(bulk, "notify_progress", notify)
+    monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(text_similarity, "upload_s3_background", upload_background)
+    monkeypatch.setattr(text_similarity, "_ensure_ready", lambda scope: None)
+    monkeypatch.setattr(text_similarity, "task_scheduler", TaskScheduler(
+        max_concurrency=1, max_queue=10, interactive_burst=1, max_status_entries=10
+    ))
+    return calls
+
+
+def test_bulk_endpoint_streams_ndjson_rows_and_sends_one_summary(pipeline):
+    app = FastAPI()
+    app.include_router(text_similarity.router, prefix="/agent")
+    raw = "\n".join(json.dumps(row, ensure_ascii=False) for row in [
+        {"source": "One.", "translation": "하나."},
+        {"source": "Two."},
+        {"source": "Three."},
+    ]).encode("utf-8")
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/agent/text-similarities/bulk",
+            files={"input_file": ("rows.jsonl", raw, "application/jsonl")},
+            data={"input_language": "en", "output_language": "ko", "translate_type": "M2M", "total_project_id": "7"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines[:-1]] == [0, 1, 2]
+    assert [line["translation"] for line in lines[:-1]] == ["하나.", "번역:Two.", "번역:Three."]
+    summary = lines[-1]["summary"]
+    assert summary["task_name"] == response.headers["X-Task-Name"]
+    assert summary["rows"] == 3 and summary["scored"] == 3 and summary["e5"] == 0.9
+
+    # 번역문이 없는 행만 chunk 별로 번역하고, 집계 결과는 한 번만 전송
+    assert pipeline["translated"] == [["Two."], ["Three."]]
+    assert len(pipeline["sent"]) == 1
+    assert "직역 가능성 높음" in pipeline["sent"][0].description
+
+
+def test_scoring_failure_cancels_the_prefetched_translation(pipeline):
+    pipeline["fail_scoring"] = True
+    request = TextSimilarityRequest(
+        input_language=Language.ENGLISH,
+        output_language=Language.KOREAN,
+        translate_type=TranslateType.M2M,
+        input_text_key="text_similarity/task/rows.jsonl",
+        total_project_id=7,
+    )
+    rows = [("One.", None), ("Two.", None), ("Three.", None)]
+
+    async def main():
+        with pytest.raises(RuntimeError, match="scorer crashed"):
+            async for _ in bulk.run_bulk_similarity("task", request, rows):
+                pass
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    leftover = asyncio.run(main())
+
+    assert leftover == []
+    assert pipeline["sent"] == []
@@ -0,0 +1,112 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+# comparison_service 는 app.core.models 를 import 하므로 모델 의존성이 있어야 함
+for _module in ("transformers", "bert_score", "comet", "sentence_transformers"):
+    pytest.importorskip(_module)
+
+from app.model.translate.google_translate import TranslationError  # noqa: E402
+from app.schema.text_similarity_dto import Language, TextSimilarityRequest, TranslateType  # noqa: E402
+from app.service import comparison_service  # noqa: E402
+from app.util.exception import S3UploadError  # noqa: E402
+
+# 엔진별 번역문 → (e5, labse, precision, recall, f1, comet)
+SCORES = {
+    "google": [0.9, 0.8, 0.9, 0.9, 0.9, 0.9],
+    "m2m": [0.5, 0.4, 0.5, 0.5, 0.5, 0.5],
+    "gpt": [0.7, 0.6, 0.7, 0.7, 0.7, 0.7],
+}
+
+
+def _request(**overrides) -> TextSimilarityRequest:
+    options = dict(
+        input_text="첫 문장. 둘째 문장.",
+        input_language=Language.KOREAN,
+        output_language=Language.ENGLISH,
+        translate_type=TranslateType.M2M,
+        input_text_key="text_similarity/task/input.txt",
+        total_project_id=7,
+        document_mode=True,
+    )
+    options.update(overrides)
+    return TextSimilarityRequest(**options)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """
+    번역/채점/업로드/전송을 가짜로 바꾸고 호출 기록을 반환합니다.
+    """
+    calls = {"scored": [], "sent": [], "progress": [], "uploaded": []}
+
+    async def translate_segments(request, segments):
+        engine = request.translate_type.value.lower()
+        if engine in calls.get("failing_engines", ()):
+            raise TranslationError(f"{engine} unavailable")
+        return [f"{engine}:{segment}" for segment in segments]
+
+    async def score_pairs(pairs, metrics=None):
+        calls["scored"].append(list(pairs))
+        return np.array([SCORES[target.split(":")[0]] for _, target in pairs], dtype=np.float64)
+
+    async def upload(key, body, content_type):
+        if any(engine in key for engine in calls.get("failing_uploads", ())):
+            raise S3UploadError("S3 upload error: boom")
+        calls["uploaded"].append(key)
+
+    async def send(result):
+        calls["sent"].append(result)
+
+    async def notify(task_name, progress, **kwargs):
+        calls["progress"].append(progress)
+
+    monkeypatch.setattr(comparison_service, "perform_segment_translation", translate_segments)
+    monkeypatch.setattr(comparison_service, "score_pairs", score_pairs)
+    monkeypatch.setattr(comparison_service, "upload_s3_async", upload)
+    monkeypatch.setattr(comparison_service, "send_result_to_be", send)
+    monkeypatch.setattr(comparison_service, "notify_progress", notify)
+    return calls
+
+
+def _run(request, translate_types):
+    return asyncio.run(comparison_service.run_text_similarity_comparison("task", request, translate_types))
+
+
+def test_candidates_are_scored_in_one_batch_and_ranked(pipeline):
+    comparison = _run(_request(), [TranslateType.M2M, TranslateType.GOOGLE, TranslateType.GPT])
+
+    assert [c.translation_api_type for c in comparison.candidates] == ["GOOGLE", "GPT", "M2M"]
+    assert [c.score for c in comparison.candidates] == [88, 68, 48]
+    # 원문 2문장 × 엔진 3개를 한 번에 채점
+    assert len(pipeline["scored"]) == 1 and len(pipeline["scored"][0]) == 6
+    assert pipeline["progress"][-1] == 100
+    assert len(pipeline["sent"]) == 3
+    assert all(c.translation_text_key.endswith(f"{c.translation_api_type.lower()}.txt") for c in comparison.candidates)
+    assert "직역 가능성 높음" in comparison.candidates[0].description
+
+
+def test_upload_failure_keeps_ranking_and_clears_that_key(pipeline):
+    pipeline["failing_uploads"] = ("gpt",)
+
+    comparison = _run(_request(), [TranslateType.GOOGLE, TranslateType.GPT, TranslateType.M2M])
+
+    keys = {c.translation_api_type: c.translation_text_key for c in comparison.candidates}
+    assert keys["GPT"] == ""
+    assert keys["GOOGLE"] and keys["M2M"]
+    assert [c.score for c in comparison.candidates] == [88, 68, 48]
+    # 업로드 실패와 상관없이 모든 엔진 결과와 최종 진행률을 전송
+    assert len(pipeline["sent"]) == 3
+    assert pipeline["progress"][-1] == 100
+
+
+def test_failed_translation_is_reported_with_zero_score(pipeline):
+    pipeline["failing_engines"] = ("gpt",)
+
+    comparison = _run(_request(), [TranslateType.GOOGLE, TranslateType.GPT])
+
+    assert [c.translation_api_type for c in comparison.candidates] == ["GOOGLE"]
+    assert comparison.errors == {"GPT": "gpt unavailable"}
+    failed = [r for r in pipeline["sent"] if r.translation_api_type == "GPT"]
+    assert len(failed) == 1 and failed[0].score == 0
@@ -0,0 +1,25 @@
+import os
+
+from app.core.executor import InferenceExecutor
+
+
+def test_reserved_workers_keep_the_per_process_cpu_share(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 16)
+    executor = InferenceExecutor(workers=1)
+
+    # pre-fork 부모에서 프로세스 수로 나눈 뒤, worker 의 lifespan 에서 단계별 worker 확보
+    executor.share_cpus(2)
+    executor.reserve_workers(4)
+
+    assert executor.workers == 4
+    assert executor.torch_threads == 2
+
+
+def test_reserve_workers_is_ignored_after_the_pool_started():
+    executor = InferenceExecutor(workers=1, torch_threads=1)
+    executor._get_pool()
+    try:
+        executor.reserve_workers(4)
+        assert executor.workers == 1
+    finally:
+        executor.shutdown()
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import random
+import tempfile
+import tracemalloc
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.util import ingest as ingest_module
+from app.util import s3 as s3_module
+from app.util.exception import S3UploadError
+from app.util.ingest import UploadReader, detach_upload, inspect_upload
+from app.util.s3 import LocalStorage
+from app.util.segmenter import split_sentences
+
+CHUNK_SIZE_KB = 64
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    local = LocalStorage(str(tmp_path / "storage"))
+    monkeypatch.setattr(s3_module, "storage", local)
+    monkeypatch.setattr(ingest_module, "INGEST_CHUNK_SIZE_KB", CHUNK_SIZE_KB)
+    return local
+
+
+def _upload(data: bytes, filename: str = "input.txt") -> UploadFile:
+    # Starlette 가 multipart 업로드를 받는 것과 같은 SpooledTemporaryFile
+    file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    file.write(data)
+    file.seek(0)
+    return UploadFile(file, size=len(data), filename=filename, headers=Headers({"content-type": "text/plain"}))
+
+
+def _newline_free_text(size: int, seed: int = 0) -> str:
+    """
+    줄바꿈 없이 문장 경계, 공백 없는 긴 단어, 구두점 없는 긴 구간이 섞인 텍스트
+    """
+    rng = random.Random(seed)
+    words = ["번역", "문장", "translation", "quality", "テスト", "हिंदी", "score", "e5"]
+    pieces, length = [], 0
+    while length < size:
+        kind = rng.random()
+        if kind < 0.02:
+            piece = "x" * rng.randint(400, 2000)
+        elif kind < 0.05:
+            piece = " ".join(rng.choice(words) for _ in range(rng.randint(100, 300)))
+        else:
+            piece = " ".join(rng.choice(words) for _ in range(rng.randint(1, 15)))
+        piece += rng.choice([". ", "! ", "? ", "。", "… ", "  ", " "])
+        pieces.append(piece)
+        length += len(piece)
+    return "".join(pieces)
+
+
+def test_large_newline_free_upload_streams_segments_with_bounded_memory(storage):
+    text = _newline_free_text(4 * 1024 * 1024)
+    data = text.encode("utf-8")
+    expected = split_sentences(text)
+    upload = _upload(data)
+
+    async def main():
+        # 저장소 I/O 스레드 풀 생성 같은 1회성 할당은 측정에서 제외
+        await UploadReader(_upload(b"warm up."), "text_similarity/warmup/input.txt").drain()
+        reader = UploadReader(upload, "text_similarity/task/input.txt")
+        count, first_at = 0, None
+        tracemalloc.start()
+        try:
+            async for segment in reader.iter_segments():
+                # 리스트로 모으지 않고 하나씩 비교
+                assert segment == expected[count]
+                if first_at is None:
+                    first_at = reader.size
+                count += 1
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return reader, count, first_at, peak
+
+    reader, count, first_at, peak = asyncio.run(main())
+
+    assert count == len(expected)
+    # 첫 문장은 파일을 다 읽기 전에 나옴
+    assert first_at < len(data)
+    # 메모리는 파일 크기(약 6MB)가 아니라 청크 크기 수준
+    assert peak < 16 * CHUNK_SIZE_KB * 1024 < len(data) / 5, peak
+    assert reader.stored and reader.size == len(data)
+    assert storage._path("text_similarity/task/input.txt").read_bytes() == data
+
+
+def test_multibyte_characters_split_across_chunks_are_decoded(storage):
+    text = "가" * (CHUNK_SIZE_KB * 1024 // 3 + 1) + ". 끝."
+    upload = _upload(text.encode("utf-8"))
+
+    async def main():
+        reader = UploadReader(upload, "text_similarity/task/input.txt")
+        return await reader.read_text()
+
+    assert asyncio.run(main()) == text
+
+
+class _FailingStorage(LocalStorage):
+    def open_stream(self, key: str, content_type: str):
+        writer = super().open_stream(key, content_type)
+
+        def write(data: bytes):
+            raise OSError("disk full")
+
+        writer.write = write
+        return writer
+
+
+def test_storage_failure_fails_the_read_and_leaves_nothing_stored(tmp_path, monkeypatch):
+    failing = _FailingStorage(str(tmp_path / "storage"))
+    monkeypatch.setattr(s3_module, "storage", failing)
+    monkeypatch.setattr(ingest_module, "INGEST_CHUNK_SIZE_KB", CHUNK_SIZE_KB)
+    upload = _upload(("문장입니다. " * 50000).encode("utf-8"))
+
+    async def main():
+        reader = UploadReader(upload, "text_similarity/task/input.txt")
+        with pytest.raises(S3UploadError):
+            async for _ in reader.iter_segments():
+                pass
+        return reader
+
+    reader = asyncio.run(main())
+
+    assert not reader.stored
+    assert not (tmp_path / "storage").exists() or not any((tmp_path / "storage").rglob("*"))
+
+
+def test_inspect_upload_hashes_and_rewinds(storage):
+    data = "안녕하세요. Hello.".encode("utf-8")
+    upload = _upload(data)
+
+    async def main():
+        digest = await inspect_upload(upload)
+        return digest, await upload.read()
+
+    digest, again = asyncio.run(main())
+
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert again == data
+
+
+def test_inspect_upload_rejects_invalid_utf8(storage):
+    # 마지막 글자가 잘린 UTF-8
+    upload = _upload("한글".encode("utf-8")[:-1])
+
+    with pytest.raises(UnicodeDecodeError):
+        asyncio.run(inspect_upload(upload))
+
+
+def test_detached_upload_survives_closing_the_request_upload(storage):
+    upload = _upload(b"queued text")
+
+    async def main():
+        detached = detach_upload(upload)
+        # 요청이 끝날 때 FastAPI 가 원래 UploadFile 을 닫음
+        await upload.close()
+        content = await detached.read()
+        await detached.close()
+        return detached, content
+
+    detached, content = asyncio.run(main())
+
+    assert content == b"queued text"
+    assert detached.filename == "input.txt"
+    assert detached.size == len(b"queued text")
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+import torch
+
+# m2m100 은 app.core.models 를 import 하므로 모델 의존성이 있어야 함
+for _module in ("transformers", "bert_score", "comet", "sentence_transformers"):
+    pytest.importorskip(_module)
+
+from app.model.translate import m2m100  # noqa: E402
+from app.model.translate.m2m100 import _length_buckets, translate_m2m100_batch  # noqa: E402
+
+
+class _Batch(dict):
+    def to(self, device):
+        return self
+
+
+class _StubTokenizer:
+    """
+    글자 하나를 토큰 하나로 보는 토크나이저. 번역문은 대문자로 복호화
+    """
+    src_lang = None
+
+    def __call__(self, texts, truncation=True, max_length=256):
+        input_ids = [[ord(c) for c in text][:max_length] for text in texts]
+        return {"input_ids": input_ids, "attention_mask": [[1] * len(ids) for ids in input_ids]}
+
+    def pad(self, encodings, return_tensors="pt"):
+        width = max(len(ids) for ids in encodings["input_ids"])
+        return _Batch(
+            input_ids=torch.tensor([ids + [0] * (width - len(ids)) for ids in encodings["input_ids"]]),
+            attention_mask=torch.tensor([mask + [0] * (width - len(mask)) for mask in encodings["attention_mask"]]),
+        )
+
+    def get_lang_id(self, lang):
+        return 1
+
+    def batch_decode(self, output, skip_special_tokens=True):
+        return ["".join(chr(i) for i in row if i != 0).upper() for row in output.tolist()]
+
+
+class _StubModel:
+    """
+    입력을 그대로 돌려주고 generate 호출마다 batch 를 기록
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def generate(self, input_ids, attention_mask, **kwargs):
+        self.batches.append(attention_mask.sum(dim=1).tolist())
+        return input_ids
+
+
+class _StubRegistry:
+    def __init__(self, model):
+        self.model = model
+
+    def get(self, pair):
+        return _StubTokenizer(), self.model
+
+
+def test_length_buckets_group_similar_lengths():
+    assert _length_buckets([5, 1, 4, 2, 3], 2) == [[1, 3], [4, 2], [0]]
+
+
+def test_bucketed_batches_return_translations_in_input_order(monkeypatch):
+    model = _StubModel()
+    monkeypatch.setattr(m2m100, "m2m_registry", _StubRegistry(model))
+    rng = random.Random(0)
+    texts = ["x" * rng.randint(1, 60) + f" sentence {i}" for i in range(37)]
+
+    results = translate_m2m100_batch(texts, "en", "ko", num_beams=1, batch_size=8)
+
+    assert results == [text.upper() for text in texts]
+    assert [len(batch) for batch in model.batches] == [8, 8, 8, 8, 5]
+    # 길이 순으로 묶였으므로 앞 batch 의 가장 긴 문장이 다음 batch 의 가장 짧은 문장보다 길지 않음
+    for previous, current in zip(model.batches, model.batches[1:]):
+        assert max(previous) <= min(current)
+
+
+def test_unsupported_pair_and_empty_input(monkeypatch):
+    monkeypatch.setattr(m2m100, "m2m_registry", _StubRegistry(_StubModel()))
+
+    assert translate_m2m100_batch([], "en", "ko") == []
+    with pytest.raises(m2m100.TranslationError):
+        translate_m2m100_batch(["hello"], "fr", "de")
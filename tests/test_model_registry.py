@@ -0,0 +1,108 @@
+import torch
+
+from app.core.model_registry import ModelRegistry
+
+PAIRS = [("en", "ko"), ("en", "ja"), ("en", "hi"), ("ko", "en")]
+MB = 1024 * 1024
+
+
+class _TorchModel(torch.nn.Module):
+    def __init__(self, megabytes: int):
+        super().__init__()
+        # float32 4byte × 262144 = 1MB
+        self.weight = torch.nn.Parameter(torch.zeros(megabytes, 262144))
+
+
+class _OnnxModel:
+    """
+    ORT 모델처럼 가중치 파일 디렉터리만 가진 모델
+    """
+
+    def __init__(self, model_dir):
+        self.model_save_dir = model_dir
+
+
+def _registry(sizes_mb=None, **options):
+    loaded = []
+
+    def loader(pair):
+        loaded.append(pair)
+        return f"tokenizer-{pair}", _TorchModel((sizes_mb or {}).get(pair, 1))
+
+    return ModelRegistry(loader, PAIRS, **options), loaded
+
+
+def test_least_recently_used_pair_is_evicted_first():
+    registry, loaded = _registry(max_resident=2)
+
+    registry.get(("en", "ko"))
+    registry.get(("en", "ja"))
+    registry.get(("en", "ko"))
+    registry.get(("en", "hi"))
+
+    assert registry.is_loaded(("en", "ko")) and registry.is_loaded(("en", "hi"))
+    assert not registry.is_loaded(("en", "ja"))
+    assert registry.stats()["evictions"] == 1 and registry.stats()["hits"] == 1
+    assert loaded == [("en", "ko"), ("en", "ja"), ("en", "hi")]
+
+
+def test_pinned_pairs_are_never_evicted():
+    registry, _ = _registry(max_resident=2, pinned=[("en", "ko"), ("en", "ja")])
+
+    registry.preload()
+    registry.get(("en", "hi"))
+
+    # pin 된 모델은 내리지 않으므로 개수 제한을 넘어도 유지
+    assert all(registry.is_loaded(pair) for pair in (("en", "ko"), ("en", "ja"), ("en", "hi")))
+
+    registry.get(("ko", "en"))
+
+    assert not registry.is_loaded(("en", "hi"))
+    assert registry.is_loaded(("en", "ko")) and registry.is_loaded(("en", "ja"))
+
+
+def test_memory_budget_evicts_before_loading_the_next_model():
+    registry, _ = _registry(
+        sizes_mb={("en", "ko"): 2, ("en", "ja"): 2, ("en", "hi"): 2}, max_resident=4, memory_budget_bytes=5 * MB
+    )
+    peaks = []
+    original_loader = registry.loader
+
+    def loader(pair):
+        # 로드 시작 시점에 이미 resident 인 모델 + 로드 중인 모델 예상 크기
+        peaks.append(registry.resident_bytes + sum(registry._loading.values()))
+        return original_loader(pair)
+
+    registry.loader = loader
+    for pair in PAIRS[:3]:
+        registry.get(pair)
+
+    assert registry.stats()["resident"] == ["en-ja", "en-hi"]
+    assert registry.resident_bytes == 4 * MB
+    assert max(peaks) <= 5 * MB
+
+
+def test_onnx_model_size_is_read_from_weight_files(tmp_path):
+    model_dir = tmp_path / "m2m100_en-ko"
+    model_dir.mkdir()
+    (model_dir / "encoder_model.onnx").write_bytes(b"\0" * (2 * MB))
+    (model_dir / "decoder_model.onnx_data").write_bytes(b"\0" * (3 * MB))
+    (model_dir / "config.json").write_text("{}")
+    registry = ModelRegistry(lambda pair: ("tokenizer", _OnnxModel(model_dir)), PAIRS)
+
+    registry.get(("en", "ko"))
+
+    assert registry.resident_bytes == 5 * MB
+
+
+def test_configured_size_is_used_when_the_model_cannot_be_measured():
+    registry = ModelRegistry(
+        lambda pair: ("tokenizer", object()), PAIRS, memory_budget_bytes=5 * MB, model_size_bytes=3 * MB
+    )
+
+    registry.get(("en", "ko"))
+    registry.get(("en", "ja"))
+
+    # 3MB + 3MB 는 예산(5MB)을 넘으므로 로드 전에 앞 모델을 내림
+    assert registry.stats()["resident"] == ["en-ja"]
+    assert registry.resident_bytes == 3 * MB
@@ -0,0 +1,115 @@
+import asyncio
+
+from app.service.task_scheduler import Lane, TaskScheduler
+from app.web_socket import notifier
+from app.web_socket.notifier import ConnectionManager
+
+
+class _FakeWebSocket:
+    """
+    보낸 메시지를 기록하는 WebSocket. blocked 이면 send_text 가 끝나지 않음(느린 클라이언트)
+    """
+
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self._gate = asyncio.Event()
+        if not blocked:
+            self._gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        await self._gate.wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def _flush():
+    # sender task 가 대기열을 비우고 다음 메시지를 기다리는 상태가 될 때까지
+    await asyncio.sleep(0.01)
+
+
+def test_messages_are_routed_to_task_and_project_subscribers():
+    async def main():
+        manager = ConnectionManager()
+        by_task = await manager.connect(_FakeWebSocket(), task_names=["t1"])
+        by_project = await manager.connect(_FakeWebSocket(), project_ids=[7])
+        other = await manager.connect(_FakeWebSocket(), task_names=["t2"], project_ids=[8])
+        legacy = await manager.connect(_FakeWebSocket())
+
+        manager.track_task("t1", 7)
+        await manager.broadcast({"task_name": "t1", "progress": 10, "status": "running"})
+        await manager.broadcast({"task_name": "t1", "progress": 20, "status": "running", "segment": {"index": 0}})
+        await _flush()
+        return [conn.websocket.sent for conn in (by_task, by_project, other, legacy)]
+
+    by_task, by_project, other, legacy = asyncio.run(main())
+
+    assert len(by_task) == 2 and len(by_project) == 2
+    assert other == []
+    # 구독 정보가 없는 클라이언트는 진행률만 받고 segment 메시지는 받지 않음
+    assert len(legacy) == (1 if notifier.WS_BROADCAST_UNSUBSCRIBED else 0)
+    assert all('"segment"' not in message for message in legacy)
+
+
+def test_queue_overflow_drops_only_the_slow_connection(monkeypatch):
+    monkeypatch.setattr(notifier, "WS_QUEUE_MAX", 3)
+
+    async def main():
+        manager = ConnectionManager()
+        slow = await manager.connect(_FakeWebSocket(blocked=True), task_names=["t1"])
+        fast = await manager.connect(_FakeWebSocket(), task_names=["t1"])
+        legacy = await manager.connect(_FakeWebSocket(blocked=True))
+
+        for index in range(10):
+            await manager.broadcast(
+                {"task_name": "t1", "progress": index, "status": "running", "segment": {"index": index}}
+            )
+            await _flush()
+        return manager, slow, fast, legacy
+
+    manager, slow, fast, legacy = asyncio.run(main())
+
+    assert slow.websocket.closed_with == 1013
+    assert slow.websocket not in manager.active_connections
+    assert len(fast.websocket.sent) == 10
+    # segment 메시지를 받지 않으므로 구독하지 않은 느린 클라이언트는 넘치지 않음
+    assert legacy.websocket.closed_with is None
+    assert manager.stats()["dropped_connections"] == 1
+
+
+def test_scheduler_forgets_project_routing_for_tasks_that_end_without_completion(monkeypatch):
+    manager = ConnectionManager()
+    monkeypatch.setattr("app.service.task_scheduler.manager", manager)
+
+    async def main():
+        scheduler = TaskScheduler(
+            max_concurrency=2, max_queue=10, interactive_burst=2, max_status_entries=10
+        )
+        gate = asyncio.Event()
+
+        async def failing():
+            manager.track_task("failing", 7)
+            raise ValueError("boom")
+
+        async def blocked():
+            manager.track_task("cancelled", 7)
+            await gate.wait()
+
+        failed = await scheduler.submit("failing", Lane.INTERACTIVE, failing)
+        await scheduler.submit("cancelled", Lane.INTERACTIVE, blocked)
+        await _flush()
+        tracked = dict(manager._task_projects)
+        # 서버 종료로 실행 중인 작업이 취소됨
+        await scheduler.shutdown()
+        return tracked, failed.status
+
+    tracked, failed_status = asyncio.run(main())
+
+    assert tracked == {"cancelled": 7}
+    assert failed_status == "failed"
+    assert manager.stats()["tracked_tasks"] == 0
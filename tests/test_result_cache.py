@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+
+from app.service import result_cache as result_cache_module
+from app.service.result_cache import ResultCache
+
+
+def test_concurrent_callers_share_one_compute():
+    calls = []
+
+    async def main():
+        cache = ResultCache(max_entries=10, ttl_seconds=60)
+        release = asyncio.Event()
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return {"score": 0.9}
+
+        waiters = [asyncio.ensure_future(cache.get_or_compute("k", compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        return results, await cache.get_or_compute("k", compute), cache.stats()
+
+    results, again, stats = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert sorted(source for _, source in results) == ["computed", "shared", "shared", "shared", "shared"]
+    assert all(value == {"score": 0.9} for value, _ in results)
+    assert again == ({"score": 0.9}, "hit")
+    assert stats["in_flight"] == 0
+
+
+def test_failure_reaches_waiters_and_is_not_cached():
+    calls = []
+
+    async def main():
+        cache = ResultCache(max_entries=10, ttl_seconds=60)
+
+        async def failing():
+            calls.append("fail")
+            await asyncio.sleep(0.01)
+            raise RuntimeError("scoring failed")
+
+        async def succeeding():
+            calls.append("ok")
+            return 1
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("k", failing) for _ in range(3)), return_exceptions=True
+        )
+        return results, await cache.get_or_compute("k", succeeding)
+
+    results, retried = asyncio.run(main())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == (1, "computed")
+    assert calls == ["fail", "ok"]
+
+
+def test_should_cache_false_is_not_stored():
+    async def main():
+        cache = ResultCache(max_entries=10, ttl_seconds=60)
+
+        async def compute():
+            return {"error": True}
+
+        first = await cache.get_or_compute("k", compute, should_cache=lambda value: not value["error"])
+        second = await cache.get_or_compute("k", compute, should_cache=lambda value: not value["error"])
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first[1] == "computed" and second[1] == "computed"
+
+
+def test_refresh_recomputes_and_replaces_cached_value():
+    values = iter([1, 2])
+
+    async def main():
+        cache = ResultCache(max_entries=10, ttl_seconds=60)
+
+        async def compute():
+            return next(values)
+
+        await cache.get_or_compute("k", compute)
+        refreshed = await cache.get_or_compute("k", compute, refresh=True)
+        return refreshed, await cache.get_or_compute("k", compute)
+
+    refreshed, cached = asyncio.run(main())
+
+    assert refreshed == (2, "computed")
+    assert cached == (2, "hit")
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+    cache = ResultCache(max_entries=10, ttl_seconds=30)
+
+    cache.put("k", "v")
+    now[0] += 29
+    assert cache.get("k") == "v"
+    now[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@pytest.mark.parametrize("max_entries, ttl_seconds", [(0, 60), (10, 0)])
+def test_disabled_cache_stores_nothing(max_entries, ttl_seconds):
+    cache = ResultCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    cache.put("k", "v")
+
+    assert cache.get("k") is None
+
+
+def test_total_size_limit_evicts_least_recently_used_results():
+    # (번역문, 결과 dict) 형태, 원문/번역문이 대부분의 크기를 차지
+    def result(text: str):
+        return text, {"original_text": text, "e5": 0.9}
+
+    cache = ResultCache(max_entries=100, ttl_seconds=60, max_bytes=5000)
+
+    cache.put("a", result("a" * 1000))
+    cache.put("b", result("b" * 1000))
+    assert cache.get("a") is not None
+    cache.put("c", result("c" * 1000))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] <= 5000
+
+
+def test_result_larger_than_the_size_limit_is_not_cached():
+    cache = ResultCache(max_entries=100, ttl_seconds=60, max_bytes=1000)
+    cache.put("small", "x" * 100)
+
+    cache.put("large", "문서" * 1000)
+
+    assert cache.get("large") is None
+    assert cache.get("small") == "x" * 100
+    assert cache.stats()["bytes"] == 100
+
+
+def test_replacing_an_entry_does_not_double_count_its_size():
+    cache = ResultCache(max_entries=100, ttl_seconds=60, max_bytes=1000)
+
+    for _ in range(5):
+        cache.put("k", "x" * 400)
+
+    assert cache.stats()["bytes"] == 400
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.client import result_outbox as outbox_module
+from app.client.http_client import upstreams
+from app.client.result_outbox import ResultOutbox
+
+RESULT_URL = "http://spring.test/api/text-similarities"
+BATCH_URL = "http://spring.test/api/text-similarities/batch"
+
+
+def _outbox(tmp_path, **overrides) -> ResultOutbox:
+    options = dict(
+        path=str(tmp_path / "outbox.sqlite3"),
+        batch_url="",
+        batch_size=10,
+        max_attempts=3,
+        backoff_base=0.01,
+        backoff_max=0.05,
+        poll_seconds=0.02,
+        lease_seconds=60,
+    )
+    options.update(overrides)
+    return ResultOutbox(**options)
+
+
+def _rows(outbox: ResultOutbox):
+    return outbox._connect().execute(
+        "SELECT id, status, attempts, locked_by FROM outbox ORDER BY id"
+    ).fetchall()
+
+
+@pytest.fixture
+def spring(monkeypatch):
+    """
+    Spring 으로 가는 요청을 handler(request) -> httpx.Response 로 대신 처리합니다.
+    client 는 테스트의 이벤트 루프 안에서 install() 로 만듭니다.
+    """
+    spring_upstream = upstreams["spring"]
+    monkeypatch.setattr(outbox_module, "RESULT_URL", RESULT_URL)
+    monkeypatch.setattr(spring_upstream, "_semaphore", None)
+    monkeypatch.setattr(spring_upstream, "_client", None)
+    requests = []
+
+    def install(handler):
+        def record(request: httpx.Request) -> httpx.Response:
+            requests.append((str(request.url), json.loads(request.content)))
+            return handler(request)
+
+        spring_upstream._client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+
+    install.requests = requests
+    return install
+
+
+async def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+def test_claim_lease_is_exclusive_between_owners(tmp_path):
+    first = _outbox(tmp_path, batch_size=3, lease_seconds=60)
+    second = _outbox(tmp_path, batch_size=10, lease_seconds=60)
+    for i in range(5):
+        first._insert(f"task-{i}", json.dumps({"i": i}))
+
+    claimed_first = first._claim()
+    claimed_second = second._claim()
+
+    assert [row_id for row_id, _, _ in claimed_first] == [1, 2, 3]
+    assert [row_id for row_id, _, _ in claimed_second] == [4, 5]
+    # 이미 lease 를 잡고 전송 중인 항목은 같은 worker 가 다시 가져가지 않음
+    assert second._claim() == []
+    assert first._claim() == []
+
+
+def test_claim_returns_only_rows_locked_now(tmp_path):
+    outbox = _outbox(tmp_path, batch_size=10, lease_seconds=60)
+    outbox._insert("task-0", "{}")
+    assert [row_id for row_id, _, _ in outbox._claim()] == [1]
+
+    # 1번은 아직 전송 중 (lease 유지), 새로 들어온 2번만 가져감
+    outbox._insert("task-1", "{}")
+
+    assert [row_id for row_id, _, _ in outbox._claim()] == [2]
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_cannot_finish(tmp_path):
+    first = _outbox(tmp_path, lease_seconds=0.05)
+    second = _outbox(tmp_path, lease_seconds=60)
+    first._insert("task", "{}")
+
+    assert len(first._claim()) == 1
+    assert second._claim() == []
+    time.sleep(0.1)
+    assert len(second._claim()) == 1
+
+    # 먼저 가져갔던 worker 의 결과는 반영되지 않음
+    assert first._finish([1], []) == set()
+    assert first._finish([], [(1, 1, "HTTP 500", True)]) == set()
+    assert _rows(second) == [(1, "pending", 0, second._owner)]
+
+    assert second._finish([1], []) == {1}
+    assert _rows(second) == []
+
+
+def test_failed_rows_back_off_then_go_dead(tmp_path):
+    outbox = _outbox(tmp_path, max_attempts=3, backoff_base=10, backoff_max=100)
+    for i in range(3):
+        outbox._insert(f"task-{i}", "{}")
+    assert len(outbox._claim()) == 3
+
+    before = time.time()
+    applied = outbox._finish([], [
+        (1, 1, "HTTP 503", True),
+        (2, 3, "HTTP 503", True),
+        (3, 1, "HTTP 400", False),
+    ])
+
+    assert applied == {1, 2, 3}
+    assert _rows(outbox) == [(1, "pending", 1, None), (2, "dead", 3, None), (3, "dead", 1, None)]
+    next_attempt_at = outbox._connect().execute("SELECT next_attempt_at FROM outbox WHERE id = 1").fetchone()[0]
+    # 첫 실패: base(10s) 에 jitter 0.5~1.0
+    assert before + 5 <= next_attempt_at <= time.time() + 10
+    # 재시도 시각 전이라 다시 가져가지 않음
+    assert outbox._claim() == []
+
+
+@pytest.mark.parametrize("attempts, ceiling", [(1, 1.0), (3, 4.0), (10, 30.0)])
+def test_backoff_grows_exponentially_with_jitter_up_to_max(tmp_path, attempts, ceiling):
+    outbox = _outbox(tmp_path, backoff_base=1.0, backoff_max=30.0)
+
+    delays = [outbox._backoff(attempts) for _ in range(200)]
+
+    assert all(ceiling * 0.5 <= delay <= ceiling for delay in delays)
+
+
+def test_retryable_failures_are_retried_until_max_attempts(tmp_path, spring):
+    async def main():
+        spring(lambda request: httpx.Response(503, text="unavailable"))
+        outbox = _outbox(tmp_path, max_attempts=3)
+        await outbox.enqueue({"task_name": "t"}, task_name="t")
+        await _wait_for(lambda: outbox.dead == 1)
+        await outbox.stop()
+        return outbox, await outbox.stats()
+
+    outbox, stats = asyncio.run(main())
+
+    assert len(spring.requests) == 3
+    assert outbox.retried == 2
+    assert stats["dead"] == 1 and stats["pending"] == 0
+    assert _rows(outbox) == [(1, "dead", 3, None)]
+
+
+def test_rejected_batch_is_retried_one_by_one(tmp_path, spring):
+    def handler(request):
+        if str(request.url) == BATCH_URL:
+            return httpx.Response(400, text="invalid item in batch")
+        return httpx.Response(422 if json.loads(request.content).get("bad") else 200)
+
+    async def main():
+        spring(handler)
+        outbox = _outbox(tmp_path, batch_url=BATCH_URL)
+        for payload in ({"n": 1}, {"n": 2, "bad": True}, {"n": 3}):
+            outbox._insert(None, json.dumps(payload))
+        outbox.start()
+        await _wait_for(lambda: outbox.delivered + outbox.dead == 3)
+        await outbox.stop()
+        return outbox
+
+    outbox = asyncio.run(main())
+
+    assert spring.requests[0] == (BATCH_URL, [{"n": 1}, {"n": 2, "bad": True}, {"n": 3}])
+    assert sorted(body["n"] for url, body in spring.requests[1:] if url == RESULT_URL) == [1, 2, 3]
+    assert outbox.delivered == 2 and outbox.dead == 1
+    assert _rows(outbox) == [(2, "dead", 1, None)]
+
+
+def test_rows_left_by_a_previous_run_are_delivered_on_start(tmp_path, spring):
+    previous = _outbox(tmp_path)
+    for i in range(4):
+        previous._insert(f"task-{i}", json.dumps({"i": i}))
+
+    async def main():
+        spring(lambda request: httpx.Response(200))
+        outbox = _outbox(tmp_path)
+        outbox.start()
+        await _wait_for(lambda: outbox.delivered == 4)
+        await outbox.stop()
+        return outbox
+
+    outbox = asyncio.run(main())
+
+    assert sorted(body["i"] for _, body in spring.requests) == [0, 1, 2, 3]
+    assert _rows(outbox) == []
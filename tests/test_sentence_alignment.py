@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from app.model.similarity.sentence_alignment import align_embeddings
+
+# multilingual-e5-large 와 같은 차원 (차원이 작으면 무관한 문장끼리의 유사도 편차가 병합 감점보다 커짐)
+DIM = 1024
+
+
+def _unit(x: np.ndarray) -> np.ndarray:
+    return x / np.linalg.norm(x, axis=-1, keepdims=True)
+
+
+def _embed(beads, seed=0, noise=0.05):
+    """
+    정답 bead 리스트로부터 원문/번역문 임베딩을 만듭니다.
+    1-1 은 같은 벡터, 병합은 합친 벡터, 대응이 없는 문장은 무관한 벡터 (모두 약간의 noise)
+    """
+    rng = np.random.default_rng(seed)
+    n = sum(len(s) for s, _ in beads)
+    m = sum(len(t) for _, t in beads)
+    src, tgt = np.zeros((n, DIM)), np.zeros((m, DIM))
+    for s, t in beads:
+        if len(s) == 1 and len(t) == 1:
+            src[s[0]] = tgt[t[0]] = rng.normal(size=DIM)
+        elif len(s) == 2:
+            src[s[0]], src[s[1]] = rng.normal(size=DIM), rng.normal(size=DIM)
+            tgt[t[0]] = _unit(src[s[0]]) + _unit(src[s[1]])
+        elif len(t) == 2:
+            tgt[t[0]], tgt[t[1]] = rng.normal(size=DIM), rng.normal(size=DIM)
+            src[s[0]] = _unit(tgt[t[0]]) + _unit(tgt[t[1]])
+        else:
+            for i in s:
+                src[i] = rng.normal(size=DIM)
+            for j in t:
+                tgt[j] = rng.normal(size=DIM)
+    src = _unit(_unit(src) + noise * rng.normal(size=src.shape))
+    tgt = _unit(_unit(tgt) + noise * rng.normal(size=tgt.shape))
+    return src, tgt
+
+
+def _assert_covers(beads, n, m):
+    """
+    모든 원문/번역문 인덱스가 순서대로 정확히 한 번씩 나오고, 빈 bead 가 없는지 확인
+    """
+    assert [i for s, _ in beads for i in s] == list(range(n))
+    assert [j for _, t in beads for j in t] == list(range(m))
+    assert all(s or t for s, t in beads)
+    assert all(len(s) <= 2 and len(t) <= 2 and len(s) + len(t) <= 3 for s, t in beads)
+
+
+def test_one_hot_embeddings_give_exact_beads():
+    # 문장마다 서로 직교하는 벡터: 대응 문장끼리만 유사도가 0 보다 큼
+    src = np.eye(4)
+    tgt = np.array([
+        [1.0, 0.0, 0.0, 0.0],
+        [0.0, 1.0, 1.0, 0.0],
+        [0.0, 0.0, 0.0, 1.0],
+    ])
+    tgt = _unit(tgt)
+
+    assert align_embeddings(src, tgt) == [([0], [0]), ([1, 2], [1]), ([3], [2])]
+    assert align_embeddings(tgt, src) == [([0], [0]), ([1], [1, 2]), ([2], [3])]
+
+
+def test_identity_alignment():
+    truth = [([i], [i]) for i in range(12)]
+    src, tgt = _embed(truth)
+
+    assert align_embeddings(src, tgt) == truth
+
+
+def test_one_to_two_and_two_to_one_merges():
+    truth = [
+        ([0], [0]),
+        ([1, 2], [1]),
+        ([3], [2]),
+        ([4], [3, 4]),
+        ([5], [5]),
+        ([6, 7], [6]),
+        ([8], [7]),
+        ([9], [8, 9]),
+        ([10], [10]),
+    ]
+    src, tgt = _embed(truth, seed=1)
+
+    assert align_embeddings(src, tgt) == truth
+
+
+def test_omitted_and_inserted_sentences_stay_unmatched():
+    truth = [
+        ([0], [0]),
+        ([1], [1]),
+        ([2], []),
+        ([3], [2]),
+        ([4], [3]),
+        ([], [4]),
+        ([5], [5]),
+        ([6], []),
+        ([7], [6]),
+    ]
+    src, tgt = _embed(truth, seed=2)
+
+    assert align_embeddings(src, tgt) == truth
+
+
+def test_long_document_with_scattered_omissions_stays_in_band():
+    truth, j = [], 0
+    for i in range(300):
+        if i % 10 == 5:
+            truth.append(([i], []))
+        else:
+            truth.append(([i], [j]))
+            j += 1
+    src, tgt = _embed(truth, seed=3)
+
+    assert align_embeddings(src, tgt, band=4) == truth
+
+
+@pytest.mark.parametrize("n, m", [(0, 0), (0, 3), (4, 0), (1, 1), (1, 7), (7, 1), (25, 40), (60, 13)])
+def test_every_index_is_covered_for_unrelated_sentences(n, m):
+    rng = np.random.default_rng(n * 100 + m)
+    src = _unit(rng.normal(size=(n, DIM))) if n else np.zeros((0, DIM))
+    tgt = _unit(rng.normal(size=(m, DIM))) if m else np.zeros((0, DIM))
+
+    _assert_covers(align_embeddings(src, tgt, band=3), n, m)
@@ -0,0 +1,67 @@
+import asyncio
+import gc
+
+import pytest
+
+from app.util import s3 as s3_module
+from app.util.exception import S3UploadError
+from app.util.s3 import LocalStorage, Storage, StreamWriter, upload_s3_background
+
+
+class _BrokenStorage(LocalStorage):
+    def upload(self, key: str, body: bytes, content_type: str):
+        raise OSError("disk full")
+
+
+def test_storage_interfaces_are_abstract():
+    class _Partial(Storage):
+        def upload(self, key: str, body: bytes, content_type: str):
+            pass
+
+    with pytest.raises(TypeError):
+        _Partial()
+    with pytest.raises(TypeError):
+        StreamWriter()
+
+
+def test_background_upload_completes_before_it_is_awaited(tmp_path, monkeypatch):
+    storage = LocalStorage(str(tmp_path))
+    monkeypatch.setattr(s3_module, "storage", storage)
+
+    async def main():
+        await upload_s3_background("text_similarity/task/input.txt", b"hello", "text/plain")
+
+    asyncio.run(main())
+
+    assert storage._path("text_similarity/task/input.txt").read_bytes() == b"hello"
+
+
+def test_background_upload_failure_reaches_the_awaiting_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(s3_module, "storage", _BrokenStorage(str(tmp_path)))
+
+    async def main():
+        task = upload_s3_background("text_similarity/task/input.txt", b"hello", "text/plain")
+        # 작업이 시작되기 전에 업로드가 먼저 끝나도 실패가 사라지지 않음
+        await asyncio.sleep(0.05)
+        with pytest.raises(S3UploadError):
+            await task
+        return set(s3_module._background_uploads)
+
+    assert asyncio.run(main()) == set()
+
+
+def test_unawaited_background_upload_failure_is_only_logged(tmp_path, monkeypatch):
+    monkeypatch.setattr(s3_module, "storage", _BrokenStorage(str(tmp_path)))
+    errors = []
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        # 대기열이 가득 차서 아무도 기다리지 않는 업로드
+        upload_s3_background("text_similarity/task/input.txt", b"hello", "text/plain")
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    gc.collect()
+
+    assert errors == []
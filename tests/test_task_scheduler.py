@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from app.service.task_scheduler import Lane, TaskInfo, TaskScheduler, TASK_RETRY_AFTER_SECONDS
+from app.util.exception import QueueFullError
+
+
+def _scheduler(**overrides) -> TaskScheduler:
+    options = dict(
+        max_concurrency=1, max_queue=100, interactive_burst=2, max_status_entries=100, bulk_max_concurrency=1
+    )
+    options.update(overrides)
+    return TaskScheduler(**options)
+
+
+async def _noop():
+    return None
+
+
+def test_interactive_burst_lets_one_bulk_task_through():
+    async def main():
+        scheduler = _scheduler(interactive_burst=2)
+        for i in range(5):
+            scheduler._queues[Lane.INTERACTIVE].append(TaskInfo(f"i{i}", Lane.INTERACTIVE, _noop))
+        for i in range(3):
+            scheduler._queues[Lane.BULK].append(TaskInfo(f"b{i}", Lane.BULK, _noop))
+        order = []
+        while (info := scheduler._next()) is not None:
+            order.append(info.task_name)
+        return order
+
+    assert asyncio.run(main()) == ["i0", "i1", "b0", "i2", "i3", "b1", "i4", "b2"]
+
+
+def test_tasks_within_a_lane_start_in_submit_order():
+    async def main():
+        scheduler = _scheduler(max_concurrency=1)
+        started = []
+
+        async def job(name):
+            started.append(name)
+
+        infos = [await scheduler.submit(f"i{i}", Lane.INTERACTIVE, job, f"i{i}") for i in range(5)]
+        await asyncio.gather(*(info.future for info in infos))
+        await scheduler.shutdown()
+        return started
+
+    assert asyncio.run(main()) == ["i0", "i1", "i2", "i3", "i4"]
+
+
+def test_running_bulk_jobs_do_not_take_interactive_slots():
+    async def main():
+        scheduler = _scheduler(max_concurrency=2, bulk_max_concurrency=1)
+        bulk_gate = asyncio.Event()
+
+        async def bulk_job():
+            await bulk_gate.wait()
+
+        bulk = [await scheduler.submit(f"b{i}", Lane.BULK, bulk_job) for i in range(3)]
+        interactive = [await scheduler.submit(f"i{i}", Lane.INTERACTIVE, _noop) for i in range(4)]
+        await asyncio.wait_for(asyncio.gather(*(info.future for info in interactive)), timeout=1)
+        stats = scheduler.stats()
+        bulk_gate.set()
+        await asyncio.gather(*(info.future for info in bulk))
+        await scheduler.shutdown()
+        return stats
+
+    stats = asyncio.run(main())
+
+    assert stats["running"] == {"interactive": 0, "bulk": 1}
+    assert stats["queued"] == {"interactive": 0, "bulk": 2}
+
+
+def test_full_queue_raises_queue_full_with_retry_after():
+    async def main():
+        scheduler = _scheduler(max_queue=2)
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+
+        # 하나는 실행 중, 두 개는 대기 → 대기열이 가득 참
+        infos = [await scheduler.submit("t0", Lane.INTERACTIVE, blocked)]
+        await asyncio.sleep(0)
+        infos += [await scheduler.submit(f"t{i}", Lane.INTERACTIVE, blocked) for i in (1, 2)]
+        with pytest.raises(QueueFullError) as excinfo:
+            await scheduler.submit("overflow", Lane.INTERACTIVE, blocked)
+        gate.set()
+        await asyncio.gather(*(info.future for info in infos))
+        await scheduler.shutdown()
+        return excinfo.value, scheduler.stats()
+
+    error, stats = asyncio.run(main())
+
+    assert error.retry_after == TASK_RETRY_AFTER_SECONDS
+    assert stats["rejected"] == 1
+
+
+def test_queue_full_maps_to_429_with_retry_after(monkeypatch):
+    pytest.importorskip("transformers")
+    pytest.importorskip("bert_score")
+    pytest.importorskip("comet")
+    from fastapi import HTTPException
+    from app.api import text_similarity
+
+    monkeypatch.setattr(text_similarity.task_scheduler, "max_queue", 0)
+
+    with pytest.raises(HTTPException) as excinfo:
+        text_similarity._ensure_capacity()
+
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers["Retry-After"] == str(TASK_RETRY_AFTER_SECONDS)
+
+
+def test_position_and_status_track_the_task_lifecycle():
+    async def main():
+        scheduler = _scheduler(max_concurrency=1, bulk_max_concurrency=1)
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+            return "done"
+
+        async def failing():
+            raise ValueError("bad input")
+
+        first = await scheduler.submit("i0", Lane.INTERACTIVE, blocked)
+        second = await scheduler.submit("i1", Lane.INTERACTIVE, blocked)
+        third = await scheduler.submit("i2", Lane.INTERACTIVE, failing)
+        bulk = await scheduler.submit("b0", Lane.BULK, blocked)
+        queued_bulk = await scheduler.submit("b1", Lane.BULK, blocked)
+        await asyncio.sleep(0)
+
+        while_running = {name: scheduler.status(name) for name in ("i0", "i1", "i2", "b0", "b1")}
+        gate.set()
+        await asyncio.gather(first.future, second.future, bulk.future, queued_bulk.future)
+        with pytest.raises(ValueError):
+            await third.future
+        finished = {name: scheduler.status(name) for name in ("i0", "i2")}
+        result = scheduler.result("i0"), scheduler.result("i2"), scheduler.status("unknown")
+        await scheduler.shutdown()
+        return while_running, finished, result
+
+    while_running, finished, result = asyncio.run(main())
+
+    assert while_running["i0"]["status"] == "running" and while_running["i0"]["position"] is None
+    assert while_running["i1"]["position"] == 1
+    assert while_running["i2"]["position"] == 2
+    assert while_running["b0"]["status"] == "running"
+    assert while_running["b1"]["position"] == 1
+    assert while_running["b1"]["lane"] == "bulk"
+
+    assert finished["i0"]["status"] == "done" and finished["i0"]["finished_at"] is not None
+    assert finished["i2"]["status"] == "failed" and finished["i2"]["error"] == "bad input"
+    assert result == ("done", None, None)
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from app.schema.text_similarity_dto import Language, TextSimilarityRequest, TranslateType
+from app.service.translation_cache import TranslationCache
+
+
+def _cache(tmp_path, **overrides) -> TranslationCache:
+    options = dict(
+        path=str(tmp_path / "translations.sqlite3"), ttl_seconds=60, max_bytes=1024 * 1024, evict_every=1
+    )
+    options.update(overrides)
+    return TranslationCache(**options)
+
+
+def _keys(cache: TranslationCache):
+    return [key for key, in cache._connect().execute("SELECT key FROM translations ORDER BY key")]
+
+
+def test_expired_entries_miss_and_are_evicted(tmp_path):
+    cache = _cache(tmp_path, ttl_seconds=0.05, evict_every=2)
+
+    async def main():
+        await cache.put("old", "오래된 번역")
+        hit = await cache.get("old")
+        await asyncio.sleep(0.1)
+        expired = await cache.get("old")
+        # 두 번째 저장에서 정리 실행
+        await cache.put("new", "새 번역")
+        return hit, expired
+
+    hit, expired = asyncio.run(main())
+
+    assert hit == "오래된 번역"
+    assert expired is None
+    assert _keys(cache) == ["new"]
+    assert cache.stats()["evicted"] == 1
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path):
+    # 항목 하나 = key 2byte + 번역문 100byte
+    cache = _cache(tmp_path, max_bytes=250)
+
+    async def main():
+        await cache.put("k1", "a" * 100)
+        time.sleep(0.01)
+        await cache.put("k2", "b" * 100)
+        time.sleep(0.01)
+        # k1 을 다시 사용했으므로 가장 오래 안 쓴 항목은 k2
+        assert await cache.get("k1") == "a" * 100
+        time.sleep(0.01)
+        await cache.put("k3", "c" * 100)
+
+    asyncio.run(main())
+
+    assert _keys(cache) == ["k1", "k3"]
+
+
+def test_concurrent_reads_and_writes_keep_counters_consistent(tmp_path):
+    cache = _cache(tmp_path, evict_every=7)
+
+    async def main():
+        writes = [cache.put_many([(f"k{i}-{j}", "번역") for j in range(3)]) for i in range(40)]
+        reads = [cache.get_many([f"k{i}-0"]) for i in range(40)]
+        await asyncio.gather(*writes, *reads)
+
+    asyncio.run(main())
+
+    stats = cache.stats()
+    assert stats["errors"] == 0 and stats["writes"] == 120
+    assert len(_keys(cache)) == 120
+    assert cache._writes_since_evict < 7
+
+
+def test_fresh_request_bypasses_cached_translations(tmp_path, monkeypatch):
+    for module in ("transformers", "bert_score", "comet", "sentence_transformers"):
+        pytest.importorskip(module)
+    from app.service import text_similarity_service as service
+
+    cache = _cache(tmp_path)
+    monkeypatch.setattr(service, "translation_cache", cache)
+    calls = []
+
+    async def translate_segments(request, segments):
+        calls.append(list(segments))
+        return [f"new:{segment}" for segment in segments]
+
+    monkeypatch.setattr(service, "_translate_segments", translate_segments)
+    request = TextSimilarityRequest(
+        input_text="a. b.",
+        input_language=Language.ENGLISH,
+        output_language=Language.KOREAN,
+        translate_type=TranslateType.GOOGLE,
+        input_text_key="text_similarity_re/task/input_text.txt",
+        total_project_id=1,
+    )
+    keys = service._translation_keys(request, ["a.", "b."], "batch")
+
+    async def main():
+        await cache.put_many([(keys[0], "old:a."), (keys[1], "old:b.")])
+        cached = await service.perform_segment_translation(request, ["a.", "b."])
+        fresh = await service.perform_segment_translation(request.model_copy(update={"fresh": True}), ["a.", "b."])
+        after = await service.perform_segment_translation(request, ["a.", "b."])
+        return cached, fresh, after
+
+    cached, fresh, after = asyncio.run(main())
+
+    assert cached == ["old:a.", "old:b."]
+    assert fresh == ["new:a.", "new:b."]
+    assert calls == [["a.", "b."]]
+    # 재번역 결과로 캐시를 갱신
+    assert after == ["new:a.", "new:b."]